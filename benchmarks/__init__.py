@@ -0,0 +1 @@
+"""Benchmarks of pynws hot paths."""
@@ -0,0 +1,35 @@
+"""Fixtures for benchmarks."""
+
+import pytest
+
+from pynws import SimpleNWS
+
+from . import generators
+
+LATLON = (0, 0)
+USERID = "test_user"
+
+
+@pytest.fixture
+def simple_nws():
+    """SimpleNWS instance that is only used for parsing."""
+    # requests are never made, so no real session is needed
+    return SimpleNWS(*LATLON, USERID, session=object())
+
+
+@pytest.fixture(scope="session")
+def detailed_forecast_properties():
+    """Seven days of gridpoints data with all layers."""
+    return generators.detailed_forecast(days=7)
+
+
+@pytest.fixture(scope="session")
+def observations():
+    """500 observations."""
+    return generators.observations(500)
+
+
+@pytest.fixture(scope="session")
+def alerts():
+    """1000 alerts."""
+    return generators.alerts(1000)
@@ -0,0 +1,89 @@
+"""Generators scaling test fixtures to realistic sizes."""
+
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pynws.const import Detail
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+ONE_HOUR = timedelta(hours=1)
+OBSERVATION_INTERVAL = timedelta(minutes=20)
+# not forecast layers
+_NOT_LAYERS = {Detail.START_TIME, Detail.END_TIME}
+
+
+def load_fixture(name: str) -> Dict[str, Any]:
+    """Load json test fixture."""
+    with open(FIXTURES / f"{name}.json") as f:
+        return json.load(f)
+
+
+def _hour(when: datetime) -> datetime:
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+def detailed_forecast(days: int = 7) -> Dict[str, Any]:
+    """Return gridpoints properties with hourly values of every layer for days."""
+    properties = load_fixture("detailed_forecast")["properties"]
+    start = _hour(datetime.fromisoformat(properties["updateTime"]))
+    for detail in Detail:
+        if detail in _NOT_LAYERS:
+            continue
+        layer = properties.setdefault(detail, {"values": []})
+        source = layer["values"] or [{"value": 0}]
+        layer["values"] = [
+            {
+                "validTime": f"{(start + hour * ONE_HOUR).isoformat()}/PT1H",
+                "value": copy.deepcopy(source[hour % len(source)]["value"]),
+            }
+            for hour in range(days * 24)
+        ]
+    return properties
+
+
+def forecast_periods(count: int = 156, hourly: bool = True) -> List[Dict[str, Any]]:
+    """Return forecast periods starting at the current hour."""
+    fixture = "gridpoints_forecast_hourly_us" if hourly else "gridpoints_forecast_us"
+    source = load_fixture(fixture)["properties"]["periods"]
+    step = ONE_HOUR if hourly else 12 * ONE_HOUR
+    start = _hour(datetime.now(timezone.utc))
+    periods = []
+    for number in range(count):
+        period = copy.deepcopy(source[number % len(source)])
+        period["number"] = number + 1
+        period["startTime"] = (start + number * step).isoformat()
+        period["endTime"] = (start + (number + 1) * step).isoformat()
+        periods.append(period)
+    return periods
+
+
+def observations(
+    count: int = 500, newest: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Return observation properties, newest first, 20 minutes apart."""
+    source = load_fixture("stations_observations")["features"][0]["properties"]
+    newest = newest or datetime.fromisoformat(source["timestamp"])
+    result = []
+    for idx in range(count):
+        observation = copy.deepcopy(source)
+        observation["timestamp"] = (newest - idx * OBSERVATION_INTERVAL).isoformat()
+        result.append(observation)
+    return result
+
+
+def alerts(count: int = 1000, offset: int = 0) -> List[Dict[str, Any]]:
+    """Return alert properties with unique ids, numbered from offset."""
+    source = load_fixture("alerts_active_zone")["features"][0]["properties"]
+    result = []
+    for idx in range(offset, offset + count):
+        alert = copy.deepcopy(source)
+        alert["id"] = f"{source['id']}.{idx}"
+        alert["@id"] = f"{source['@id']}.{idx}"
+        result.append(alert)
+    return result
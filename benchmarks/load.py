@@ -0,0 +1,173 @@
+"""Load driver measuring SimpleNWS fleets against a mock or given NWS server.
+
+Run with `python -m benchmarks.load --clients 100 --duration 30 --latency 0.2`.
+Without `--url`, a local `MockNws` server with the given faults is started.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from pynws import ManagedSession, RequestOptions, SimpleNWS
+from pynws.session import PoolStats
+
+from .mock_nws import MockNws, add_fault_arguments, faults_from_args
+
+USERID = "pynws-load@example.com"
+OPERATIONS = (
+    "update_observation",
+    "update_forecast",
+    "update_forecast_hourly",
+    "update_alerts_forecast_zone",
+)
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class LoadResult:
+    """Latencies and errors per operation of a load run."""
+
+    def __init__(self: LoadResult):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.duration = 0.0
+        self.pool: Optional[PoolStats] = None
+
+    @property
+    def calls(self: LoadResult) -> int:
+        """Number of successful calls."""
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    @property
+    def throughput(self: LoadResult) -> float:
+        """Successful calls per second."""
+        return self.calls / self.duration if self.duration else 0.0
+
+    def percentile(self: LoadResult, operation: str, percentile: float) -> float:
+        """Return latency percentile of operation in seconds."""
+        latencies = sorted(self.latencies[operation])
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(percentile * len(latencies)))]
+
+    def report(self: LoadResult) -> str:
+        """Return human readable report."""
+        header = "p50/p95/p99 ms"
+        lines = [
+            f"{self.calls} calls in {self.duration:.1f} s, "
+            f"{self.throughput:.1f} calls/s",
+            f"{'operation':<30}{'calls':>8}{'errors':>8}  {header}",
+        ]
+        for operation in sorted(self.latencies.keys() | self.errors.keys()):
+            percentiles = "/".join(
+                f"{self.percentile(operation, p) * 1000:.0f}" for p in PERCENTILES
+            )
+            lines.append(
+                f"{operation:<30}{len(self.latencies[operation]):>8}"
+                f"{self.errors[operation]:>8}  {percentiles}"
+            )
+        if self.pool is not None:
+            lines.append(
+                f"pool: {self.pool.max_in_flight} max in flight, "
+                f"{self.pool.saturation:.0%} queued, "
+                f"{self.pool.reuse_ratio:.0%} connections reused"
+            )
+        return "\n".join(lines)
+
+
+async def _timed(result: LoadResult, operation: str, nws: SimpleNWS) -> None:
+    start = time.perf_counter()
+    try:
+        await getattr(nws, operation)()
+    except Exception:
+        result.errors[operation] += 1
+        return
+    result.latencies[operation].append(time.perf_counter() - start)
+
+
+async def _poll(
+    nws: SimpleNWS, result: LoadResult, stop_at: float, interval: float
+) -> None:
+    while time.monotonic() < stop_at:
+        if nws.station is None:
+            await _timed(result, "set_station", nws)
+            continue
+        for operation in OPERATIONS:
+            await _timed(result, operation, nws)
+        await asyncio.sleep(interval)
+
+
+async def run_load(
+    url: str,
+    *,
+    clients: int = 10,
+    duration: float = 10.0,
+    interval: float = 0.0,
+    **session_kwargs: Any,
+) -> LoadResult:
+    """Poll url with a fleet of SimpleNWS clients sharing one managed session.
+
+    Each client polls every `interval` seconds until `duration` has passed.
+    Keyword arguments are passed to `ManagedSession`.
+    """
+    result = LoadResult()
+    managed = ManagedSession(USERID, **session_kwargs)
+    options = RequestOptions(base_url=url)
+    async with managed as session:
+        fleet = [
+            SimpleNWS(30.0 + idx / 100, -85.0, USERID, session, request_options=options)
+            for idx in range(clients)
+        ]
+        start = time.monotonic()
+        await asyncio.gather(
+            *(_poll(nws, result, start + duration, interval) for nws in fleet)
+        )
+        result.duration = time.monotonic() - start
+    result.pool = managed.stats
+    return result
+
+
+async def _main(args: argparse.Namespace) -> LoadResult:
+    if args.url:
+        return await run_load(
+            args.url,
+            clients=args.clients,
+            duration=args.duration,
+            interval=args.interval,
+        )
+    runner = web.AppRunner(MockNws(faults_from_args(args)).app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        return await run_load(
+            f"http://{host}:{port}/",
+            clients=args.clients,
+            duration=args.duration,
+            interval=args.interval,
+        )
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    """Run load test and write report to stdout."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="server to load, ending with '/'")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.0)
+    add_fault_arguments(parser)
+    result = asyncio.run(_main(parser.parse_args()))
+    sys.stdout.write(result.report() + "\n")
+
+
+if __name__ == "__main__":
+    main()
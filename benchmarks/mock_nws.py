@@ -0,0 +1,248 @@
+"""Local stand-in for api.weather.gov serving the test fixtures.
+
+Run with `python -m benchmarks.mock_nws --port 8080`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+import hashlib
+import json
+import random
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from . import generators
+
+Latency = Callable[[random.Random], float]
+
+DEFAULT_OBSERVATIONS = 500
+DEFAULT_PAGE_SIZE = 500
+
+
+def no_latency(rng: random.Random) -> float:
+    """Respond immediately."""
+    return 0.0
+
+
+def constant_latency(seconds: float) -> Latency:
+    """Respond after a fixed delay."""
+    return lambda rng: seconds
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> Latency:
+    """Respond after a log-normally distributed delay, a long tailed latency."""
+    return lambda rng: median * rng.lognormvariate(0, sigma)
+
+
+class Faults:
+    """Latency and errors injected into every response.
+
+    A `throttle_rate` fraction of requests are answered with 429 and an
+    `error_rate` fraction with 503.  Both carry `Retry-After` if `retry_after`
+    is set.
+    """
+
+    def __init__(
+        self: Faults,
+        *,
+        latency: Latency = no_latency,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+    def status(self: Faults) -> Optional[int]:
+        """Return injected error status, if any."""
+        roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+
+class MockNws:
+    """aiohttp application mimicking the NWS API routes used by pynws.
+
+    Responses carry an `ETag` and conditional requests are answered with 304.
+    Observations are paginated with a `cursor` parameter and a
+    `pagination.next` url like the NWS API.  Request counts per route are
+    kept in `requests`.
+    """
+
+    def __init__(
+        self: MockNws,
+        faults: Optional[Faults] = None,
+        observations: int = DEFAULT_OBSERVATIONS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        self.faults = faults or Faults()
+        self.page_size = page_size
+        self.requests: Counter[str] = Counter()
+        self._fixtures: Dict[str, Dict[str, Any]] = {}
+        self._observations = generators.observations(
+            observations, newest=datetime.now(timezone.utc).replace(microsecond=0)
+        )
+
+    def _fixture(self: MockNws, name: str, units: Optional[str]) -> Dict[str, Any]:
+        for fixture in (f"{name}_{units}", name) if units else (name,):
+            if fixture not in self._fixtures:
+                try:
+                    self._fixtures[fixture] = generators.load_fixture(fixture)
+                except FileNotFoundError:
+                    continue
+            return self._fixtures[fixture]
+        raise web.HTTPNotFound
+
+    async def _respond(
+        self: MockNws, request: web.Request, route: str, data: Dict[str, Any]
+    ) -> web.Response:
+        self.requests[route] += 1
+        await asyncio.sleep(self.faults.latency(self.faults.rng))
+        status = self.faults.status()
+        if status is not None:
+            # only throttled and unavailable responses ask to retry later
+            headers = {}
+            if self.faults.retry_after is not None:
+                headers["Retry-After"] = str(self.faults.retry_after)
+            return web.json_response(
+                {"title": "Injected error", "status": status},
+                status=status,
+                headers=headers,
+                content_type="application/problem+json",
+            )
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body,
+            headers={"ETag": etag},
+            content_type="application/geo+json",
+        )
+
+    def _fixture_handler(self: MockNws, name: str) -> Callable[[web.Request], Any]:
+        async def handler(request: web.Request) -> web.Response:
+            data = self._fixture(name, request.query.get("units"))
+            return await self._respond(request, name, data)
+
+        return handler
+
+    def _filter_observations(
+        self: MockNws, request: web.Request
+    ) -> List[Dict[str, Any]]:
+        observations = self._observations
+        for param, keep in (
+            ("start", lambda time, limit: time >= limit),
+            ("end", lambda time, limit: time <= limit),
+        ):
+            if param in request.query:
+                limit = datetime.fromisoformat(request.query[param])
+                observations = [
+                    o
+                    for o in observations
+                    if keep(datetime.fromisoformat(o["timestamp"]), limit)
+                ]
+        return observations
+
+    async def _observations_handler(
+        self: MockNws, request: web.Request
+    ) -> web.Response:
+        observations = self._filter_observations(request)
+        limit = min(int(request.query.get("limit", self.page_size)), self.page_size)
+        cursor = int(request.query.get("cursor", 0))
+        page = observations[cursor : cursor + limit]
+        data: Dict[str, Any] = {
+            "type": "FeatureCollection",
+            "features": [{"type": "Feature", "properties": o} for o in page],
+        }
+        if cursor + limit < len(observations):
+            next_url = request.url.update_query(cursor=cursor + limit)
+            data["pagination"] = {"next": str(next_url)}
+        return await self._respond(request, "stations_observations", data)
+
+    async def _latest_handler(self: MockNws, request: web.Request) -> web.Response:
+        data = {"type": "Feature", "properties": self._observations[0]}
+        return await self._respond(request, "stations_observations_latest", data)
+
+    def app(self: MockNws) -> web.Application:
+        """Return application serving the NWS routes."""
+        app = web.Application()
+        app.router.add_get("/points/{latlon}", self._fixture_handler("points"))
+        app.router.add_get(
+            "/gridpoints/{wfo}/{xy}/stations",
+            self._fixture_handler("gridpoints_stations"),
+        )
+        app.router.add_get(
+            "/gridpoints/{wfo}/{xy}/forecast",
+            self._fixture_handler("gridpoints_forecast"),
+        )
+        app.router.add_get(
+            "/gridpoints/{wfo}/{xy}/forecast/hourly",
+            self._fixture_handler("gridpoints_forecast_hourly"),
+        )
+        app.router.add_get(
+            "/gridpoints/{wfo}/{xy}", self._fixture_handler("detailed_forecast")
+        )
+        app.router.add_get(
+            "/stations/{station}/observations/", self._observations_handler
+        )
+        app.router.add_get(
+            "/stations/{station}/observations/latest", self._latest_handler
+        )
+        app.router.add_get(
+            "/alerts/active/zone/{zone}", self._fixture_handler("alerts_active_zone")
+        )
+        app.router.add_get("/alerts/active", self._fixture_handler("alerts_active"))
+        return app
+
+
+def faults_from_args(args: argparse.Namespace) -> Faults:
+    """Create faults from parsed `add_fault_arguments` options."""
+    latency = (
+        lognormal_latency(args.latency, args.latency_sigma)
+        if args.latency
+        else no_latency
+    )
+    return Faults(
+        latency=latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add fault injection options to parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="median seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def main() -> None:
+    """Run mock server."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(MockNws(faults_from_args(args)).app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
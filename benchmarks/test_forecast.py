@@ -0,0 +1,36 @@
+"""Benchmarks of DetailedForecast."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from pynws import DetailedForecast
+from pynws.const import Detail
+
+
+@pytest.fixture(scope="module")
+def forecast(detailed_forecast_properties):
+    return DetailedForecast(detailed_forecast_properties)
+
+
+def test_detailed_forecast_init(benchmark, detailed_forecast_properties):
+    forecast = benchmark(DetailedForecast, detailed_forecast_properties)
+    assert len(forecast.details[Detail.TEMPERATURE]) == 7 * 24
+
+
+def test_get_details_for_time(benchmark, forecast):
+    # last hour is the worst case of the linear search
+    when = forecast.update_time + timedelta(days=7) - timedelta(hours=1)
+    details = benchmark(forecast.get_details_for_time, when)
+    assert Detail.TEMPERATURE in details
+
+
+def test_get_details_by_hour(benchmark, forecast):
+    start = forecast.update_time
+
+    def _by_hour():
+        return list(forecast.get_details_by_hour(start, hours=7 * 24))
+
+    hours = benchmark(_by_hour)
+    assert len(hours) == 7 * 24
+    assert datetime.fromisoformat(hours[-1][Detail.START_TIME]) > start
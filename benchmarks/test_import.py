@@ -0,0 +1,25 @@
+"""Benchmarks of import time in a fresh interpreter."""
+
+import subprocess
+import sys
+
+import pytest
+
+ROUNDS = 5
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import pynws",
+        "from pynws import DetailedForecast",
+        "from pynws import SimpleNWS",
+    ],
+)
+def test_import_time(benchmark, statement):
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", statement],),
+        kwargs={"check": True},
+        rounds=ROUNDS,
+    )
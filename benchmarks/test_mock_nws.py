@@ -0,0 +1,60 @@
+"""Tests of the mock NWS server and load driver."""
+
+import pytest
+
+from .load import run_load
+from .mock_nws import Faults, MockNws
+
+
+async def test_mock_nws_etag(aiohttp_client):
+    client = await aiohttp_client(MockNws().app())
+    res = await client.get("/points/30.0,-85.0")
+    assert res.status == 200
+    etag = res.headers["ETag"]
+    res = await client.get("/points/30.0,-85.0", headers={"If-None-Match": etag})
+    assert res.status == 304
+
+
+async def test_mock_nws_units(aiohttp_client):
+    client = await aiohttp_client(MockNws().app())
+    res = await client.get("/gridpoints/TAE/58,65/forecast", params={"units": "si"})
+    data = await res.json(content_type=None)
+    assert data["properties"]["periods"][0]["temperatureUnit"] == "C"
+
+
+async def test_mock_nws_pagination(aiohttp_client):
+    client = await aiohttp_client(MockNws(observations=5, page_size=2).app())
+    timestamps = []
+    url = "/stations/KCMH/observations/"
+    while url:
+        res = await client.get(url)
+        data = await res.json(content_type=None)
+        timestamps.extend(f["properties"]["timestamp"] for f in data["features"])
+        url = data.get("pagination", {}).get("next")
+        if url:
+            url = url[url.index("/stations") :]
+    assert len(timestamps) == 5
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+@pytest.mark.parametrize(("throttle_rate", "status"), [(1.0, 429), (0.0, 503)])
+async def test_mock_nws_faults(aiohttp_client, throttle_rate, status):
+    faults = Faults(throttle_rate=throttle_rate, error_rate=1.0, retry_after=3)
+    mock = MockNws(faults)
+    client = await aiohttp_client(mock.app())
+    res = await client.get("/stations/KCMH/observations/latest")
+    assert res.status == status
+    assert res.headers["Retry-After"] == "3"
+    assert mock.requests["stations_observations_latest"] == 1
+
+
+async def test_run_load(aiohttp_server):
+    mock = MockNws(observations=10)
+    server = await aiohttp_server(mock.app())
+    result = await run_load(str(server.make_url("/")), clients=2, duration=0.1)
+    assert result.calls > 0
+    assert not result.errors
+    assert result.throughput > 0
+    assert mock.requests["points"] == 2
+    assert result.pool.requests == sum(mock.requests.values())
+    assert "update_forecast" in result.report()
@@ -0,0 +1,45 @@
+"""Benchmarks of SimpleNWS parsing."""
+
+from pynws.simple_nws import parse_icon
+
+from . import generators
+
+
+def test_filter_forecast(benchmark, simple_nws):
+    periods = generators.forecast_periods(156)
+    forecast = benchmark(simple_nws._filter_forecast, periods)
+    assert len(forecast) == 156
+
+
+def test_convert_forecast(benchmark, simple_nws):
+    periods = generators.forecast_periods(156)
+    # conversion returns new periods, so the same input is used every round
+    forecast = benchmark(simple_nws._convert_forecast, periods)
+    assert len(forecast) == 156
+    assert forecast[0]["windBearing"] is not None
+
+
+def test_observation(benchmark, simple_nws, observations):
+    simple_nws._observation = observations
+    simple_nws._metar_obs = [None] * len(observations)
+
+    observation = benchmark(lambda: simple_nws.observation)
+    assert observation["temperature"] is not None
+
+
+def test_parse_icon(benchmark):
+    icons = [p["icon"] for p in generators.forecast_periods(156, hourly=False)]
+
+    def _parse():
+        return [parse_icon(icon) for icon in icons]
+
+    parsed = benchmark(_parse)
+    assert len(parsed) == 156
+
+
+def test_new_alerts(benchmark, simple_nws, alerts):
+    # half of the alerts are already known
+    current = generators.alerts(len(alerts), offset=len(alerts) // 2)
+
+    new = benchmark(simple_nws._new_alerts, alerts, current)
+    assert len(new) == len(alerts) // 2
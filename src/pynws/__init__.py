@@ -3,15 +3,104 @@ This is a module for querying weather data from the NWS/NOAA
 asynchronously and organizing the data in an easier to use manner
 """
 
-from .forecast import DetailedForecast
-from .nws import Nws, NwsError, NwsNoDataError
-from .simple_nws import SimpleNWS, call_with_retry
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .alerts import Alert, AlertDiff, AlertFeed, AlertStore
+    from .circuit_breaker import CircuitBreakers, NwsCircuitOpenError
+    from .deadlines import DeadlineExceeded, deadline
+    from .forecast import DetailedForecast
+    from .hedge import HedgePolicy
+    from .instrumentation import RequestMetrics, UpdateReport
+    from .nws import Nws, NwsError, NwsNoDataError
+    from .raw_data import RedirectCache, RequestOptions
+    from .retry import RetryBudget, RetryPolicy
+    from .session import ManagedSession
+    from .simple_nws import SimpleNWS, call_with_retry
+    from .transport import (
+        Cassette,
+        CassetteMode,
+        CassetteTransport,
+        NwsCassetteMissError,
+    )
+    from .units import UnitConverter, UnitSystem
+
+# submodule of each public name, imported on first access so that e.g.
+# `DetailedForecast` can be used without importing aiohttp and metar
+_LAZY_IMPORTS: Dict[str, str] = {
+    "Alert": "alerts",
+    "AlertDiff": "alerts",
+    "AlertFeed": "alerts",
+    "AlertStore": "alerts",
+    "Cassette": "transport",
+    "CassetteMode": "transport",
+    "CassetteTransport": "transport",
+    "CircuitBreakers": "circuit_breaker",
+    "DeadlineExceeded": "deadlines",
+    "DetailedForecast": "forecast",
+    "HedgePolicy": "hedge",
+    "ManagedSession": "session",
+    "Nws": "nws",
+    "NwsCassetteMissError": "transport",
+    "NwsCircuitOpenError": "circuit_breaker",
+    "NwsError": "nws",
+    "NwsNoDataError": "nws",
+    "RedirectCache": "raw_data",
+    "RequestMetrics": "instrumentation",
+    "RequestOptions": "raw_data",
+    "RetryBudget": "retry",
+    "RetryPolicy": "retry",
+    "SimpleNWS": "simple_nws",
+    "UnitConverter": "units",
+    "UnitSystem": "units",
+    "UpdateReport": "instrumentation",
+    "call_with_retry": "simple_nws",
+    "deadline": "deadlines",
+}
 
 __all__ = [
+    "Alert",
+    "AlertDiff",
+    "AlertFeed",
+    "AlertStore",
+    "Cassette",
+    "CassetteMode",
+    "CassetteTransport",
+    "CircuitBreakers",
+    "DeadlineExceeded",
     "DetailedForecast",
+    "HedgePolicy",
+    "ManagedSession",
     "Nws",
+    "NwsCassetteMissError",
+    "NwsCircuitOpenError",
     "NwsError",
     "NwsNoDataError",
+    "RedirectCache",
+    "RequestMetrics",
+    "RequestOptions",
+    "RetryBudget",
+    "RetryPolicy",
     "SimpleNWS",
+    "UnitConverter",
+    "UnitSystem",
+    "UpdateReport",
     "call_with_retry",
+    "deadline",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,385 @@
+"""National alert feed."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import heapq
+import json
+import sys
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+from weakref import WeakValueDictionary
+
+from aiohttp import ClientSession
+
+from .const import ALERT_ID, Final
+from .raw_data import RequestOptions, raw_alerts_active
+from .spatial import DEFAULT_CELL_SIZE, AlertGridIndex
+
+DEFAULT_ALERT_FEED_MAX_AGE: Final = timedelta(minutes=1)
+
+# large fields kept as encoded JSON until read
+ALERT_TEXT_FIELDS: Final = ("description", "instruction", "parameters")
+# fields with few distinct values, shared between alerts
+_ALERT_INTERNED_FIELDS: Final = (
+    "status",
+    "messageType",
+    "category",
+    "severity",
+    "certainty",
+    "urgency",
+    "event",
+    "sender",
+    "senderName",
+    "response",
+)
+
+
+def zone_id(zone: str) -> str:
+    """Return zone id of a zone id or zone url."""
+    return zone.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _sent_key(alert: Dict[str, Any]) -> datetime:
+    """Sort key of alerts by `sent`, alerts without it first."""
+    return _parse_time(alert.get("sent")) or datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _references(alert: Dict[str, Any]) -> List[str]:
+    """Return ids of the alerts an alert updates or cancels."""
+    return [ref["identifier"] for ref in alert.get("references") or []]
+
+
+class Alert(Mapping[str, Any]):
+    """Read-only alert properties, shared by all holders of the alert id.
+
+    `Alert.from_properties` returns the existing object for an alert id while
+    any list still holds it.  The fields in `ALERT_TEXT_FIELDS` are kept as
+    encoded JSON and decoded when first read.  Use `as_dict` to get a plain
+    dict, e.g. for serialization.
+    """
+
+    __slots__ = ("__weakref__", "_properties", "_text")
+
+    _interned: WeakValueDictionary[str, Alert] = WeakValueDictionary()
+
+    def __init__(self: Alert, properties: Dict[str, Any]):
+        self._properties: Dict[str, Any] = {}
+        self._text: Dict[str, Any] = {}
+        for key, value in properties.items():
+            if key in ALERT_TEXT_FIELDS:
+                self._text[key] = json.dumps(
+                    value, ensure_ascii=False, separators=(",", ":")
+                ).encode()
+            elif key in _ALERT_INTERNED_FIELDS and isinstance(value, str):
+                self._properties[key] = sys.intern(value)
+            else:
+                self._properties[key] = value
+
+    @classmethod
+    def from_properties(cls: type[Alert], properties: Mapping[str, Any]) -> Alert:
+        """Return the alert of the properties, shared by alert id."""
+        if isinstance(properties, Alert):
+            return properties
+        alert_id = properties[ALERT_ID]
+        alert = cls._interned.get(alert_id)
+        if alert is None:
+            alert = cls(dict(properties))
+            cls._interned[alert_id] = alert
+        return alert
+
+    def __getitem__(self: Alert, key: str) -> Any:
+        if key in self._text:
+            value = self._text[key]
+            if isinstance(value, bytes):
+                value = self._text[key] = json.loads(value)
+            return value
+        return self._properties[key]
+
+    def __iter__(self: Alert) -> Iterator[str]:
+        yield from self._properties
+        yield from self._text
+
+    def __len__(self: Alert) -> int:
+        return len(self._properties) + len(self._text)
+
+    def __repr__(self: Alert) -> str:
+        return f"Alert({self._properties.get(ALERT_ID)!r})"
+
+    def as_dict(self: Alert) -> Dict[str, Any]:
+        """Return properties as a dict."""
+        return dict(self.items())
+
+
+class AlertDiff(NamedTuple):
+    """Changes of the active alerts between two polls.
+
+    updated are the alerts superseding stored alerts through their
+    `references`.  cancelled are stored alerts that were cancelled or are no
+    longer active, expired those past their `expires` time.
+    """
+
+    new: List[Dict[str, Any]]
+    updated: List[Dict[str, Any]]
+    cancelled: List[Dict[str, Any]]
+    expired: List[Dict[str, Any]]
+
+    def __bool__(self: AlertDiff) -> bool:
+        return bool(self.new or self.updated or self.cancelled or self.expired)
+
+
+class AlertStore:
+    """Active alerts keyed by id, updated from polls by their changes.
+
+    `apply` compares a poll with the stored alerts and returns an
+    `AlertDiff`.  Alerts already stored are skipped without comparing their
+    content, so the work of a poll grows with the number of changes.  Expiry
+    times are kept in a min-heap, so `expire` drops alerts past `expires`
+    without another request.
+    """
+
+    def __init__(self: AlertStore):
+        self.alerts: Dict[str, Dict[str, Any]] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
+        # id of a superseded alert -> id of the stored alert superseding it
+        self._superseded: Dict[str, str] = {}
+        # ids of Cancel messages already applied, they are not stored
+        self._cancels: Set[str] = set()
+
+    def __len__(self: AlertStore) -> int:
+        return len(self.alerts)
+
+    def __contains__(self: AlertStore, alert_id: str) -> bool:
+        return alert_id in self.alerts
+
+    def _add(self: AlertStore, alert: Dict[str, Any]) -> None:
+        alert_id = alert[ALERT_ID]
+        self.alerts[alert_id] = alert
+        for ref_id in _references(alert):
+            self._superseded[ref_id] = alert_id
+        expires = _parse_time(alert.get("expires"))
+        if expires is not None:
+            heapq.heappush(self._expiry, (expires, alert_id))
+
+    def _remove(self: AlertStore, alert_id: str) -> Optional[Dict[str, Any]]:
+        alert = self.alerts.pop(alert_id, None)
+        if alert is not None:
+            for ref_id in _references(alert):
+                if self._superseded.get(ref_id) == alert_id:
+                    del self._superseded[ref_id]
+        # heap entries of removed alerts are skipped by expire
+        return alert
+
+    def expire(
+        self: AlertStore, now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Remove and return alerts expired at `now`, by default the current time."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, alert_id = heapq.heappop(self._expiry)
+            alert = self.alerts.get(alert_id)
+            if alert is None or _parse_time(alert.get("expires")) != expires:
+                continue
+            self._remove(alert_id)
+            expired.append(alert)
+        return expired
+
+    def apply(
+        self: AlertStore,
+        alerts: Iterable[Dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> AlertDiff:
+        """Update the store from a poll of all active alerts.
+
+        Stored alerts missing from the poll are cancelled.  Alerts that are
+        superseded by a stored alert, or expired at `now`, are ignored.  New
+        alerts are applied in `sent` order, so an alert and the alert
+        superseding it give the same changes in any order.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        expired = self.expire(now)
+        new: List[Dict[str, Any]] = []
+        updated: List[Dict[str, Any]] = []
+        cancelled: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        changes = []
+        for alert in alerts:
+            alert_id = alert[ALERT_ID]
+            seen.add(alert_id)
+            if (
+                alert_id in self.alerts
+                or alert_id in self._superseded
+                or alert_id in self._cancels
+            ):
+                continue
+            changes.append(alert)
+        changes.sort(key=_sent_key)
+        for alert in changes:
+            alert_id = alert[ALERT_ID]
+            if alert_id in self._superseded:
+                # superseded by an alert of this poll
+                continue
+            expires = _parse_time(alert.get("expires"))
+            if expires is not None and expires <= now:
+                continue
+            superseded = [
+                old for old in map(self._remove, _references(alert)) if old is not None
+            ]
+            if alert.get("messageType") == "Cancel":
+                self._cancels.add(alert_id)
+                cancelled.extend(superseded)
+                continue
+            self._add(alert)
+            (updated if superseded else new).append(alert)
+        for alert_id in [i for i in self.alerts if i not in seen]:
+            cancelled.append(self.alerts[alert_id])
+            self._remove(alert_id)
+        self._cancels &= seen
+        return AlertDiff(new, updated, cancelled, expired)
+
+
+class AlertFeed:
+    """All active alerts, indexed by affected zone and by polygon.
+
+    Pass the feed to any number of `Nws` instances to answer their zone alert
+    lookups from one `alerts/active` request per update instead of one
+    request per zone.  Lookups update the feed when it is older than
+    `max_age`, concurrent lookups share one request.  With `max_age` None, the
+    feed is only updated on the first lookup and by calling `update`.
+
+    Alert polygons are kept in an `AlertGridIndex` of `cell_size` degree
+    cells to match points locally.  Updates only add the polygons of new
+    alerts and remove those of alerts no longer active.
+    """
+
+    def __init__(
+        self: AlertFeed,
+        session: ClientSession,
+        userid: str,
+        *,
+        max_age: Optional[timedelta] = DEFAULT_ALERT_FEED_MAX_AGE,
+        request_options: Optional[RequestOptions] = None,
+        cell_size: float = DEFAULT_CELL_SIZE,
+    ):
+        self.session = session
+        self.userid = userid
+        self.max_age = max_age
+        self.request_options = request_options
+        self.alerts: Dict[str, Dict[str, Any]] = {}
+        self.updated: Optional[datetime] = None
+        self._zones: Dict[str, List[str]] = {}
+        self._index = AlertGridIndex(cell_size)
+        self._geometries: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._updated_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def zones(self: AlertFeed) -> List[str]:
+        """Zone ids with active alerts."""
+        return list(self._zones)
+
+    def _stale(self: AlertFeed) -> bool:
+        if self._updated_at is None:
+            return True
+        if self.max_age is None:
+            return False
+        return time.monotonic() - self._updated_at > self.max_age.total_seconds()
+
+    async def update(self: AlertFeed) -> None:
+        """Request all active alerts and update the indexes."""
+        data = await raw_alerts_active(
+            self.session, self.userid, options=self.request_options
+        )
+        alerts: Dict[str, Dict[str, Any]] = {}
+        geometries: Dict[str, Optional[Dict[str, Any]]] = {}
+        zones: Dict[str, List[str]] = defaultdict(list)
+        for feature in data["features"]:
+            alert = feature["properties"]
+            alert_id = alert[ALERT_ID]
+            if alert_id in alerts:
+                continue
+            alerts[alert_id] = alert
+            geometries[alert_id] = feature.get("geometry")
+            for zone in alert.get("affectedZones") or []:
+                zones[zone_id(zone)].append(alert_id)
+        self._update_index(geometries)
+        self.alerts = alerts
+        self._zones = dict(zones)
+        self._updated_at = time.monotonic()
+        self.updated = datetime.now(timezone.utc)
+
+    def _update_index(
+        self: AlertFeed, geometries: Dict[str, Optional[Dict[str, Any]]]
+    ) -> None:
+        for alert_id in self._geometries.keys() - geometries.keys():
+            self._index.remove(alert_id)
+        for alert_id, geometry in geometries.items():
+            if alert_id in self._geometries and self._geometries[alert_id] == geometry:
+                continue
+            if geometry:
+                self._index.add(alert_id, geometry)
+            else:
+                self._index.remove(alert_id)
+        self._geometries = geometries
+
+    async def refresh(self: AlertFeed) -> None:
+        """Update the feed if it is stale, sharing concurrent updates."""
+        if not self._stale():
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._stale():
+                await self.update()
+
+    def alerts_zone(self: AlertFeed, zone: str) -> List[Dict[str, Any]]:
+        """Return indexed alerts affecting zone id or zone url."""
+        return [self.alerts[i] for i in self._zones.get(zone_id(zone), [])]
+
+    async def get_alerts_zone(self: AlertFeed, zone: str) -> List[Dict[str, Any]]:
+        """Return alerts affecting zone, updating the feed if stale."""
+        await self.refresh()
+        return self.alerts_zone(zone)
+
+    def alerts_point(
+        self: AlertFeed, lat: float, lon: float, zones: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """Return indexed alerts affecting a point.
+
+        Alerts with a polygon match if it contains the point.  Alerts without
+        one match if they affect any of `zones`, the zone ids or urls of the
+        point.
+        """
+        alert_ids = set(self._index.query(lat, lon))
+        for zone in zones:
+            alert_ids.update(
+                i for i in self._zones.get(zone_id(zone), []) if i not in self._index
+            )
+        return [self.alerts[i] for i in self.alerts if i in alert_ids]
+
+    async def get_alerts_point(
+        self: AlertFeed, lat: float, lon: float, zones: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """Return alerts affecting a point, updating the feed if stale."""
+        await self.refresh()
+        return self.alerts_point(lat, lon, zones)
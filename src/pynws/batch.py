@@ -0,0 +1,62 @@
+"""Fetch data for many stations with bounded concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from aiohttp import ClientSession
+
+from .const import DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUEST_TIMEOUT
+from .raw_data import RequestOptions, raw_stations_observations_latest
+
+
+class StationObservationResult(NamedTuple):
+    """Latest observation or error for one station."""
+
+    station: str
+    observation: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+
+async def get_stations_observations_latest(
+    stations: Iterable[str],
+    session: ClientSession,
+    userid: str,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+    options: Optional[RequestOptions] = None,
+) -> Dict[str, StationObservationResult]:
+    """Fetch the latest observation for many stations concurrently.
+
+    At most `max_concurrency` requests are in flight at once and each request
+    is bounded by `timeout` seconds.  A failing station does not affect the
+    others; its exception is returned in the result instead of raised.
+
+    Returns:
+        Dict[str, StationObservationResult]: Results keyed by station, in the
+        order the stations were given.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _fetch(station: str) -> StationObservationResult:
+        async with semaphore:
+            try:
+                res = await asyncio.wait_for(
+                    raw_stations_observations_latest(
+                        station, session, userid, options=options
+                    ),
+                    timeout,
+                )
+            except Exception as err:
+                return StationObservationResult(station, error=err)
+        return StationObservationResult(station, observation=res.get("properties"))
+
+    # dict.fromkeys de-dupes stations while keeping order
+    unique_stations = list(dict.fromkeys(stations))
+    results = await asyncio.gather(*(_fetch(s) for s in unique_stations))
+    return {result.station: result for result in results}
@@ -0,0 +1,204 @@
+"""Circuit breakers for NWS endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+import json
+import sys
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+
+from aiohttp import ClientConnectionError, ClientResponseError
+
+from .const import Final
+from .deadlines import DeadlineExceeded
+from .nws import NwsError
+
+if sys.version_info >= (3, 11):
+    from enum import StrEnum
+else:
+    from .backports.enum import StrEnum
+
+DEFAULT_FAILURE_RATIO: Final = 0.5
+DEFAULT_MIN_CALLS: Final = 5
+DEFAULT_WINDOW: Final = 20
+DEFAULT_RESET_TIMEOUT: Final = 30.0
+DEFAULT_CACHE_SIZE: Final = 1024
+
+
+class NwsCircuitOpenError(NwsError):
+    """Endpoint circuit is open and no cached data is available."""
+
+
+class CircuitState(StrEnum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """Whether error indicates the endpoint is unhealthy."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (ClientConnectionError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """Circuit breaker for one endpoint.
+
+    Opens when at least `failure_ratio` of the last `window` calls failed, once
+    `min_calls` calls were made.  After `reset_timeout` seconds one probe call
+    is let through; its outcome closes or reopens the circuit.
+    """
+
+    def __init__(
+        self: CircuitBreaker,
+        failure_ratio: float = DEFAULT_FAILURE_RATIO,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        window: int = DEFAULT_WINDOW,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self: CircuitBreaker) -> CircuitState:
+        """Current state."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self: CircuitBreaker) -> bool:
+        """Whether a call may be made now."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def release(self: CircuitBreaker) -> None:
+        """Release an allowed call that finished without an outcome."""
+        self._probing = False
+
+    def record_success(self: CircuitBreaker) -> None:
+        """Record successful call."""
+        if self._opened_at is not None:
+            self._outcomes.clear()
+            self._opened_at = None
+        self._probing = False
+        self._outcomes.append(True)
+
+    def record_failure(self: CircuitBreaker) -> None:
+        """Record failed call."""
+        self._probing = False
+        if self._opened_at is not None:
+            self._opened_at = self._clock()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_ratio
+        ):
+            self._opened_at = self._clock()
+
+
+class CircuitBreakers:
+    """Circuit breakers keyed by endpoint template, e.g. `API_DETAILED_FORECAST`.
+
+    The last successful response per request is cached as its JSON body, up to
+    `cache_size` requests per endpoint, and decoded again while the endpoint
+    circuit is open, so callers changing responses do not change the cache.
+    Keyword arguments are passed to each `CircuitBreaker`.
+    """
+
+    def __init__(
+        self: CircuitBreakers,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        **breaker_kwargs: Any,
+    ):
+        self.cache_size = cache_size
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._cache: Dict[str, OrderedDict[Hashable, bytes]] = {}
+
+    def get(self: CircuitBreakers, endpoint: str) -> CircuitBreaker:
+        """Return breaker for endpoint template."""
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(**self._breaker_kwargs)
+        return self._breakers[endpoint]
+
+    def _cached(
+        self: CircuitBreakers, endpoint: str, key: Hashable
+    ) -> Optional[Dict[str, Any]]:
+        cache = self._cache.get(endpoint)
+        if cache is None or key not in cache:
+            return None
+        return json.loads(cache[key])
+
+    def _store(
+        self: CircuitBreakers,
+        endpoint: str,
+        key: Hashable,
+        data: Dict[str, Any],
+        body: Optional[bytes],
+    ) -> None:
+        if self.cache_size <= 0:
+            return
+        cache = self._cache.setdefault(endpoint, OrderedDict())
+        cache[key] = body if body is not None else json.dumps(data).encode()
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    async def call(
+        self: CircuitBreakers,
+        endpoint: str,
+        key: Hashable,
+        request: Callable[[], Awaitable[Dict[str, Any]]],
+        body: Optional[Callable[[], Optional[bytes]]] = None,
+    ) -> Dict[str, Any]:
+        """Make request through the endpoint breaker.
+
+        `key` identifies the request for the response cache.  While the circuit
+        is open, the cached response is returned or `NwsCircuitOpenError` is
+        raised.  `body` returns the JSON body of the response, which is cached
+        instead of encoding it again.
+        """
+        breaker = self.get(endpoint)
+        if not breaker.allow():
+            cached = self._cached(endpoint, key)
+            if cached is None:
+                raise NwsCircuitOpenError(f"Circuit for {endpoint} is open")
+            return cached
+        try:
+            data = await request()
+        except (asyncio.CancelledError, DeadlineExceeded):
+            # the caller gave up, which says nothing about the endpoint
+            breaker.release()
+            raise
+        except Exception as err:
+            if is_endpoint_failure(err):
+                breaker.record_failure()
+            else:
+                # the endpoint answered, so it is not unhealthy
+                breaker.record_success()
+            raise
+        breaker.record_success()
+        self._store(endpoint, key, data, body() if body is not None else None)
+        return data
@@ -25,8 +25,32 @@ API_GRIDPOINTS_FORECAST: Final = "gridpoints/{}/{},{}/forecast"
 API_GRIDPOINTS_FORECAST_HOURLY: Final = "gridpoints/{}/{},{}/forecast/hourly"
 API_POINTS: Final = "points/{},{}"
 API_ALERTS_ACTIVE_ZONE: Final = "alerts/active/zone/{}"
+API_ALERTS_ACTIVE: Final = "alerts/active"
+API_ALERTS_ACTIVE_POINT: Final = "alerts/active?point={},{}"
+
+# seconds per request, keyed by endpoint template
+DEFAULT_ENDPOINT_TIMEOUTS: Final = {
+    API_POINTS: 10.0,
+    API_GRIDPOINTS_STATIONS: 10.0,
+    API_STATIONS_OBSERVATIONS: 15.0,
+    API_STATIONS_OBSERVATIONS_LATEST: 10.0,
+    API_DETAILED_FORECAST: 30.0,
+    API_GRIDPOINTS_FORECAST: 20.0,
+    API_GRIDPOINTS_FORECAST_HOURLY: 20.0,
+    API_ALERTS_ACTIVE_ZONE: 10.0,
+    API_ALERTS_ACTIVE: 30.0,
+    API_ALERTS_ACTIVE_POINT: 10.0,
+}
+
+# decimals of lat/lon accepted by the API, longer coordinates are redirected
+COORDINATE_PRECISION: Final = 4
+DEFAULT_REDIRECT_CACHE_SIZE: Final = 256
 
 DEFAULT_USERID: Final = "CODEemail@address"
+DEFAULT_MAX_CONCURRENCY: Final = 10
+DEFAULT_REQUEST_TIMEOUT: Final = 10.0
+DEFAULT_BACKFILL_LIMIT: Final = 12
+DEFAULT_BACKFILL_STEP: Final = 3
 
 ALERT_ID: Final = "id"
 
@@ -135,6 +159,25 @@ class Detail(StrEnum):
 
 MetadataKeys = ["updateTime", "generatedAt", "validTimes"]
 
+WIND_DIRECTIONS: Final = [
+    "N",
+    "NNE",
+    "NE",
+    "ENE",
+    "E",
+    "ESE",
+    "SE",
+    "SSE",
+    "S",
+    "SSW",
+    "SW",
+    "WSW",
+    "W",
+    "WNW",
+    "NW",
+    "NNW",
+]
+
 
 class ForecastUnits(StrEnum):
     """Values accepted as forecast_units."""
@@ -0,0 +1,50 @@
+"""Deadlines for chains of requests."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from typing import Iterator, Optional
+
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("pynws_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Request was stopped by the caller's deadline, not by its endpoint."""
+
+
+@contextmanager
+def deadline(timeout: Optional[float]) -> Iterator[None]:
+    """Bound all requests made inside the block to finish within timeout seconds.
+
+    Deadlines nest, the earliest one applies.  Requests still running when the
+    deadline passes are cancelled and raise `DeadlineExceeded`, a subclass of
+    `asyncio.TimeoutError`, as do requests started after it passed.  A timeout
+    of None adds no deadline.
+
+    Example:
+        with deadline(2.5):
+            await nws.get_detailed_forecast()
+    """
+    if timeout is None:
+        yield
+        return
+    expires = time.monotonic() + timeout
+    current = _DEADLINE.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _DEADLINE.set(expires)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Return seconds left until the current deadline, or None without one."""
+    expires = _DEADLINE.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
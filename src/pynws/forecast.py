@@ -7,7 +7,7 @@ import re
 from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
 
 from .const import Detail, Final
-from .units import get_converter
+from .units import SI, UnitSystem, unit_converter
 
 ISO8601_PERIOD_REGEX: Final = re.compile(
     r"^P"
@@ -27,13 +27,22 @@ _TimeValue = Tuple[datetime, datetime, DetailValue]
 
 
 class DetailedForecast:
-    """Class to retrieve forecast values for a point in time."""
+    """Class to retrieve forecast values for a point in time.
 
-    def __init__(self: DetailedForecast, properties: Dict[str, Any]):
+    Values with a unit are converted to the units of `unit_system`.
+    """
+
+    def __init__(
+        self: DetailedForecast,
+        properties: Dict[str, Any],
+        unit_system: UnitSystem = SI,
+    ):
         if not isinstance(properties, dict):
             raise TypeError(f"{properties!r} is not a dictionary")
 
         self.update_time = datetime.fromisoformat(properties["updateTime"])
+        self.unit_system = unit_system
+        converter = unit_converter(unit_system)
         self.details: Dict[Detail, List[_TimeValue]] = {}
 
         for prop_name, prop_value in properties.items():
@@ -42,18 +51,19 @@ class DetailedForecast:
             except ValueError:
                 continue
 
+            raw_values = prop_value["values"]
+            values: List[Any] = [v["value"] for v in raw_values]
             unit_code = prop_value.get("uom")
-            converter = get_converter(unit_code) if unit_code else None
+            if unit_code:
+                # whole layer at once, one compiled conversion per unit code
+                values = converter.convert_many(unit_code, values)
 
             time_values: List[_TimeValue] = []
 
-            for value in prop_value["values"]:
-                isodatetime, duration_str = value["validTime"].split("/")
+            for raw_value, value in zip(raw_values, values):
+                isodatetime, duration_str = raw_value["validTime"].split("/")
                 start_time = datetime.fromisoformat(isodatetime)
                 end_time = start_time + self._parse_duration(duration_str)
-                value = value["value"]
-                if converter and value:
-                    value = converter(value)
                 time_values.append((start_time, end_time, value))
 
             self.details[detail] = time_values
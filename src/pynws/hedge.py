@@ -0,0 +1,126 @@
+"""Hedged requests to cut tail latency."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, Optional, TypeVar
+
+from .const import (
+    API_DETAILED_FORECAST,
+    API_GRIDPOINTS_FORECAST,
+    API_GRIDPOINTS_FORECAST_HOURLY,
+    Final,
+)
+
+DEFAULT_HEDGE_ENDPOINTS: Final = (
+    API_DETAILED_FORECAST,
+    API_GRIDPOINTS_FORECAST,
+    API_GRIDPOINTS_FORECAST_HOURLY,
+)
+DEFAULT_HEDGE_PERCENTILE: Final = 0.95
+DEFAULT_HEDGE_INITIAL_DELAY: Final = 2.0
+DEFAULT_HEDGE_MIN_SAMPLES: Final = 20
+DEFAULT_HEDGE_WINDOW: Final = 200
+DEFAULT_HEDGE_RATIO: Final = 0.05
+
+_T = TypeVar("_T")
+
+
+class HedgePolicy:
+    """Send a second identical request when the first one is unusually slow.
+
+    The hedge delay is the `percentile` latency of the last `window` requests
+    to the endpoint, or `initial_delay` until `min_samples` latencies have been
+    seen.  The first response to arrive wins and the other request is
+    cancelled.  Hedges are limited to `max_hedge_ratio` of requests.
+    """
+
+    def __init__(
+        self: HedgePolicy,
+        endpoints: Iterable[str] = DEFAULT_HEDGE_ENDPOINTS,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        initial_delay: float = DEFAULT_HEDGE_INITIAL_DELAY,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        window: int = DEFAULT_HEDGE_WINDOW,
+        max_hedge_ratio: float = DEFAULT_HEDGE_RATIO,
+    ):
+        if not 0 < percentile <= 1:
+            raise ValueError(f"percentile must be in (0, 1], got {percentile}")
+        self.endpoints = frozenset(endpoints)
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.max_hedge_ratio = max_hedge_ratio
+        self._latencies: Dict[str, Deque[float]] = {}
+        # start with one hedge available
+        self._tokens = 1.0
+        self.requests = 0
+        self.hedges = 0
+
+    def delay(self: HedgePolicy, endpoint: str) -> float:
+        """Return seconds to wait before hedging a request to endpoint."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(latencies)
+        idx = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[idx]
+
+    def record(self: HedgePolicy, endpoint: str, latency: float) -> None:
+        """Record latency of a completed request."""
+        if endpoint not in self._latencies:
+            self._latencies[endpoint] = deque(maxlen=self.window)
+        self._latencies[endpoint].append(latency)
+
+    def _allow_hedge(self: HedgePolicy) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.hedges += 1
+        return True
+
+    async def call(
+        self: HedgePolicy, endpoint: str, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Make request, hedging it if the endpoint is hedged."""
+        if endpoint not in self.endpoints:
+            return await request()
+        self.requests += 1
+        self._tokens = min(1.0, self._tokens + self.max_hedge_ratio)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        first = asyncio.ensure_future(request())
+        pending = {first}
+        error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay(endpoint))
+            if not done and self._allow_hedge():
+                pending.add(asyncio.ensure_future(request()))
+            while True:
+                winner = None
+                # retrieve every exception, so none is reported as unhandled
+                for task in done:
+                    task_error = task.exception()
+                    if task_error is None:
+                        winner = winner or task
+                    elif error is None or task is first:
+                        error = task_error
+                if winner is not None:
+                    # latency of the original request, which took at least
+                    # this long when a hedge wins
+                    self.record(endpoint, loop.time() - start)
+                    return winner.result()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+        if error is None:
+            raise RuntimeError(f"Hedged request to {endpoint} returned no result")
+        raise error
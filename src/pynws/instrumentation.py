@@ -0,0 +1,372 @@
+"""Request instrumentation."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
+
+if sys.version_info >= (3, 11):
+    from enum import StrEnum
+else:
+    from .backports.enum import StrEnum
+
+_LOGGER = logging.getLogger(__name__)
+
+_ATTEMPT: ContextVar[int] = ContextVar("pynws_attempt", default=1)
+_UPDATE: ContextVar[Optional[UpdateTimer]] = ContextVar("pynws_update", default=None)
+
+
+class RequestSource(StrEnum):
+    """Where the data of a request came from."""
+
+    NETWORK = "network"
+    CIRCUIT_BREAKER = "circuit_breaker"
+    CASSETTE = "cassette"
+
+
+class RequestMetrics(NamedTuple):
+    """Measurements of one request made by `_make_request`.
+
+    latency is the total time of the request, including hedging, and
+    decode_time the part spent decoding JSON.  attempt is 1 for the first try
+    of a `RetryPolicy` and counts up for each retry.  request_id and
+    correlation_id are the NWS `X-Request-ID` and `X-Correlation-ID` headers.
+    """
+
+    endpoint: Optional[str]
+    url: str
+    status: Optional[int]
+    latency: float
+    bytes: Optional[int]
+    decode_time: Optional[float]
+    source: RequestSource
+    attempt: int
+    request_id: Optional[str]
+    correlation_id: Optional[str]
+    error: Optional[str]
+
+    @property
+    def cache_hit(self: RequestMetrics) -> bool:
+        """Whether the data was served without a network request."""
+        return self.source != RequestSource.NETWORK
+
+    @property
+    def retries(self: RequestMetrics) -> int:
+        """Number of retries before this request."""
+        return self.attempt - 1
+
+
+RequestHook = Callable[[RequestMetrics], None]
+
+
+class UpdateReport(NamedTuple):
+    """Where the time of one `SimpleNWS` update went.
+
+    network is the wall time during which at least one request of the update
+    was waiting for a response, so concurrent requests count once.  decode is
+    the time decoding their JSON, which is not part of network.  model is the
+    time building objects from the responses, such as parsing METAR.
+    conversion is the time the data property took when it was last read, or
+    None if it was not read since the update.
+    """
+
+    update: str
+    total: float
+    network: float
+    decode: float
+    model: float
+    conversion: Optional[float]
+    bytes: int
+    objects: int
+    requests: int
+
+
+class UpdateTimer:
+    """Collect timings of one update."""
+
+    def __init__(self: UpdateTimer, update: str):
+        self.update = update
+        self.start = time.perf_counter()
+        self.model = 0.0
+        self.objects = 0
+        self.requests: List[RequestMetrics] = []
+        self._intervals: List[Tuple[float, float]] = []
+
+    def add_request(self: UpdateTimer, start: float, metrics: RequestMetrics) -> None:
+        """Add measurements of a request that started at `start`."""
+        self.requests.append(metrics)
+        self._intervals.append((start, start + metrics.latency))
+
+    def _busy_time(self: UpdateTimer) -> float:
+        """Return time covered by at least one request."""
+        busy = 0.0
+        end = float("-inf")
+        for interval_start, interval_end in sorted(self._intervals):
+            if interval_end <= end:
+                continue
+            busy += interval_end - max(interval_start, end)
+            end = interval_end
+        return busy
+
+    def report(self: UpdateTimer) -> UpdateReport:
+        """Return report of the finished update."""
+        decode = sum(m.decode_time or 0.0 for m in self.requests)
+        return UpdateReport(
+            update=self.update,
+            total=time.perf_counter() - self.start,
+            network=max(0.0, self._busy_time() - decode),
+            decode=decode,
+            model=self.model,
+            conversion=None,
+            bytes=sum(m.bytes or 0 for m in self.requests),
+            objects=self.objects,
+            requests=len(self.requests),
+        )
+
+
+@contextmanager
+def timed_update(update: str) -> Iterator[UpdateTimer]:
+    """Time the update made inside the block, including its requests."""
+    timer = UpdateTimer(update)
+    token = _UPDATE.set(timer)
+    try:
+        yield timer
+    finally:
+        _UPDATE.reset(token)
+
+
+@contextmanager
+def timed_model() -> Iterator[None]:
+    """Count time spent inside the block as model construction of the update."""
+    timer = _UPDATE.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.model += time.perf_counter() - start
+
+
+def count_objects(count: int) -> None:
+    """Count objects built by the current update."""
+    timer = _UPDATE.get()
+    if timer is not None:
+        timer.objects += count
+
+
+@contextmanager
+def retry_attempt(attempt: int) -> Iterator[None]:
+    """Mark requests made inside the block with the retry attempt."""
+    token = _ATTEMPT.set(attempt)
+    try:
+        yield
+    finally:
+        _ATTEMPT.reset(token)
+
+
+def current_attempt() -> int:
+    """Return retry attempt of requests made now."""
+    return _ATTEMPT.get()
+
+
+class RequestRecorder:
+    """Collect measurements while a request is made."""
+
+    __slots__ = (
+        "attempt",
+        "timer",
+        "bytes",
+        "correlation_id",
+        "decode_time",
+        "endpoint",
+        "hook",
+        "request_id",
+        "source",
+        "start",
+        "status",
+        "url",
+    )
+
+    def __init__(
+        self: RequestRecorder,
+        hook: Optional[RequestHook],
+        url: str,
+        endpoint: Optional[str],
+        timer: Optional[UpdateTimer] = None,
+    ):
+        self.hook = hook
+        self.timer = timer
+        self.url = url
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.attempt = current_attempt()
+        self.status: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.decode_time: Optional[float] = None
+        self.request_id: Optional[str] = None
+        self.correlation_id: Optional[str] = None
+        self.source = RequestSource.NETWORK
+
+    def response(self: RequestRecorder, res: ClientResponse) -> None:
+        """Record status and headers of response."""
+        self.status = res.status
+        self.request_id = res.headers.get("X-Request-ID")
+        self.correlation_id = res.headers.get("X-Correlation-ID")
+
+    def attempt_recorder(self: RequestRecorder) -> RequestRecorder:
+        """Return recorder for one of several attempts of this request."""
+        return RequestRecorder(None, self.url, self.endpoint)
+
+    def update(self: RequestRecorder, attempt: RequestRecorder) -> None:
+        """Take response measurements of a finished attempt."""
+        self.status = attempt.status
+        self.bytes = attempt.bytes
+        self.decode_time = attempt.decode_time
+        self.request_id = attempt.request_id
+        self.correlation_id = attempt.correlation_id
+        self.source = attempt.source
+
+    def metrics(
+        self: RequestRecorder, error: Optional[BaseException] = None
+    ) -> RequestMetrics:
+        """Return measurements of the finished request."""
+        status = self.status
+        if status is None:
+            status = getattr(error, "status", None)
+        return RequestMetrics(
+            endpoint=self.endpoint,
+            url=self.url,
+            status=status,
+            latency=time.perf_counter() - self.start,
+            bytes=self.bytes,
+            decode_time=self.decode_time,
+            source=self.source,
+            attempt=self.attempt,
+            request_id=self.request_id,
+            correlation_id=self.correlation_id,
+            error=type(error).__name__ if error is not None else None,
+        )
+
+    def emit(self: RequestRecorder, error: Optional[BaseException] = None) -> None:
+        """Pass measurements to the hook and update, logging errors of the hook."""
+        metrics = self.metrics(error)
+        if self.timer is not None:
+            self.timer.add_request(self.start, metrics)
+        if self.hook is None:
+            return
+        try:
+            self.hook(metrics)
+        except Exception:
+            _LOGGER.exception("Error in request hook for %s", self.url)
+
+
+def request_recorder(
+    hook: Optional[RequestHook], url: str, endpoint: Optional[str]
+) -> Optional[RequestRecorder]:
+    """Return recorder for a request, or None if nothing observes it."""
+    timer = _UPDATE.get()
+    if hook is None and timer is None:
+        return None
+    return RequestRecorder(hook, url, endpoint, timer)
+
+
+def _attributes(metrics: RequestMetrics) -> Dict[str, Any]:
+    return {
+        "endpoint": metrics.endpoint or "",
+        "status": str(metrics.status or ""),
+        "source": str(metrics.source),
+    }
+
+
+class PrometheusHook:
+    """Request hook exporting Prometheus metrics.
+
+    Requires the `prometheus-client` package.
+    """
+
+    def __init__(self: PrometheusHook, registry: Any = None, namespace: str = "pynws"):
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        registry = registry or REGISTRY
+        labels = ["endpoint", "status", "source"]
+        self.requests = Counter(
+            "requests", "NWS requests", labels, namespace=namespace, registry=registry
+        )
+        self.latency = Histogram(
+            "request_latency_seconds",
+            "NWS request latency",
+            labels,
+            namespace=namespace,
+            registry=registry,
+        )
+        self.bytes = Counter(
+            "response_bytes",
+            "NWS response body size",
+            ["endpoint"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.retries = Counter(
+            "retries",
+            "NWS request retries",
+            ["endpoint"],
+            namespace=namespace,
+            registry=registry,
+        )
+
+    def __call__(self: PrometheusHook, metrics: RequestMetrics) -> None:
+        attributes = _attributes(metrics)
+        self.requests.labels(**attributes).inc()
+        self.latency.labels(**attributes).observe(metrics.latency)
+        if metrics.bytes:
+            self.bytes.labels(endpoint=attributes["endpoint"]).inc(metrics.bytes)
+        if metrics.retries:
+            self.retries.labels(endpoint=attributes["endpoint"]).inc()
+
+
+class OpenTelemetryHook:
+    """Request hook recording OpenTelemetry metrics.
+
+    Requires the `opentelemetry-api` package.
+    """
+
+    def __init__(self: OpenTelemetryHook, meter_provider: Any = None):
+        from opentelemetry import metrics
+
+        meter = metrics.get_meter("pynws", meter_provider=meter_provider)
+        self.requests = meter.create_counter(
+            "pynws.requests", unit="{request}", description="NWS requests"
+        )
+        self.latency = meter.create_histogram(
+            "pynws.request.duration", unit="s", description="NWS request latency"
+        )
+        self.bytes = meter.create_counter(
+            "pynws.response.size", unit="By", description="NWS response body size"
+        )
+
+    def __call__(self: OpenTelemetryHook, metrics: RequestMetrics) -> None:
+        attributes = _attributes(metrics)
+        attributes["attempt"] = metrics.attempt
+        self.requests.add(1, attributes)
+        self.latency.record(metrics.latency, attributes)
+        if metrics.bytes:
+            self.bytes.add(metrics.bytes, {"endpoint": attributes["endpoint"]})
@@ -3,13 +3,29 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, cast
+from functools import wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from aiohttp import ClientSession
 
 from .const import ForecastUnits
+from .deadlines import deadline
 from .forecast import DetailedForecast
+from .instrumentation import count_objects, timed_model
 from .raw_data import (
+    RequestOptions,
+    raw_alerts_active_point,
     raw_alerts_active_zone,
     raw_detailed_forecast,
     raw_gridpoints_forecast,
@@ -19,6 +35,10 @@ from .raw_data import (
     raw_stations_observations,
     raw_stations_observations_latest,
 )
+from .units import SI, UnitSystem
+
+if TYPE_CHECKING:
+    from .alerts import AlertFeed
 
 
 class NwsError(Exception):
@@ -33,8 +53,32 @@ class NwsNoDataError(NwsError):
     """No data was returned."""
 
 
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+
+def _client_deadline(func: _F) -> _F:
+    """Bound method, including chained requests, by the client timeout."""
+
+    @wraps(func)
+    async def wrapper(self: Nws, *args: Any, **kwargs: Any) -> Any:
+        with deadline(self.timeout):
+            return await func(self, *args, **kwargs)
+
+    return cast(_F, wrapper)
+
+
 class Nws:
-    """Class to more easily get data for one location."""
+    """Class to more easily get data for one location.
+
+    If `timeout` is set, each getter, including requests it chains such as
+    `/points`, must finish within `timeout` seconds.  Use `pynws.deadline` to
+    bound single calls.
+
+    If `alert_feed` is set, zone and point alerts are looked up in the shared
+    `AlertFeed` instead of being requested per location.
+
+    Detailed forecast values are converted to the units of `unit_system`.
+    """
 
     def __init__(
         self: Nws,
@@ -43,6 +87,10 @@ class Nws:
         latlon: Optional[Tuple[float, float]] = None,
         station: Optional[str] = None,
         forecast_units: Optional[ForecastUnits] = None,
+        request_options: Optional[RequestOptions] = None,
+        timeout: Optional[float] = None,
+        alert_feed: Optional[AlertFeed] = None,
+        unit_system: UnitSystem = SI,
     ):
         if not session:
             raise NwsError(f"{session!r} is required")
@@ -55,6 +103,10 @@ class Nws:
         self.userid: str = userid
         self.latlon: Optional[Tuple[float, float]] = latlon
         self.station: Optional[str] = station
+        self.request_options: Optional[RequestOptions] = request_options
+        self.timeout: Optional[float] = timeout
+        self.alert_feed: Optional[AlertFeed] = alert_feed
+        self.unit_system: UnitSystem = unit_system
 
         self.wfo: Optional[str] = None
         self.x: Optional[int] = None
@@ -63,6 +115,7 @@ class Nws:
         self.forecast_zone: Optional[str] = None
         self.county_zone: Optional[str] = None
         self.fire_weather_zone: Optional[str] = None
+        self.time_zone: Optional[str] = None
 
         if forecast_units is None:
             self.forecast_units = ForecastUnits.US
@@ -74,45 +127,71 @@ class Nws:
                 + ", ".join([i.value for i in ForecastUnits])
             )
 
-    async def get_points_stations(self: Nws) -> List[str]:
-        """Returns station list"""
+    @_client_deadline
+    async def get_points_stations_metadata(self: Nws) -> List[Dict[str, Any]]:
+        """Returns station GeoJSON features, nearest first"""
         if not (self.wfo and self.x and self.y):
             await self.get_points()
         if not (self.wfo and self.x and self.y):
             raise NwsError(f"Error fetching gridpoint identifiers for {self.latlon!r}")
         res = await raw_gridpoints_stations(
-            self.wfo, self.x, self.y, self.session, self.userid
+            self.wfo,
+            self.x,
+            self.y,
+            self.session,
+            self.userid,
+            options=self.request_options,
         )
-        return [s["properties"]["stationIdentifier"] for s in res["features"]]
+        return cast(List[Dict[str, Any]], res["features"])
 
+    @_client_deadline
+    async def get_points_stations(self: Nws) -> List[str]:
+        """Returns station list"""
+        features = await self.get_points_stations_metadata()
+        return [s["properties"]["stationIdentifier"] for s in features]
+
+    @_client_deadline
     async def get_stations_observations(
-        self: Nws, limit: int = 0, start_time: Optional[datetime] = None
+        self: Nws,
+        limit: int = 0,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
     ) -> List[Dict[str, Any]]:
         """Returns observation list"""
         if self.station is None:
             raise NwsError("Need to set station")
         res = await raw_stations_observations(
-            self.station, self.session, self.userid, limit, start_time
+            self.station,
+            self.session,
+            self.userid,
+            limit,
+            start_time,
+            end_time,
+            options=self.request_options,
         )
         observations = [o["properties"] for o in res["features"]]
         return sorted(
             observations, key=lambda o: cast(str, o.get("timestamp")), reverse=True
         )
 
+    @_client_deadline
     async def get_stations_observations_latest(self: Nws) -> Dict[str, Any]:
         """Returns latest observation"""
         if self.station is None:
             raise NwsError("Need to set station")
         res = await raw_stations_observations_latest(
-            self.station, self.session, self.userid
+            self.station, self.session, self.userid, options=self.request_options
         )
         return cast(Dict[str, Any], res.get("properties"))
 
+    @_client_deadline
     async def get_points(self: Nws) -> Dict[str, Any]:
         """Saves griddata from latlon."""
         if self.latlon is None:
             raise NwsError("Latitude and longitude are required")
-        data = await raw_points(*self.latlon, self.session, self.userid)
+        data = await raw_points(
+            *self.latlon, self.session, self.userid, options=self.request_options
+        )
 
         properties = data.get("properties")
         if properties:
@@ -122,8 +201,10 @@ class Nws:
             self.forecast_zone = properties.get("forecastZone").split("/")[-1]
             self.county_zone = properties.get("county").split("/")[-1]
             self.fire_weather_zone = properties.get("fireWeatherZone").split("/")[-1]
+            self.time_zone = properties.get("timeZone")
         return cast(Dict[str, Any], properties)
 
+    @_client_deadline
     async def get_detailed_forecast(self: Nws) -> DetailedForecast:
         """Return all forecast data from grid.
 
@@ -135,10 +216,19 @@ class Nws:
         if self.wfo is None or self.x is None or self.y is None:
             raise NwsError("Error retrieving points")
         raw_forecast = await raw_detailed_forecast(
-            self.wfo, self.x, self.y, self.session, self.userid
+            self.wfo,
+            self.x,
+            self.y,
+            self.session,
+            self.userid,
+            options=self.request_options,
         )
-        return DetailedForecast(raw_forecast["properties"])
+        with timed_model():
+            forecast = DetailedForecast(raw_forecast["properties"], self.unit_system)
+        count_objects(sum(len(values) for values in forecast.details.values()))
+        return forecast
 
+    @_client_deadline
     async def get_gridpoints_forecast(self: Nws) -> Dict[str, Any]:
         """Return daily forecast from grid."""
         if self.wfo is None:
@@ -146,10 +236,17 @@ class Nws:
         if self.wfo is None or self.x is None or self.y is None:
             raise NwsError("Error retrieving points")
         raw_forecast = await raw_gridpoints_forecast(
-            self.wfo, self.x, self.y, self.session, self.userid, self.forecast_units
+            self.wfo,
+            self.x,
+            self.y,
+            self.session,
+            self.userid,
+            self.forecast_units,
+            options=self.request_options,
         )
         return raw_forecast["properties"]
 
+    @_client_deadline
     async def get_gridpoints_forecast_hourly(self: Nws) -> Dict[str, Any]:
         """Return hourly forecast from grid."""
         if self.wfo is None:
@@ -157,15 +254,46 @@ class Nws:
         if self.wfo is None or self.x is None or self.y is None:
             raise NwsError("Error retrieving points")
         raw_forecast = await raw_gridpoints_forecast_hourly(
-            self.wfo, self.x, self.y, self.session, self.userid, self.forecast_units
+            self.wfo,
+            self.x,
+            self.y,
+            self.session,
+            self.userid,
+            self.forecast_units,
+            options=self.request_options,
         )
         return raw_forecast["properties"]
 
+    @_client_deadline
     async def get_alerts_active_zone(self: Nws, zone: str) -> List[Dict[str, Any]]:
         """Returns alerts dict for zone."""
-        alerts = await raw_alerts_active_zone(zone, self.session, self.userid)
+        if self.alert_feed is not None:
+            return await self.alert_feed.get_alerts_zone(zone)
+        alerts = await raw_alerts_active_zone(
+            zone, self.session, self.userid, options=self.request_options
+        )
+        return [alert["properties"] for alert in alerts["features"]]
+
+    @_client_deadline
+    async def get_alerts_point(self: Nws) -> List[Dict[str, Any]]:
+        """Returns alerts dict for latlon in one request, without zones."""
+        if self.latlon is None:
+            raise NwsError("Latitude and longitude are required")
+        lat, lon = self.latlon
+        if self.alert_feed is not None:
+            # alerts without a polygon are matched by the zones of the point
+            if self.forecast_zone is None:
+                await self.get_points()
+            zones = [self.forecast_zone, self.county_zone, self.fire_weather_zone]
+            return await self.alert_feed.get_alerts_point(
+                lat, lon, [zone for zone in zones if zone]
+            )
+        alerts = await raw_alerts_active_point(
+            lat, lon, self.session, self.userid, options=self.request_options
+        )
         return [alert["properties"] for alert in alerts["features"]]
 
+    @_client_deadline
     async def get_alerts_forecast_zone(self: Nws) -> List[Dict[str, Any]]:
         """Returns alerts dict for forecast zone."""
         if self.forecast_zone is None:
@@ -174,6 +302,7 @@ class Nws:
             raise NwsError("Error retrieving points")
         return await self.get_alerts_active_zone(self.forecast_zone)
 
+    @_client_deadline
     async def get_alerts_county_zone(self: Nws) -> List[Dict[str, Any]]:
         """Returns alerts dict for county zone."""
         if self.county_zone is None:
@@ -182,6 +311,7 @@ class Nws:
             raise NwsError("Error retrieving points")
         return await self.get_alerts_active_zone(self.county_zone)
 
+    @_client_deadline
     async def get_alerts_fire_weather_zone(self: Nws) -> List[Dict[str, Any]]:
         """Returns alerts dict for fire weather zone."""
         if self.fire_weather_zone is None:
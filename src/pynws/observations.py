@@ -0,0 +1,80 @@
+"""Observation buffering."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from .const import Final
+
+DEFAULT_OBSERVATION_BUFFER_SIZE: Final = 48
+
+
+def _timestamp(observation: Dict[str, Any]) -> Optional[datetime]:
+    timestamp = observation.get("timestamp")
+    return datetime.fromisoformat(timestamp) if timestamp else None
+
+
+class ObservationBuffer:
+    """Bounded ring buffer of observations for one station ordered by timestamp.
+
+    When full, the oldest observations are discarded.  Observations with an
+    already buffered timestamp replace the buffered one.
+    """
+
+    def __init__(
+        self: ObservationBuffer, maxlen: int = DEFAULT_OBSERVATION_BUFFER_SIZE
+    ):
+        if maxlen < 1:
+            raise ValueError(f"maxlen must be at least 1, got {maxlen}")
+        # oldest first, so new observations are appended on the right
+        self._times: Deque[datetime] = deque(maxlen=maxlen)
+        self._observations: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def __len__(self: ObservationBuffer) -> int:
+        return len(self._observations)
+
+    def __iter__(self: ObservationBuffer) -> Iterator[Dict[str, Any]]:
+        """Iterate from newest to oldest."""
+        return reversed(self._observations)
+
+    @property
+    def newest_timestamp(self: ObservationBuffer) -> Optional[datetime]:
+        """Timestamp of newest buffered observation."""
+        return self._times[-1] if self._times else None
+
+    def newest_first(self: ObservationBuffer) -> List[Dict[str, Any]]:
+        """Return observations from newest to oldest."""
+        return list(self)
+
+    def merge(self: ObservationBuffer, observations: Iterable[Dict[str, Any]]) -> int:
+        """Merge observations into buffer.
+
+        Returns:
+            int: Number of observations that were not buffered before.
+        """
+        added = 0
+        timed = [(t, o) for o in observations if (t := _timestamp(o)) is not None]
+        for time, observation in sorted(timed, key=lambda item: item[0]):
+            if not self._times or time > self._times[-1]:
+                self._times.append(time)
+                self._observations.append(observation)
+                added += 1
+                continue
+            idx = bisect_left(self._times, time)
+            if self._times[idx] == time:
+                self._observations[idx] = observation
+            elif idx == 0 and len(self._times) == self._times.maxlen:
+                # older than everything in a full buffer
+                continue
+            else:
+                if len(self._times) == self._times.maxlen:
+                    self._times.popleft()
+                    self._observations.popleft()
+                    idx -= 1
+                self._times.insert(idx, time)
+                self._observations.insert(idx, observation)
+                added += 1
+        return added
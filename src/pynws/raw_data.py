@@ -1,16 +1,140 @@
 """Functions to retrieve raw data."""
 
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
-from aiohttp import ClientSession
+from aiohttp import (
+    ClientConnectionError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+)
 
 from . import urls
-from .const import API_ACCEPT, API_USER, ForecastUnits
+from .const import (
+    API_ACCEPT,
+    API_ALERTS_ACTIVE,
+    API_ALERTS_ACTIVE_POINT,
+    API_ALERTS_ACTIVE_ZONE,
+    API_DETAILED_FORECAST,
+    API_GRIDPOINTS_FORECAST,
+    API_GRIDPOINTS_FORECAST_HOURLY,
+    API_GRIDPOINTS_STATIONS,
+    API_POINTS,
+    API_STATIONS_OBSERVATIONS,
+    API_STATIONS_OBSERVATIONS_LATEST,
+    API_URL,
+    API_USER,
+    DEFAULT_ENDPOINT_TIMEOUTS,
+    DEFAULT_REDIRECT_CACHE_SIZE,
+    Final,
+    ForecastUnits,
+)
+from .deadlines import DeadlineExceeded, remaining
+from .instrumentation import (
+    RequestHook,
+    RequestRecorder,
+    RequestSource,
+    request_recorder,
+)
+
+if TYPE_CHECKING:
+    from .circuit_breaker import CircuitBreakers
+    from .hedge import HedgePolicy
+    from .transport import CassetteTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+# status codes of permanent redirects
+PERMANENT_REDIRECTS: Final = (301, 308)
+
+
+class RedirectCache:
+    """Final url of permanently redirected requests, least recently used
+    dropped first.
+
+    Only requests without params are remembered, since a redirect may drop
+    the query string.  Temporary redirects are never remembered.
+    """
+
+    def __init__(self: RedirectCache, maxsize: int = DEFAULT_REDIRECT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._targets: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self: RedirectCache) -> int:
+        return len(self._targets)
+
+    def get(self: RedirectCache, url: str) -> str:
+        """Return final url of url, or url if it was not redirected."""
+        target = self._targets.get(url)
+        if target is None:
+            return url
+        self._targets.move_to_end(url)
+        return target
+
+    def add(self: RedirectCache, url: str, target: str) -> None:
+        """Remember that url redirects to target."""
+        if url == target:
+            return
+        self._targets[url] = target
+        self._targets.move_to_end(url)
+        while len(self._targets) > self.maxsize:
+            self._targets.popitem(last=False)
+
+
+class RequestOptions:
+    """Optional behavior applied to every request.
+
+    circuit_breakers: fail fast, or serve cached data, for unhealthy endpoints.
+    hedging: send a second request when the first one is unusually slow.
+    timeouts: seconds per request keyed by endpoint template, None for no limit.
+    transport: record responses to, or replay them from, a cassette.
+    on_request: called with `RequestMetrics` after each request.
+    redirects: send requests straight to urls they were redirected to before.
+    base_url: server requests are sent to instead of `API_URL`, ending with '/'.
+    """
+
+    def __init__(
+        self: RequestOptions,
+        *,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        hedging: Optional[HedgePolicy] = None,
+        timeouts: Optional[Mapping[str, float]] = DEFAULT_ENDPOINT_TIMEOUTS,
+        transport: Optional[CassetteTransport] = None,
+        on_request: Optional[RequestHook] = None,
+        redirects: Optional[RedirectCache] = None,
+        base_url: str = API_URL,
+    ):
+        self.circuit_breakers = circuit_breakers
+        self.hedging = hedging
+        self.timeouts = timeouts
+        self.transport = transport
+        self.on_request = on_request
+        self.redirects = redirects
+        self.base_url = base_url
+
+
+def _rebase(url: str, options: Optional[RequestOptions]) -> str:
+    """Return API url sent to the server of `options.base_url`."""
+    if options is None or options.base_url == API_URL or not url.startswith(API_URL):
+        return url
+    return options.base_url + url[len(API_URL) :]
+
 
 def get_header(userid: str) -> Dict[str, str]:
     """Get header.
@@ -24,11 +148,13 @@ def get_params(
     limit: Optional[int] = 0,
     start: Optional[datetime] = None,
     units: Optional[str] = None,
+    end: Optional[datetime] = None,
 ) -> Dict[str, Any]:
     """Get request parameters, used by different calls.
     start: start time for station observation.
     limit: amount of observations to return.
     units: units used in response ("us", "si").
+    end: end time for station observation.
     """
     params: Dict[str, Any] = {}
     if limit and limit > 0:
@@ -41,27 +167,202 @@ def get_params(
         if start.tzinfo is None:
             raise ValueError("start parameter must be timezone aware")
         params["start"] = start.isoformat(timespec="seconds")
+    if end:
+        if not isinstance(end, datetime):
+            raise ValueError(f"end parameter needs to be datetime, but got {type(end)}")
+        if end.tzinfo is None:
+            raise ValueError("end parameter must be timezone aware")
+        params["end"] = end.isoformat(timespec="seconds")
     if units:
         params["units"] = units
     return params
 
 
+def _request_timeout(
+    url: str, endpoint: Optional[str], options: Optional[RequestOptions]
+) -> Tuple[Optional[float], bool]:
+    """Return timeout of request, and whether the caller's deadline sets it."""
+    timeout = remaining()
+    if timeout is not None and timeout <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before request to {url}")
+    if options is not None and options.timeouts and endpoint:
+        endpoint_timeout = options.timeouts.get(endpoint)
+        if endpoint_timeout is not None and (
+            timeout is None or endpoint_timeout < timeout
+        ):
+            return endpoint_timeout, False
+    return timeout, timeout is not None
+
+
+async def _measured_attempt(
+    fetch: Callable[[Optional[RequestRecorder]], Awaitable[Dict[str, Any]]],
+    recorder: RequestRecorder,
+) -> Dict[str, Any]:
+    """Make one of concurrent attempts of a request with its own recorder."""
+    attempt = recorder.attempt_recorder()
+    try:
+        data = await fetch(attempt)
+    except Exception:
+        recorder.update(attempt)
+        raise
+    recorder.update(attempt)
+    return data
+
+
+def _falls_back(
+    error: BaseException,
+    transport: CassetteTransport,
+    url: str,
+    params: Optional[Dict[str, Any]],
+) -> bool:
+    """Whether a failed request is served from the transport's cassette."""
+    if isinstance(error, ClientResponseError) and (
+        error.status < 500 and error.status != 429
+    ):
+        return False
+    return transport.has_fallback(url, params)
+
+
 async def _make_request(
     websession: ClientSession,
     url: str,
     header: Dict[str, str],
     params: Optional[Dict[str, Any]] = None,
+    *,
+    endpoint: Optional[str] = None,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
-    """Make request."""
-    async with websession.get(url, headers=header, params=params) as res:
+    """Make request.
+
+    endpoint: url template from const, used to group requests.
+    options: optional request behavior.
+
+    The request is bounded by the endpoint timeout and the current `deadline`.
+    """
+    url = _rebase(url, options)
+    redirects = options.redirects if options is not None else None
+    timeout, by_deadline = _request_timeout(url, endpoint, options)
+
+    recorder = request_recorder(
+        options.on_request if options is not None else None, url, endpoint
+    )
+    requested = False
+    body: Optional[bytes] = None
+
+    async def _fetch(attempt: Optional[RequestRecorder]) -> Dict[str, Any]:
+        nonlocal body
+        if options is not None and options.transport is not None:
+            if attempt is not None and options.transport.replays:
+                attempt.source = RequestSource.CASSETTE
+            return await options.transport.get(
+                websession, url, header, params, attempt, redirects
+            )
+        data, body = await fetch_json(
+            websession, url, header, params, attempt, redirects
+        )
+        return data
+
+    async def _get() -> Dict[str, Any]:
+        if recorder is None or options is None or options.hedging is None:
+            return await _fetch(recorder)
+        return await _measured_attempt(_fetch, recorder)
+
+    async def _request() -> Dict[str, Any]:
+        nonlocal requested
+        requested = True
+        if options is not None and options.hedging is not None and endpoint:
+            request = options.hedging.call(endpoint, _get)
+        else:
+            request = _get()
+        if timeout is None:
+            return await request
+        try:
+            return await asyncio.wait_for(request, timeout)
+        except asyncio.TimeoutError as err:
+            if by_deadline and not isinstance(err, DeadlineExceeded):
+                raise DeadlineExceeded(f"Deadline exceeded for {url}") from err
+            raise
+
+    try:
+        try:
+            if (
+                options is not None
+                and options.circuit_breakers is not None
+                and endpoint
+            ):
+                key = (url, tuple(sorted((params or {}).items())))
+                data = await options.circuit_breakers.call(
+                    endpoint, key, _request, lambda: body
+                )
+                if recorder is not None and not requested:
+                    recorder.source = RequestSource.CIRCUIT_BREAKER
+            else:
+                data = await _request()
+        except (
+            ClientConnectionError,
+            ClientResponseError,
+            asyncio.TimeoutError,
+        ) as err:
+            transport = options.transport if options is not None else None
+            if transport is None or not _falls_back(err, transport, url, params):
+                raise
+            data = await transport.fallback(url, header, params)
+            if recorder is not None:
+                recorder.source = RequestSource.CASSETTE
+    except Exception as err:
+        if recorder is not None:
+            recorder.emit(err)
+        raise
+    if recorder is not None:
+        recorder.emit()
+    return data
+
+
+async def fetch_json(
+    websession: ClientSession,
+    url: str,
+    header: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    recorder: Optional[RequestRecorder] = None,
+    redirects: Optional[RedirectCache] = None,
+    on_response: Optional[
+        Callable[[ClientResponse, Optional[Dict[str, Any]]], None]
+    ] = None,
+) -> Tuple[Dict[str, Any], bytes]:
+    """Get JSON dict response and its body.
+
+    With `redirects`, a url permanently redirected before is fetched from its
+    target directly.  `on_response` is called with the response and its
+    decoded JSON, or None for an error response, before errors are raised.
+    """
+    fetch_url = redirects.get(url) if redirects is not None else url
+    async with websession.get(fetch_url, headers=header, params=params) as res:
         _LOGGER.debug("Request for %s returned code: %s", url, res.status)
         _LOGGER.debug("Request for %s returned header: %s", url, res.headers)
+        if recorder is not None:
+            recorder.response(res)
+        if on_response is not None and not res.ok:
+            on_response(res, None)
         res.raise_for_status()
+        if (
+            redirects is not None
+            and res.history
+            and not params
+            and all(h.status in PERMANENT_REDIRECTS for h in res.history)
+        ):
+            redirects.add(url, str(res.url))
+        body = await res.read()
+        start = time.perf_counter()
         obs = await res.json()
+        if recorder is not None:
+            recorder.bytes = len(body)
+            recorder.decode_time = time.perf_counter() - start
+        if on_response is not None:
+            on_response(res, obs)
         _LOGGER.debug("Request for %s returned data: %s", url, obs)
     if not isinstance(obs, dict):
         raise TypeError(f"JSON response from {url} is not a dict")
-    return obs
+    return obs, body
 
 
 async def raw_stations_observations(
@@ -70,39 +371,74 @@ async def raw_stations_observations(
     userid: str,
     limit: int = 0,
     start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Get observation response from station"""
-    params = get_params(limit, start)
+    params = get_params(limit, start, end=end)
     url = urls.stations_observations_url(station)
     header = get_header(userid)
-    return await _make_request(websession, url, header, params)
+    return await _make_request(
+        websession,
+        url,
+        header,
+        params,
+        endpoint=API_STATIONS_OBSERVATIONS,
+        options=options,
+    )
 
 
 async def raw_stations_observations_latest(
-    station: str, websession: ClientSession, userid: str
+    station: str,
+    websession: ClientSession,
+    userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Get observation response from station"""
     url = urls.stations_observations_latest_url(station)
     header = get_header(userid)
-    return await _make_request(websession, url, header)
+    return await _make_request(
+        websession,
+        url,
+        header,
+        endpoint=API_STATIONS_OBSERVATIONS_LATEST,
+        options=options,
+    )
 
 
 async def raw_gridpoints_stations(
-    wfo: str, x: int, y: int, websession: ClientSession, userid: str
+    wfo: str,
+    x: int,
+    y: int,
+    websession: ClientSession,
+    userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Get list of stations for lat/lon"""
     url = urls.gridpoints_stations_url(wfo, x, y)
     header = get_header(userid)
-    return await _make_request(websession, url, header)
+    return await _make_request(
+        websession, url, header, endpoint=API_GRIDPOINTS_STATIONS, options=options
+    )
 
 
 async def raw_points(
-    lat: float, lon: float, websession: ClientSession, userid: str
+    lat: float,
+    lon: float,
+    websession: ClientSession,
+    userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Return griddata response."""
     url = urls.points_url(lat, lon)
     header = get_header(userid)
-    return await _make_request(websession, url, header)
+    return await _make_request(
+        websession, url, header, endpoint=API_POINTS, options=options
+    )
 
 
 async def raw_detailed_forecast(
@@ -111,11 +447,15 @@ async def raw_detailed_forecast(
     y: int,
     websession: ClientSession,
     userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Return griddata response."""
     url = urls.detailed_forecast_url(wfo, x, y)
     header = get_header(userid)
-    return await _make_request(websession, url, header)
+    return await _make_request(
+        websession, url, header, endpoint=API_DETAILED_FORECAST, options=options
+    )
 
 
 async def raw_gridpoints_forecast(
@@ -125,12 +465,21 @@ async def raw_gridpoints_forecast(
     websession: ClientSession,
     userid: str,
     forecast_units: ForecastUnits = ForecastUnits.US,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Return griddata response."""
     url = urls.gridpoints_forecast_url(wfo, x, y)
     header = get_header(userid)
     params = get_params(units=forecast_units)
-    return await _make_request(websession, url, header, params)
+    return await _make_request(
+        websession,
+        url,
+        header,
+        params,
+        endpoint=API_GRIDPOINTS_FORECAST,
+        options=options,
+    )
 
 
 async def raw_gridpoints_forecast_hourly(
@@ -140,18 +489,63 @@ async def raw_gridpoints_forecast_hourly(
     websession: ClientSession,
     userid: str,
     forecast_units: ForecastUnits = ForecastUnits.US,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Return griddata response."""
     url = urls.gridpoints_forecast_hourly_url(wfo, x, y)
     header = get_header(userid)
     params = get_params(units=forecast_units)
-    return await _make_request(websession, url, header, params)
+    return await _make_request(
+        websession,
+        url,
+        header,
+        params,
+        endpoint=API_GRIDPOINTS_FORECAST_HOURLY,
+        options=options,
+    )
 
 
 async def raw_alerts_active_zone(
-    zone: str, websession: ClientSession, userid: str
+    zone: str,
+    websession: ClientSession,
+    userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
 ) -> Dict[str, Any]:
     """Return griddata response."""
     url = urls.alerts_active_zone_url(zone)
     header = get_header(userid)
-    return await _make_request(websession, url, header)
+    return await _make_request(
+        websession, url, header, endpoint=API_ALERTS_ACTIVE_ZONE, options=options
+    )
+
+
+async def raw_alerts_active(
+    websession: ClientSession,
+    userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
+) -> Dict[str, Any]:
+    """Return all active alerts."""
+    url = urls.alerts_active_url()
+    header = get_header(userid)
+    return await _make_request(
+        websession, url, header, endpoint=API_ALERTS_ACTIVE, options=options
+    )
+
+
+async def raw_alerts_active_point(
+    lat: float,
+    lon: float,
+    websession: ClientSession,
+    userid: str,
+    *,
+    options: Optional[RequestOptions] = None,
+) -> Dict[str, Any]:
+    """Return active alerts affecting a point."""
+    url = urls.alerts_active_point_url(lat, lon)
+    header = get_header(userid)
+    return await _make_request(
+        websession, url, header, endpoint=API_ALERTS_ACTIVE_POINT, options=options
+    )
@@ -0,0 +1,215 @@
+"""Retry policy for NWS requests."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import random
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+
+from aiohttp import ClientResponseError
+
+from .const import Final
+from .instrumentation import retry_attempt
+from .nws import NwsNoDataError
+
+RETRY_STATUS_TOO_MANY_REQUESTS: Final = 429
+
+_T = TypeVar("_T")
+
+
+def seconds(value: Union[float, timedelta]) -> float:
+    """Return a number of seconds or a timedelta as seconds."""
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+def nws_retry_if(
+    retry_no_data: bool = False, retry_throttled: bool = False
+) -> Callable[[BaseException], bool]:
+    """
+    Return function deciding whether an error is retried.
+
+    Retry if:
+        - if error is ClientResponseError and has a 5xx status.
+        - if error is ClientResponseError and has a 429 status, the behavior is
+          determined by retry_throttled
+        - if error is NwsNoDataError, the behavior is determined by retry_no_data
+
+    Parameters
+    ----------
+    retry_no_data : bool
+        Whether to retry when `NwsNoDataError` is raised.
+    retry_throttled : bool
+        Whether to retry when the server answers 429 Too Many Requests.
+
+    """
+
+    def _retry(error: BaseException) -> bool:
+        """Whether to retry based on exceptions."""
+        if isinstance(error, ClientResponseError) and (
+            error.status >= 500
+            or (retry_throttled and error.status == RETRY_STATUS_TOO_MANY_REQUESTS)
+        ):
+            return True
+        return bool(retry_no_data) and isinstance(error, NwsNoDataError)
+
+    return _retry
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Return seconds requested by a `Retry-After` header, if any."""
+    if not isinstance(error, ClientResponseError) or not error.headers:
+        return None
+    value = error.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Limit retries to a ratio of successful calls.
+
+    Every success deposits `ratio` tokens up to `max_tokens` and every retry
+    withdraws one token.  The budget starts full, so bursts of up to
+    `max_tokens` retries are allowed.
+    """
+
+    def __init__(self: RetryBudget, ratio: float = 0.1, max_tokens: float = 10.0):
+        if ratio < 0 or max_tokens < 1:
+            raise ValueError("ratio must be >= 0 and max_tokens must be >= 1")
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self: RetryBudget) -> None:
+        """Record successful call."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self: RetryBudget) -> bool:
+        """Withdraw a token for a retry, returns False if budget is exhausted."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """Retry awaitables with exponential backoff and full jitter.
+
+    A policy is meant to be created once and shared by many calls, so that the
+    optional `budget` applies across all of them.
+
+    Parameters
+    ----------
+    base_delay : float, datetime.timedelta
+        Delay before the first retry, before jitter.
+    max_delay : float, datetime.timedelta
+        Maximum delay between attempts, before jitter.
+    stop : float, datetime.timedelta, optional
+        Stop retrying when the next attempt would start after this time.
+    stop_after_elapsed : bool
+        Whether `stop` is compared to the time elapsed after a failed attempt,
+        without the next delay, like `tenacity.stop_after_delay`.
+    max_attempts : int, optional
+        Maximum number of attempts, including the first one.
+    multiplier : float
+        Backoff multiplier, 1 gives a fixed delay.
+    jitter : bool
+        Whether to draw each delay uniformly between 0 and the backoff delay.
+    budget : RetryBudget, optional
+        Shared budget limiting retries to a ratio of successful calls.
+    retry_if : Callable, optional
+        Decides whether an error is retried, defaults to `nws_retry_if` with
+        throttled requests retried.
+    retry_no_data : bool
+        Whether the default `retry_if` retries `NwsNoDataError`.
+    """
+
+    def __init__(
+        self: RetryPolicy,
+        *,
+        base_delay: Union[float, timedelta] = 1.0,
+        max_delay: Union[float, timedelta] = 60.0,
+        stop: Union[None, float, timedelta] = None,
+        stop_after_elapsed: bool = False,
+        max_attempts: Optional[int] = None,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        budget: Optional[RetryBudget] = None,
+        retry_if: Optional[Callable[[BaseException], bool]] = None,
+        retry_no_data: bool = False,
+    ):
+        self.base_delay = seconds(base_delay)
+        self.max_delay = seconds(max_delay)
+        self.stop = None if stop is None else seconds(stop)
+        self.stop_after_elapsed = stop_after_elapsed
+        self.max_attempts = max_attempts
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.budget = budget
+        self.retry_if = retry_if or nws_retry_if(retry_no_data, retry_throttled=True)
+
+    def backoff(self: RetryPolicy, attempt: int, error: BaseException) -> float:
+        """Return delay in seconds before retrying after `attempt` failed.
+
+        `attempt` starts at 0.  A `Retry-After` header is a lower bound.
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        server_delay = retry_after(error)
+        if server_delay is not None:
+            delay = max(delay, server_delay)
+        return delay
+
+    def _stopped(self: RetryPolicy, elapsed: float, delay: float) -> bool:
+        if self.stop is None:
+            return False
+        if self.stop_after_elapsed:
+            return elapsed >= self.stop
+        return elapsed + delay > self.stop
+
+    async def call(
+        self: RetryPolicy,
+        func: Callable[..., Awaitable[_T]],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> _T:
+        """Call `func` with args, retrying according to the policy."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        attempt = 0
+        while True:
+            try:
+                with retry_attempt(attempt + 1):
+                    result = await func(*args, **kwargs)
+            except Exception as err:  # noqa: PERF203
+                if not self.retry_if(err):
+                    raise
+                attempt += 1
+                if self.max_attempts is not None and attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt - 1, err)
+                if self._stopped(loop.time() - start, delay):
+                    raise
+                if self.budget is not None and not self.budget.withdraw():
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                if self.budget is not None:
+                    self.budget.deposit()
+                return result
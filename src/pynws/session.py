@@ -0,0 +1,200 @@
+"""Managed aiohttp sessions tuned for api.weather.gov."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace, TracebackType
+from typing import Any, Optional, Type
+
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionQueuedEndParams,
+    TraceConnectionQueuedStartParams,
+    TraceRequestEndParams,
+    TraceRequestExceptionParams,
+    TraceRequestStartParams,
+)
+
+from .const import API_URL, Final
+from .raw_data import get_header
+
+DEFAULT_POOL_LIMIT: Final = 100
+DEFAULT_POOL_LIMIT_PER_HOST: Final = 30
+DEFAULT_KEEPALIVE_TIMEOUT: Final = 60.0
+DEFAULT_DNS_CACHE_TTL: Final = 300
+
+
+class PoolStats:
+    """Connection pool statistics of a session."""
+
+    def __init__(self: PoolStats):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.queued_time = 0.0
+
+    @property
+    def saturation(self: PoolStats) -> float:
+        """Fraction of requests that waited for a free connection."""
+        return self.queued / self.requests if self.requests else 0.0
+
+    @property
+    def reuse_ratio(self: PoolStats) -> float:
+        """Fraction of connections that were reused instead of opened."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def trace_config(self: PoolStats) -> TraceConfig:
+        """Return trace config collecting these statistics."""
+        trace_config = TraceConfig()
+
+        async def on_request_start(
+            session: ClientSession, ctx: SimpleNamespace, _: TraceRequestStartParams
+        ) -> None:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        async def on_request_done(
+            session: ClientSession,
+            ctx: SimpleNamespace,
+            _: TraceRequestEndParams | TraceRequestExceptionParams,
+        ) -> None:
+            self.in_flight -= 1
+
+        async def on_queued_start(
+            session: ClientSession,
+            ctx: SimpleNamespace,
+            _: TraceConnectionQueuedStartParams,
+        ) -> None:
+            self.queued += 1
+            ctx.queued_at = time.monotonic()
+
+        async def on_queued_end(
+            session: ClientSession,
+            ctx: SimpleNamespace,
+            _: TraceConnectionQueuedEndParams,
+        ) -> None:
+            self.queued_time += time.monotonic() - ctx.queued_at
+
+        async def on_create(
+            session: ClientSession, ctx: SimpleNamespace, _: Any
+        ) -> None:
+            self.connections_created += 1
+
+        async def on_reuse(
+            session: ClientSession, ctx: SimpleNamespace, _: Any
+        ) -> None:
+            self.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_done)
+        trace_config.on_request_exception.append(on_request_done)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+
+class ManagedSession:
+    """Create and close an aiohttp session tuned for api.weather.gov.
+
+    Connections are kept alive between poll cycles, DNS answers are cached and
+    `warm_up` connections are opened on entry so the first poll burst does
+    not pay for TLS handshakes.  Pool statistics are available in `stats`.
+
+    Example:
+        async with ManagedSession(USERID, warm_up=4) as session:
+            nws = SimpleNWS(*LATLON, USERID, session)
+    """
+
+    def __init__(
+        self: ManagedSession,
+        userid: str,
+        *,
+        limit: int = DEFAULT_POOL_LIMIT,
+        limit_per_host: int = DEFAULT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache: Optional[int] = DEFAULT_DNS_CACHE_TTL,
+        warm_up: int = 0,
+        **session_kwargs: Any,
+    ):
+        self.userid = userid
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.warm_up_connections = warm_up
+        self.session_kwargs = session_kwargs
+        self.stats = PoolStats()
+        self.session: Optional[ClientSession] = None
+
+    def create_session(self: ManagedSession) -> ClientSession:
+        """Create the tuned session."""
+        connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        session_kwargs = dict(self.session_kwargs)
+        trace_configs = [
+            *session_kwargs.pop("trace_configs", []),
+            self.stats.trace_config(),
+        ]
+        self.session = ClientSession(
+            connector=connector, trace_configs=trace_configs, **session_kwargs
+        )
+        return self.session
+
+    async def warm_up(
+        self: ManagedSession, connections: int, url: str = API_URL
+    ) -> int:
+        """Open up to `connections` keep-alive connections to url.
+
+        Warm-up is best effort, failed requests are ignored.
+
+        Returns:
+            int: Number of successful warm-up requests.
+        """
+        if self.session is None:
+            raise RuntimeError("Session is not created")
+        session = self.session
+        header = get_header(self.userid)
+
+        async def _request() -> bool:
+            try:
+                async with session.get(url, headers=header) as res:
+                    await res.read()
+            except (ClientError, asyncio.TimeoutError):
+                return False
+            return True
+
+        if self.limit_per_host:
+            connections = min(connections, self.limit_per_host)
+        results = await asyncio.gather(*(_request() for _ in range(connections)))
+        return sum(results)
+
+    async def __aenter__(self: ManagedSession) -> ClientSession:
+        session = self.create_session()
+        if self.warm_up_connections:
+            await self.warm_up(self.warm_up_connections)
+        return session
+
+    async def __aexit__(
+        self: ManagedSession,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -2,98 +2,110 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache, wraps
+import logging
 from statistics import mean
+import time
 from typing import (
     TYPE_CHECKING,
     Any,
     Awaitable,
     Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
     NamedTuple,
     Optional,
     Set,
     Tuple,
+    TypeVar,
     Union,
+    cast,
 )
 
-if TYPE_CHECKING:
-    from datetime import timedelta
-
-from aiohttp import ClientResponseError, ClientSession
-from metar import Metar
+from aiohttp import ClientError, ClientSession
 from yarl import URL
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from .const import ALERT_ID, API_WEATHER_CODE, Final, ForecastUnits, MetadataKeys
+if TYPE_CHECKING:
+    from metar import Metar
+
+from .alerts import Alert, AlertDiff, AlertFeed, AlertStore
+from .batch import get_stations_observations_latest
+from .const import (
+    ALERT_ID,
+    API_WEATHER_CODE,
+    DEFAULT_BACKFILL_LIMIT,
+    DEFAULT_BACKFILL_STEP,
+    WIND_DIRECTIONS,
+    Final,
+    ForecastUnits,
+    MetadataKeys,
+)
 from .forecast import DetailedForecast
+from .instrumentation import UpdateReport, count_objects, timed_model, timed_update
 from .nws import Nws, NwsError, NwsNoDataError
-from .units import convert_unit
-
-WIND_DIRECTIONS: Final = [
-    "N",
-    "NNE",
-    "NE",
-    "ENE",
-    "E",
-    "ESE",
-    "SE",
-    "SSE",
-    "S",
-    "SSW",
-    "SW",
-    "WSW",
-    "W",
-    "WNW",
-    "NW",
-    "NNW",
-]
+from .observations import ObservationBuffer
+from .raw_data import RequestOptions
+from .retry import RetryPolicy, nws_retry_if, seconds
+from .stations import DEFAULT_STATION_MAX_AGE, StationHealth, StationStatus
+from .synthesis import synthesize_daily, synthesize_hourly
+from .units import (
+    SI,
+    UnitConverter,
+    UnitSystem,
+    celsius_to_fahrenheit,
+    convert_forecast_period,
+    fahrenheit_to_celsius,
+    unit_converter,
+)
 
+_LOGGER = logging.getLogger(__name__)
 
 WIND: Final = {name: idx * 360 / 16 for idx, name in enumerate(WIND_DIRECTIONS)}
 
 
-def _nws_retry_func(retry_no_data: bool):
-    """
-    Return function used for tenacity.retry.
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
 
-    Retry if:
-        - if error is ClientResponseError and has a 5xx status.
-        - if error is NwsNoDataError, the behavior is determined by retry_no_data
 
-    Parameters
-    ----------
-    retry_no_data : bool
-        Whether to retry when `NwsNoDataError` is raised.
+def _timed_update(data: str) -> Callable[[_F], _F]:
+    """Record an `UpdateReport` of the update for data if timing is enabled."""
 
-    """
+    def decorator(func: _F) -> _F:
+        @wraps(func)
+        async def wrapper(self: SimpleNWS, *args: Any, **kwargs: Any) -> Any:
+            if not self.timing:
+                return await func(self, *args, **kwargs)
+            with timed_update(func.__name__) as timer:
+                result = await func(self, *args, **kwargs)
+            self.update_reports[data] = timer.report()
+            return result
 
-    def _retry(error: BaseException) -> bool:
-        """Whether to retry based on execptions."""
-        if isinstance(error, ClientResponseError) and error.status >= 500:
-            return True
-        return bool(retry_no_data) and isinstance(error, NwsNoDataError)
+        return cast(_F, wrapper)
 
-    return _retry
+    return decorator
 
 
-def _setup_retry_func(
-    func: Callable[[Any, Any], Awaitable[Any]],
-    interval: Union[float, timedelta],
-    stop: Union[float, timedelta],
-    *,
-    retry_no_data=False,
-) -> Callable[..., Awaitable[Any]]:
-    from tenacity import retry, retry_if_exception, stop_after_delay, wait_fixed
-
-    retry_func = _nws_retry_func(retry_no_data=retry_no_data)
-
-    return retry(
-        reraise=True,
-        wait=wait_fixed(interval),
-        stop=stop_after_delay(stop),
-        retry=retry_if_exception(retry_func),
-    )(func)
+@lru_cache(maxsize=32)
+def _fixed_retry_policy(
+    interval: float,
+    stop: float,
+    retry_no_data: bool,
+) -> RetryPolicy:
+    """Return shared policy retrying at a fixed interval until `stop`."""
+    return RetryPolicy(
+        base_delay=interval,
+        max_delay=interval,
+        stop=stop,
+        stop_after_elapsed=True,
+        multiplier=1.0,
+        jitter=False,
+        retry_if=nws_retry_if(retry_no_data=retry_no_data),
+    )
 
 
 async def call_with_retry(
@@ -105,7 +117,10 @@ async def call_with_retry(
     retry_no_data=False,
     **kwargs,
 ) -> Callable[[Any, Any], Awaitable[Any]]:
-    """Call an update function with retries.
+    """Call an update function with retries at a fixed interval.
+
+    Use `RetryPolicy.call` of a shared policy for exponential backoff with
+    jitter and a retry budget.
 
     Parameters
     ----------
@@ -122,8 +137,26 @@ async def call_with_retry(
     kwargs : Any
         Keyword args to pass to func.
     """
-    retried_func = _setup_retry_func(func, interval, stop, retry_no_data=retry_no_data)
-    return await retried_func(*args, raise_no_data=retry_no_data, **kwargs)
+    policy = _fixed_retry_policy(seconds(interval), seconds(stop), bool(retry_no_data))
+    return await policy.call(func, *args, raise_no_data=retry_no_data, **kwargs)
+
+
+def _convert_quantity(
+    converter: UnitConverter, value: Any, *, skip_unknown: bool = False
+) -> Any:
+    """Convert an NWS quantity with converter, other values are kept.
+
+    With `skip_unknown`, a quantity with an unknown unit code is None.
+    """
+    if not isinstance(value, dict):
+        return value
+    try:
+        return converter.convert_quantities((value,))[0]
+    except ValueError:
+        if not skip_unknown:
+            raise
+        _LOGGER.debug("Unknown unit code in quantity %s", value)
+        return None
 
 
 class MetarParam(NamedTuple):
@@ -132,16 +165,18 @@ class MetarParam(NamedTuple):
     attr: str
     units: Optional[str] = None
     multiplier: Optional[float] = None
+    # unit code of the value after multiplier
+    unit_code: Optional[str] = None
 
 
 OBSERVATIONS: Final[Dict[str, Optional[MetarParam]]] = {
-    "temperature": MetarParam("temp", "C"),
+    "temperature": MetarParam("temp", "C", unit_code="degC"),
     "barometricPressure": None,
-    "seaLevelPressure": MetarParam("press", "HPA", 100.0),
+    "seaLevelPressure": MetarParam("press", "HPA", 100.0, "Pa"),
     "relativeHumidity": None,
-    "windSpeed": MetarParam("wind_speed", "MPS", 3.6),
+    "windSpeed": MetarParam("wind_speed", "MPS", 3.6, "km_h-1"),
     "windDirection": MetarParam("wind_dir"),
-    "visibility": MetarParam("vis", "M"),
+    "visibility": MetarParam("vis", "M", unit_code="m"),
     "elevation": None,
     "textDescription": None,
     "dewpoint": None,
@@ -158,6 +193,18 @@ OBSERVATIONS: Final[Dict[str, Optional[MetarParam]]] = {
     "heatIndex": None,
 }
 
+# observation fields used to score station health and to decide on backfill
+CORE_OBSERVATIONS: Final = [
+    "temperature",
+    "dewpoint",
+    "relativeHumidity",
+    "windSpeed",
+    "windDirection",
+    "barometricPressure",
+    "seaLevelPressure",
+    "visibility",
+]
+
 _WeatherCodes = List[Tuple[str, Optional[int]]]
 
 
@@ -192,6 +239,19 @@ class SimpleNWS(Nws):
     Uses normal api first.  If value is None, use metar info.
 
     By default, forecasts that end before now will be filtered out.
+
+    If `timing`, each update records an `UpdateReport` in `update_reports`,
+    keyed by the data it updates, e.g. "observation" or "forecast".
+
+    If `compact_alerts`, alert updates store `Alert` objects instead of
+    dicts, shared by alert id between the alert lists and instances.
+
+    If `synthesize_forecasts`, `update_detailed_forecast` also sets
+    `forecast` and `forecast_hourly` from the detailed forecast, so
+    `update_forecast` and `update_forecast_hourly` are not needed.
+
+    Observation and detailed forecast values are converted to the units of
+    `unit_system`.
     """
 
     def __init__(
@@ -202,15 +262,38 @@ class SimpleNWS(Nws):
         session: ClientSession,
         filter_forecast: bool = True,
         forecast_units: ForecastUnits = ForecastUnits.US,
+        request_options: Optional[RequestOptions] = None,
+        timeout: Optional[float] = None,
+        timing: bool = False,
+        alert_feed: Optional[AlertFeed] = None,
+        compact_alerts: bool = False,
+        synthesize_forecasts: bool = False,
+        unit_system: UnitSystem = SI,
     ):
         """Set up simplified NWS class."""
-        super().__init__(session, api_key, (lat, lon), forecast_units=forecast_units)
+        super().__init__(
+            session,
+            api_key,
+            (lat, lon),
+            forecast_units=forecast_units,
+            request_options=request_options,
+            timeout=timeout,
+            alert_feed=alert_feed,
+            unit_system=unit_system,
+        )
 
         self.filter_forecast = filter_forecast
+        self.timing = timing
+        self.compact_alerts = compact_alerts
+        self.synthesize_forecasts = synthesize_forecasts
+        self.update_reports: Dict[str, UpdateReport] = {}
         self._observation: Optional[List[Dict[str, Any]]] = None
         self._metar_obs: Optional[List[Optional[Metar.Metar]]] = None
+        self._parsed_metar: Dict[str, Optional[Metar.Metar]] = {}
+        self._observation_buffers: Dict[str, ObservationBuffer] = {}
         self.station: Optional[str] = None
         self.stations: Optional[List[str]] = None
+        self.station_health: Optional[StationHealth] = None
         self._forecast: Optional[List[Dict[str, Any]]] = None
         self._forecast_metadata: Dict[str, str | None] = {}
         self._forecast_hourly: Optional[List[Dict[str, Any]]] = None
@@ -220,25 +303,89 @@ class SimpleNWS(Nws):
         self._alerts_county_zone: List[Dict[str, Any]] = []
         self._alerts_fire_weather_zone: List[Dict[str, Any]] = []
         self._alerts_all_zones: List[Dict[str, Any]] = []
+        self._alerts_point: List[Dict[str, Any]] = []
+        self.alert_store = AlertStore()
         self._all_zones: List[str] = []
 
     async def set_station(self: SimpleNWS, station: Optional[str] = None) -> None:
         """
         Set station or retrieve station list.
-        If no station is supplied, the first retrieved value is set.
+        If no station is supplied, the healthiest station is set, which is the
+        nearest station until observations have been received.  The station
+        then fails over automatically when it goes stale, stops reporting
+        fields or errors.  A supplied station is never changed automatically.
         """
         if station:
             self.station = station
+            self.station_health = None
             if not self.stations:
                 self.stations = [self.station]
         else:
             if not self.stations:
-                self.stations = await self.get_points_stations()
-            self.station = self.stations[0]
+                features = await self.get_points_stations_metadata()
+                self.station_health = StationHealth.from_features(features)
+                self.stations = list(self.station_health.stations)
+            elif self.station_health is None:
+                self.station_health = StationHealth(
+                    StationStatus(s) for s in self.stations
+                )
+            self.station = self.station_health.best()
+
+    def _failover_station(self: SimpleNWS) -> bool:
+        """Switch to the best station if the current one is unhealthy."""
+        if self.station_health is None or self.station is None:
+            return False
+        if self.station_health.is_healthy(self.station):
+            return False
+        best = self.station_health.best()
+        if best == self.station:
+            return False
+        self.station = best
+        return True
+
+    async def _get_observations_with_health(
+        self: SimpleNWS,
+        limit: int,
+        start_time: Optional[datetime],
+        incremental: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get observations and record station health.
+
+        If incremental, only observations newer than the station buffer are
+        requested and the whole buffer is returned.
+        """
+        buffer = None
+        if incremental and self.station is not None:
+            buffer = self._observation_buffers.setdefault(
+                self.station, ObservationBuffer()
+            )
+            if start_time is None:
+                start_time = buffer.newest_timestamp
+        try:
+            obs = await self.get_stations_observations(limit, start_time=start_time)
+        except (ClientError, asyncio.TimeoutError):
+            if self.station_health is not None and self.station is not None:
+                self.station_health.record_failure(self.station)
+                self._failover_station()
+            raise
+        if buffer is not None:
+            buffer.merge(obs)
+            obs = buffer.newest_first()
+        if self.station_health is not None and self.station is not None:
+            if obs:
+                self.station_health.record_observation(
+                    self.station, obs[0], CORE_OBSERVATIONS
+                )
+            else:
+                self.station_health.record_failure(self.station)
+        return obs
 
     @staticmethod
     def extract_metar(obs: Dict[str, Any]) -> Optional[Metar.Metar]:
         """Return parsed metar if available."""
+        # metar is slow to import, so it is imported on first use
+        from metar import Metar
+
         metar_msg = obs.get("rawMessage")
         if metar_msg:
             try:
@@ -249,25 +396,195 @@ class SimpleNWS(Nws):
             metar_obs = None
         return metar_obs
 
+    def _set_observation(self: SimpleNWS, obs: List[Dict[str, Any]]) -> None:
+        with timed_model():
+            self._observation = obs
+            # observations kept from the last update, as in incremental mode,
+            # reuse their parsed METAR
+            parsed = self._parsed_metar
+            self._parsed_metar = {}
+            self._metar_obs = []
+            for iobs in obs:
+                metar_msg = iobs.get("rawMessage")
+                if metar_msg in parsed:
+                    metar_obs = parsed[metar_msg]
+                else:
+                    metar_obs = self.extract_metar(iobs)
+                if metar_msg:
+                    self._parsed_metar[metar_msg] = metar_obs
+                self._metar_obs.append(metar_obs)
+        count_objects(len(obs))
+
+    @_timed_update("observation")
     async def update_observation(
         self: SimpleNWS,
         limit: int = 0,
         start_time: Optional[datetime] = None,
         *,
         raise_no_data: bool = False,
+        incremental: bool = False,
     ) -> None:
-        """Update observation."""
-        obs = await self.get_stations_observations(limit, start_time=start_time)
+        """Update observation.
+
+        If the station is unhealthy and was chosen automatically, the next best
+        station is tried once before returning.
+
+        If `incremental`, observations are kept in a bounded buffer per station
+        and after the first update only observations newer than the newest
+        buffered one are requested.
+        """
+        obs = await self._get_observations_with_health(limit, start_time, incremental)
+        if self._failover_station():
+            obs = (
+                await self._get_observations_with_health(limit, start_time, incremental)
+                or obs
+            )
         if obs:
-            self._observation = obs
-            self._metar_obs = [self.extract_metar(iobs) for iobs in self._observation]
+            self._set_observation(obs)
         elif raise_no_data:
             raise NwsNoDataError("Observation received with no data.")
 
+    @_timed_update("observation")
+    async def update_observation_latest(
+        self: SimpleNWS,
+        required_fields: Optional[Iterable[str]] = None,
+        backfill_limit: int = DEFAULT_BACKFILL_LIMIT,
+        backfill_step: int = DEFAULT_BACKFILL_STEP,
+        *,
+        raise_no_data: bool = False,
+    ) -> None:
+        """Update observation from the latest observation.
+
+        Older observations are only requested while one of `required_fields`
+        is missing, `backfill_step` at a time and at most `backfill_limit` in
+        total.  Defaults to the core measurements in `CORE_OBSERVATIONS`.
+        """
+        if self.station is None:
+            raise NwsError("Need to set station")
+        fields = list(CORE_OBSERVATIONS if required_fields is None else required_fields)
+        try:
+            latest = await self.get_stations_observations_latest()
+        except (ClientError, asyncio.TimeoutError):
+            if self.station_health is not None:
+                self.station_health.record_failure(self.station)
+                self._failover_station()
+            raise
+
+        buffer = ObservationBuffer(backfill_limit + 1)
+        if latest:
+            buffer.merge([latest])
+        fetched = 0
+        while fetched < backfill_limit and self._missing_fields(buffer, fields):
+            oldest = buffer.newest_first()[-1] if len(buffer) else None
+            # end is inclusive, so stop just before the oldest buffered one
+            end_time = (
+                datetime.fromisoformat(oldest["timestamp"]) - timedelta(seconds=1)
+                if oldest and oldest.get("timestamp")
+                else None
+            )
+            page = await self.get_stations_observations(
+                min(backfill_step, backfill_limit - fetched), end_time=end_time
+            )
+            added = buffer.merge(page)
+            if not added:
+                break
+            fetched += added
+
+        obs = buffer.newest_first()
+        if self.station_health is not None:
+            if obs:
+                self.station_health.record_observation(
+                    self.station, obs[0], CORE_OBSERVATIONS
+                )
+            else:
+                self.station_health.record_failure(self.station)
+            self._failover_station()
+        if obs:
+            self._set_observation(obs)
+        elif raise_no_data:
+            raise NwsNoDataError("Observation received with no data.")
+
+    @classmethod
+    def _missing_fields(
+        cls, observations: Iterable[Dict[str, Any]], fields: List[str]
+    ) -> List[str]:
+        """Return fields without a value in any observation."""
+        missing = list(fields)
+        for obs in observations:
+            missing = [f for f in missing if cls.extract_value(obs, f) is None]
+            if not missing:
+                break
+        return missing
+
+    @_timed_update("observation")
+    async def update_observation_multi_station(
+        self: SimpleNWS,
+        num_stations: int = 3,
+        *,
+        raise_no_data: bool = False,
+    ) -> None:
+        """Update observation from the latest observation of several stations.
+
+        The latest observations of the current station and the next
+        `num_stations - 1` best stations are fetched concurrently.  Fields missing
+        from the current station are filled from the next best fresh station.
+        """
+        if num_stations < 1:
+            raise ValueError(f"num_stations must be at least 1, got {num_stations}")
+        if self.station is None:
+            raise NwsError("Need to set station")
+        if self.station_health is not None:
+            ranked = self.station_health.ranked()
+        else:
+            ranked = list(self.stations or [])
+        stations = [self.station] + [s for s in ranked if s != self.station]
+        stations = stations[:num_stations]
+
+        results = await get_stations_observations_latest(
+            stations,
+            self.session,
+            self.userid,
+            max_concurrency=num_stations,
+            options=self.request_options,
+        )
+
+        max_age = (
+            self.station_health.max_age
+            if self.station_health is not None
+            else DEFAULT_STATION_MAX_AGE
+        )
+        now = datetime.now(timezone.utc)
+        obs: List[Dict[str, Any]] = []
+        for station, result in results.items():
+            if self.station_health is not None:
+                if result.observation:
+                    self.station_health.record_observation(
+                        station, result.observation, CORE_OBSERVATIONS
+                    )
+                else:
+                    self.station_health.record_failure(station)
+            if not result.observation:
+                continue
+            timestamp = result.observation.get("timestamp")
+            fresh = timestamp and now - datetime.fromisoformat(timestamp) <= max_age
+            # current station is always used, others only to fill fresh values
+            if station == self.station or fresh:
+                obs.append(result.observation)
+
+        primary = results[self.station]
+        if not obs and primary.error is not None:
+            raise primary.error
+        if obs:
+            self._set_observation(obs)
+        elif raise_no_data:
+            raise NwsNoDataError("Observation received with no data.")
+
+    @_timed_update("forecast")
     async def update_forecast(self: SimpleNWS, *, raise_no_data: bool = False) -> None:
         """Update forecast."""
         forecast_with_metadata = await self.get_gridpoints_forecast()
         forecast = forecast_with_metadata["periods"]
+        count_objects(len(forecast))
         if self._filter_forecast(forecast):
             self._forecast = forecast
             self._forecast_metadata = {
@@ -277,12 +594,14 @@ class SimpleNWS(Nws):
         elif raise_no_data:
             raise NwsNoDataError("Forecast received with no data.")
 
+    @_timed_update("forecast_hourly")
     async def update_forecast_hourly(
         self: SimpleNWS, *, raise_no_data: bool = False
     ) -> None:
         """Update forecast hourly."""
         forecast_hourly_with_metadata = await self.get_gridpoints_forecast_hourly()
         forecast_hourly = forecast_hourly_with_metadata["periods"]
+        count_objects(len(forecast_hourly))
         if self._filter_forecast(forecast_hourly):
             self._forecast_hourly = forecast_hourly
             self._forecast_hourly_metadata = {
@@ -292,6 +611,7 @@ class SimpleNWS(Nws):
         elif raise_no_data:
             raise NwsNoDataError("Forecast hourly received with no data.")
 
+    @_timed_update("detailed_forecast")
     async def update_detailed_forecast(
         self: SimpleNWS, *, raise_no_data: bool = False
     ) -> None:
@@ -306,6 +626,36 @@ class SimpleNWS(Nws):
             )
 
         self._detailed_forecast = await self.get_detailed_forecast()
+        if self.synthesize_forecasts:
+            with timed_model():
+                self._synthesize_forecasts(self._detailed_forecast)
+
+    def _synthesize_forecasts(self: SimpleNWS, detailed: DetailedForecast) -> None:
+        """Set forecast and forecast hourly from a detailed forecast."""
+        tz: tzinfo = timezone.utc
+        if self.time_zone:
+            try:
+                tz = ZoneInfo(self.time_zone)
+            except (ValueError, ZoneInfoNotFoundError):
+                _LOGGER.debug("Unknown time zone %s, using UTC", self.time_zone)
+        now = datetime.now(timezone.utc)
+        units = self.forecast_units
+        self._forecast = synthesize_daily(detailed, now, units=units, tz=tz)
+        self._forecast_hourly = synthesize_hourly(detailed, now, units=units, tz=tz)
+        count_objects(len(self._forecast) + len(self._forecast_hourly))
+        metadata: Dict[str, str | None] = dict.fromkeys(MetadataKeys)
+        metadata["updateTime"] = detailed.update_time.isoformat()
+        self._forecast_metadata = dict(metadata)
+        self._forecast_hourly_metadata = dict(metadata)
+
+    def _alert_models(
+        self: SimpleNWS, alerts: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Return alerts as shared `Alert` objects if compact_alerts is set."""
+        if not self.compact_alerts:
+            return alerts
+        # Alert is a read-only Mapping used in place of the dict
+        return cast(List[Dict[str, Any]], [Alert.from_properties(a) for a in alerts])
 
     @staticmethod
     def _unique_alert_ids(alerts: List[Dict[str, Any]]) -> Set[str]:
@@ -321,6 +671,7 @@ class SimpleNWS(Nws):
         current_alert_ids = self._unique_alert_ids(current_alerts)
         return [alert for alert in alerts if alert[ALERT_ID] not in current_alert_ids]
 
+    @_timed_update("alerts_forecast_zone")
     async def update_alerts_forecast_zone(
         self: SimpleNWS, *, raise_no_data: bool = False
     ) -> List[Dict[str, Any]]:
@@ -334,10 +685,14 @@ class SimpleNWS(Nws):
                 "raise_no_data=True not implemented for update_alerts_forecast_zone"
             )
         alerts = await self.get_alerts_forecast_zone()
-        new_alerts = self._new_alerts(alerts, self._alerts_forecast_zone)
+        with timed_model():
+            alerts = self._alert_models(alerts)
+            new_alerts = self._new_alerts(alerts, self._alerts_forecast_zone)
+        count_objects(len(alerts))
         self._alerts_forecast_zone = alerts
         return new_alerts
 
+    @_timed_update("alerts_county_zone")
     async def update_alerts_county_zone(
         self: SimpleNWS, *, raise_no_data: bool = False
     ) -> List[Dict[str, Any]]:
@@ -351,10 +706,14 @@ class SimpleNWS(Nws):
                 "raise_no_data=True not implemented for update_alerts_county_zone"
             )
         alerts = await self.get_alerts_county_zone()
-        new_alerts = self._new_alerts(alerts, self._alerts_county_zone)
+        with timed_model():
+            alerts = self._alert_models(alerts)
+            new_alerts = self._new_alerts(alerts, self._alerts_county_zone)
+        count_objects(len(alerts))
         self._alerts_county_zone = alerts
         return new_alerts
 
+    @_timed_update("alerts_fire_weather_zone")
     async def update_alerts_fire_weather_zone(
         self: SimpleNWS, *, raise_no_data: bool = False
     ) -> List[Dict[str, Any]]:
@@ -368,10 +727,14 @@ class SimpleNWS(Nws):
                 "raise_no_data=True not implemented for update_alerts_fire_weather_zone"
             )
         alerts = await self.get_alerts_fire_weather_zone()
-        new_alerts = self._new_alerts(alerts, self._alerts_fire_weather_zone)
+        with timed_model():
+            alerts = self._alert_models(alerts)
+            new_alerts = self._new_alerts(alerts, self._alerts_fire_weather_zone)
+        count_objects(len(alerts))
         self._alerts_fire_weather_zone = alerts
         return new_alerts
 
+    @_timed_update("alerts_all_zones")
     async def update_alerts_all_zones(self: SimpleNWS) -> List[Dict[str, Any]]:
         """Update all alerts zones."""
         if not self.forecast_zone:
@@ -387,15 +750,45 @@ class SimpleNWS(Nws):
         ]
 
         alerts: List[Dict[str, Any]] = []
-        for alert_list in alerts_data:
-            for alert in alert_list:
-                if alert["id"] not in self._unique_alert_ids(alerts):
-                    alerts.append(alert)
-
-        new_alerts = self._new_alerts(alerts, self._alerts_all_zones)
+        with timed_model():
+            for alert_list in alerts_data:
+                for alert in self._alert_models(alert_list):
+                    if alert["id"] not in self._unique_alert_ids(alerts):
+                        alerts.append(alert)
+
+            new_alerts = self._new_alerts(alerts, self._alerts_all_zones)
+        count_objects(len(alerts))
         self._alerts_all_zones = alerts
         return new_alerts
 
+    @_timed_update("alerts_point")
+    async def update_alerts_point(self: SimpleNWS) -> List[Dict[str, Any]]:
+        """Update alerts affecting latlon.
+
+        Gets the alerts of all zones of the location with one request and
+        without looking up the zones first.
+        """
+        alerts = await self.get_alerts_point()
+        with timed_model():
+            alerts = self._alert_models(alerts)
+            new_alerts = self._new_alerts(alerts, self._alerts_point)
+        count_objects(len(alerts))
+        self._alerts_point = alerts
+        return new_alerts
+
+    @_timed_update("alert_changes")
+    async def update_alert_changes(self: SimpleNWS) -> AlertDiff:
+        """Update `alert_store` with the alerts affecting latlon.
+
+        Returns:
+            AlertDiff: new, updated, cancelled and expired alerts.
+        """
+        alerts = await self.get_alerts_point()
+        with timed_model():
+            diff = self.alert_store.apply(self._alert_models(alerts))
+        count_objects(len(diff.new) + len(diff.updated))
+        return diff
+
     @property
     def all_zones(self: SimpleNWS) -> List[str]:
         """All alert zones."""
@@ -416,21 +809,77 @@ class SimpleNWS(Nws):
             return float(sub_value), value.get("unitCode")
         return value
 
+    @contextmanager
+    def _timed_conversion(self: SimpleNWS, data: str) -> Iterator[None]:
+        """Record time spent inside the block as conversion of data."""
+        report = self.update_reports.get(data) if self.timing else None
+        if report is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.update_reports[data] = report._replace(
+                conversion=time.perf_counter() - start
+            )
+
     @property
     def observation(self: SimpleNWS) -> Optional[Dict[str, Any]]:
         """Observation dict"""
+        with self._timed_conversion("observation"):
+            return self._convert_observation()
 
+    @property
+    def observation_history(self: SimpleNWS) -> List[Dict[str, Any]]:
+        """Observations of the last update, newest first, converted to
+        `unit_system`.  Unlike `observation`, missing values are not filled
+        in from older observations or METAR.
+        """
+        if not self._observation:
+            return []
+        with self._timed_conversion("observation"):
+            columns = self._observation_columns(self._observation)
+            return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def _observation_columns(
+        self: SimpleNWS, observations: List[Dict[str, Any]]
+    ) -> Dict[str, List[Any]]:
+        """Return values of each observation field, quantities converted to
+        `unit_system` a field at a time.
+
+        Quantities with an unknown unit code are returned as None.
+        """
+        converter = unit_converter(self.unit_system)
+        columns: Dict[str, List[Any]] = {}
+        for obs in OBSERVATIONS:
+            values = [o.get(obs) for o in observations]
+            if not any(isinstance(v, dict) for v in values):
+                columns[obs] = values
+                continue
+            quantities = [v if isinstance(v, dict) else None for v in values]
+            try:
+                columns[obs] = converter.convert_quantities(quantities)
+            except ValueError:
+                columns[obs] = [
+                    _convert_quantity(converter, q, skip_unknown=True)
+                    for q in quantities
+                ]
+        return columns
+
+    def _convert_observation(self: SimpleNWS) -> Optional[Dict[str, Any]]:
         if self._observation is None or self._observation == []:
             return None
 
+        converter = unit_converter(self.unit_system)
         data: Dict[str, Any] = {}
         for obs, metar_param in OBSERVATIONS.items():
-            obs_list = [self.extract_value(o, obs) for o in self._observation]
-            obs_item = next(iter([o for o in obs_list if o]), None)
-            if isinstance(obs_item, tuple):
-                data[obs] = convert_unit(obs_item[1], obs_item[0])
-            else:
-                data[obs] = obs_item
+            # newest value, a quantity of 0 is a value but an empty text is not,
+            # converting only the value used
+            values = (
+                _convert_quantity(converter, o.get(obs)) for o in self._observation
+            )
+            data[obs] = next((v for v in values if v or isinstance(v, float)), None)
 
             if (
                 data[obs] is None
@@ -446,6 +895,8 @@ class SimpleNWS(Nws):
                         data[obs] = met_prop.value()
                     if metar_param.multiplier is not None:
                         data[obs] = data[obs] * metar_param.multiplier
+                    if metar_param.unit_code is not None:
+                        data[obs] = converter.convert(metar_param.unit_code, data[obs])
 
         if data.get("icon"):
             time, weather = parse_icon(data["icon"])
@@ -459,8 +910,23 @@ class SimpleNWS(Nws):
     @property
     def forecast(self: SimpleNWS) -> List[Dict[str, Any]]:
         """Return forecast."""
-        forecast = self._filter_forecast(self._forecast)
-        return self._convert_forecast(forecast)
+        with self._timed_conversion("forecast"):
+            forecast = self._filter_forecast(self._forecast)
+            return self._convert_forecast(forecast)
+
+    def forecast_for_units(
+        self: SimpleNWS, units: ForecastUnits
+    ) -> List[Dict[str, Any]]:
+        """Return forecast in units, converted from the fetched forecast.
+
+        Serves US and SI users from one request, see `convert_forecast_period`.
+        """
+        units = ForecastUnits(units)
+        with self._timed_conversion("forecast"):
+            forecast = self._filter_forecast(self._forecast)
+            return self._convert_forecast(
+                [convert_forecast_period(p, units) for p in forecast]
+            )
 
     @property
     def forecast_metadata(self: SimpleNWS) -> Dict[str, str | None]:
@@ -470,8 +936,20 @@ class SimpleNWS(Nws):
     @property
     def forecast_hourly(self: SimpleNWS) -> List[Dict[str, Any]]:
         """Return forecast hourly."""
-        forecast = self._filter_forecast(self._forecast_hourly)
-        return self._convert_forecast(forecast)
+        with self._timed_conversion("forecast_hourly"):
+            forecast = self._filter_forecast(self._forecast_hourly)
+            return self._convert_forecast(forecast)
+
+    def forecast_hourly_for_units(
+        self: SimpleNWS, units: ForecastUnits
+    ) -> List[Dict[str, Any]]:
+        """Return forecast hourly in units, converted from the fetched forecast."""
+        units = ForecastUnits(units)
+        with self._timed_conversion("forecast_hourly"):
+            forecast = self._filter_forecast(self._forecast_hourly)
+            return self._convert_forecast(
+                [convert_forecast_period(p, units) for p in forecast]
+            )
 
     @property
     def forecast_hourly_metadata(self: SimpleNWS) -> Dict[str, str | None]:
@@ -511,7 +989,9 @@ class SimpleNWS(Nws):
     ) -> List[Dict[str, Any]]:
         """Converts forecast to common dict."""
         forecast = []
-        for forecast_entry in input_forecast:
+        for input_entry in input_forecast:
+            # keep the fetched periods unchanged for other views
+            forecast_entry = dict(input_entry)
             if (value := forecast_entry.get("temperature")) is not None:
                 forecast_entry["temperature"] = int(value)
 
@@ -522,9 +1002,9 @@ class SimpleNWS(Nws):
                 if isinstance(extracted, tuple):
                     value, value_unit = extracted
                     if value_unit.endswith("degC") and temp_unit == "F":
-                        value = round(float(value) * 1.8 + 32, 0)
+                        value = round(celsius_to_fahrenheit(float(value)), 0)
                     elif value_unit.endswith("degF") and temp_unit == "C":
-                        value = round((float(value) - 32) / 1.8, 0)
+                        value = round(fahrenheit_to_celsius(float(value)), 0)
                     forecast_entry[key] = int(value)
                 else:
                     forecast_entry[key] = extracted
@@ -575,3 +1055,8 @@ class SimpleNWS(Nws):
     def alerts_all_zones(self: SimpleNWS) -> List[Dict[str, Any]]:
         """Return alerts as a list of dict."""
         return self._alerts_all_zones
+
+    @property
+    def alerts_point(self: SimpleNWS) -> List[Dict[str, Any]]:
+        """Return alerts as a list of dict."""
+        return self._alerts_point
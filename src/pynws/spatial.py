@@ -0,0 +1,174 @@
+"""Spatial index of alert polygons."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+from .const import Final
+
+DEFAULT_CELL_SIZE: Final = 0.5
+
+# GeoJSON positions are (lon, lat)
+_Ring = Sequence[Sequence[float]]
+_Polygon = Sequence[_Ring]
+_BoundingBox = Tuple[float, float, float, float]
+_Cell = Tuple[int, int]
+# box of a polygon, the polygon, and whether it has longitudes beyond +-180
+_Part = Tuple[_BoundingBox, _Polygon, bool]
+
+
+def _polygons(geometry: Dict[str, Any]) -> List[_Polygon]:
+    """Return polygons of a GeoJSON Polygon or MultiPolygon geometry."""
+    if geometry.get("type") == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry.get("type") == "MultiPolygon":
+        return list(geometry["coordinates"])
+    return []
+
+
+def _in_ring(lat: float, lon: float, ring: _Ring) -> bool:
+    """Ray casting test of point in a closed ring."""
+    inside = False
+    x1, y1 = ring[-1][:2]
+    for position in ring:
+        x2, y2 = position[:2]
+        if (y1 > lat) != (y2 > lat) and lon < (x1 - x2) * (lat - y2) / (y1 - y2) + x2:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def point_in_polygon(lat: float, lon: float, polygon: _Polygon) -> bool:
+    """Whether point is inside polygon rings, outside of its holes."""
+    if not polygon or not _in_ring(lat, lon, polygon[0]):
+        return False
+    return not any(_in_ring(lat, lon, hole) for hole in polygon[1:])
+
+
+def point_in_geometry(lat: float, lon: float, geometry: Dict[str, Any]) -> bool:
+    """Whether point is inside a GeoJSON Polygon or MultiPolygon geometry."""
+    return any(point_in_polygon(lat, lon, p) for p in _polygons(geometry))
+
+
+def _shift_ring(ring: _Ring) -> List[List[float]]:
+    return [[p[0] + 360 if p[0] < 0 else p[0], *p[1:]] for p in ring]
+
+
+def _polygon_parts(polygon: _Polygon) -> List[_Part]:
+    """Return boxes of polygon within longitudes -180 to 180.
+
+    A polygon crossing the antimeridian, with longitudes beyond +-180 or
+    jumping from 180 to -180, gets one box on each side.
+    """
+    if not polygon or not polygon[0]:
+        return []
+    lats = [p[1] for p in polygon[0]]
+    lons = [p[0] for p in polygon[0]]
+    min_lat, max_lat = min(lats), max(lats)
+    min_lon, max_lon = min(lons), max(lons)
+    if max_lon - min_lon > 180:
+        # e.g. 179 to -179, continue east of 180 instead
+        polygon = [_shift_ring(ring) for ring in polygon]
+        lons = [p[0] for p in polygon[0]]
+        min_lon, max_lon = min(lons), max(lons)
+    if max_lon > 180:
+        return [
+            ((min_lat, min_lon, max_lat, 180.0), polygon, True),
+            ((min_lat, -180.0, max_lat, max_lon - 360), polygon, True),
+        ]
+    if min_lon < -180:
+        return [
+            ((min_lat, min_lon + 360, max_lat, 180.0), polygon, True),
+            ((min_lat, -180.0, max_lat, max_lon), polygon, True),
+        ]
+    return [((min_lat, min_lon, max_lat, max_lon), polygon, False)]
+
+
+def _in_part(lat: float, lon: float, part: _Part) -> bool:
+    box, polygon, wraps = part
+    if not (box[0] <= lat <= box[2] and box[1] <= lon <= box[3]):
+        return False
+    if not wraps:
+        return point_in_polygon(lat, lon, polygon)
+    return any(point_in_polygon(lat, lon + shift, polygon) for shift in (0, 360, -360))
+
+
+class AlertGridIndex:
+    """Uniform grid index of alert geometries for point lookups.
+
+    Each polygon of a geometry is registered in every `cell_size` degree cell
+    its own bounding box overlaps, with boxes crossing the antimeridian split
+    in two.  A lookup tests only the polygons of one cell, first by bounding
+    box and then exactly.  Geometries are added and removed one by one, so
+    the index follows alerts as they arrive and expire.
+    """
+
+    def __init__(self: AlertGridIndex, cell_size: float = DEFAULT_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        self._cells: Dict[_Cell, Set[str]] = {}
+        self._parts: Dict[str, List[_Part]] = {}
+
+    def __len__(self: AlertGridIndex) -> int:
+        return len(self._parts)
+
+    def __contains__(self: AlertGridIndex, alert_id: str) -> bool:
+        return alert_id in self._parts
+
+    @property
+    def cell_count(self: AlertGridIndex) -> int:
+        """Number of cells holding at least one alert."""
+        return len(self._cells)
+
+    def _cell(self: AlertGridIndex, lat: float, lon: float) -> _Cell:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def _box_cells(self: AlertGridIndex, box: _BoundingBox) -> Iterator[_Cell]:
+        min_row, min_col = self._cell(box[0], box[1])
+        max_row, max_col = self._cell(box[2], box[3])
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                yield row, col
+
+    def _alert_cells(self: AlertGridIndex, alert_id: str) -> Set[_Cell]:
+        return {
+            cell for box, _, _ in self._parts[alert_id] for cell in self._box_cells(box)
+        }
+
+    def add(self: AlertGridIndex, alert_id: str, geometry: Dict[str, Any]) -> bool:
+        """Add or replace geometry of alert.
+
+        Returns:
+            bool: False if geometry has no polygon and was not indexed.
+        """
+        self.remove(alert_id)
+        parts = [part for p in _polygons(geometry) for part in _polygon_parts(p)]
+        if not parts:
+            return False
+        self._parts[alert_id] = parts
+        for cell in self._alert_cells(alert_id):
+            self._cells.setdefault(cell, set()).add(alert_id)
+        return True
+
+    def remove(self: AlertGridIndex, alert_id: str) -> None:
+        """Remove alert if indexed."""
+        if alert_id not in self._parts:
+            return
+        for cell in self._alert_cells(alert_id):
+            ids = self._cells.get(cell)
+            if ids is not None:
+                ids.discard(alert_id)
+                if not ids:
+                    del self._cells[cell]
+        del self._parts[alert_id]
+
+    def query(self: AlertGridIndex, lat: float, lon: float) -> List[str]:
+        """Return ids of alerts whose geometry contains the point."""
+        matches = [
+            alert_id
+            for alert_id in self._cells.get(self._cell(lat, lon), ())
+            if any(_in_part(lat, lon, part) for part in self._parts[alert_id])
+        ]
+        return sorted(matches)
@@ -0,0 +1,151 @@
+"""Station health tracking."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .const import Final
+
+DEFAULT_STATION_MAX_AGE: Final = timedelta(hours=2)
+DEFAULT_MIN_COMPLETENESS: Final = 0.5
+FAILURE_PENALTY: Final = 0.5
+
+
+def observation_completeness(
+    observation: Dict[str, Any], fields: Iterable[str]
+) -> float:
+    """Return fraction of fields that have a value in observation."""
+    fields = list(fields)
+    if not fields:
+        return 1.0
+    present = 0
+    for field in fields:
+        value = observation.get(field)
+        if isinstance(value, dict):
+            value = value.get("value")
+        if value is not None:
+            present += 1
+    return present / len(fields)
+
+
+class StationStatus:
+    """Metadata and health of one observation station."""
+
+    __slots__ = ("completeness", "coordinates", "failures", "identifier", "last_seen")
+
+    def __init__(
+        self: StationStatus,
+        identifier: str,
+        coordinates: Optional[Tuple[float, float]] = None,
+    ):
+        self.identifier = identifier
+        self.coordinates = coordinates
+        self.last_seen: Optional[datetime] = None
+        self.completeness: Optional[float] = None
+        self.failures = 0
+
+    @classmethod
+    def from_feature(cls, feature: Dict[str, Any]) -> StationStatus:
+        """Create from a station GeoJSON feature."""
+        identifier = feature["properties"]["stationIdentifier"]
+        coordinates = None
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Point":
+            lon, lat = geometry["coordinates"][:2]
+            coordinates = (lat, lon)
+        return cls(identifier, coordinates)
+
+    def is_stale(self: StationStatus, now: datetime, max_age: timedelta) -> bool:
+        """Whether the last observation is older than max_age."""
+        return self.last_seen is None or now - self.last_seen > max_age
+
+    def score(
+        self: StationStatus,
+        now: datetime,
+        max_age: timedelta,
+        unknown_score: float = DEFAULT_MIN_COMPLETENESS,
+    ) -> float:
+        """Return health score between 0 and 1.
+
+        Stations never observed get `unknown_score`, stale stations get 0 and
+        fresh stations score by field completeness.  Each consecutive failure
+        halves the score.
+        """
+        if self.completeness is None:
+            score = unknown_score
+        elif self.is_stale(now, max_age):
+            score = 0.0
+        else:
+            score = self.completeness
+        return score * FAILURE_PENALTY**self.failures
+
+
+class StationHealth:
+    """Health of the observation stations for a grid, in NWS distance order."""
+
+    def __init__(
+        self: StationHealth,
+        stations: Iterable[StationStatus],
+        max_age: timedelta = DEFAULT_STATION_MAX_AGE,
+        min_completeness: float = DEFAULT_MIN_COMPLETENESS,
+    ):
+        self.stations: Dict[str, StationStatus] = {s.identifier: s for s in stations}
+        self.max_age = max_age
+        self.min_completeness = min_completeness
+
+    @classmethod
+    def from_features(
+        cls, features: List[Dict[str, Any]], **kwargs: Any
+    ) -> StationHealth:
+        """Create from gridpoint station GeoJSON features."""
+        return cls((StationStatus.from_feature(f) for f in features), **kwargs)
+
+    def _status(self: StationHealth, station: str) -> StationStatus:
+        if station not in self.stations:
+            self.stations[station] = StationStatus(station)
+        return self.stations[station]
+
+    def record_observation(
+        self: StationHealth,
+        station: str,
+        observation: Dict[str, Any],
+        fields: Iterable[str],
+    ) -> None:
+        """Record newest observation received from station."""
+        status = self._status(station)
+        status.failures = 0
+        status.completeness = observation_completeness(observation, fields)
+        timestamp = observation.get("timestamp")
+        status.last_seen = datetime.fromisoformat(timestamp) if timestamp else None
+
+    def record_failure(self: StationHealth, station: str) -> None:
+        """Record failed or empty request for station."""
+        self._status(station).failures += 1
+
+    def is_healthy(
+        self: StationHealth, station: str, now: Optional[datetime] = None
+    ) -> bool:
+        """Whether station is fresh, complete and not failing."""
+        status = self._status(station)
+        if status.completeness is None:
+            return status.failures == 0
+        now = now or datetime.now(timezone.utc)
+        return (
+            status.failures == 0
+            and not status.is_stale(now, self.max_age)
+            and status.completeness >= self.min_completeness
+        )
+
+    def ranked(self: StationHealth, now: Optional[datetime] = None) -> List[str]:
+        """Return stations ordered by score, ties broken by distance order."""
+        now = now or datetime.now(timezone.utc)
+        scored = [
+            (-status.score(now, self.max_age, self.min_completeness), rank, station)
+            for rank, (station, status) in enumerate(self.stations.items())
+        ]
+        return [station for _, _, station in sorted(scored)]
+
+    def best(self: StationHealth, now: Optional[datetime] = None) -> str:
+        """Return the best scoring station."""
+        return self.ranked(now)[0]
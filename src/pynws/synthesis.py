@@ -0,0 +1,299 @@
+"""Hourly and daily forecast periods derived from a detailed forecast."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone, tzinfo
+from statistics import mean
+from typing import Any, Dict, List, Optional, Sequence
+
+from .const import WIND_DIRECTIONS, Detail, Final, ForecastUnits
+from .forecast import ONE_HOUR, DetailedForecast, DetailValue
+from .units import KM_PER_MILE, SI, celsius_to_fahrenheit, unit_converter
+
+DEFAULT_SYNTHESIZED_HOURS: Final = 156
+DEFAULT_SYNTHESIZED_DAYS: Final = 7
+DAYTIME_START_HOUR: Final = 6
+DAYTIME_END_HOUR: Final = 18
+
+_TEMPERATURE_DETAILS: Final = (
+    Detail.TEMPERATURE,
+    Detail.DEWPOINT,
+    Detail.MAX_TEMPERATURE,
+    Detail.MIN_TEMPERATURE,
+)
+
+_HOURLY_DETAILS: Final = (
+    Detail.TEMPERATURE,
+    Detail.DEWPOINT,
+    Detail.RELATIVE_HUMIDITY,
+    Detail.WIND_SPEED,
+    Detail.WIND_DIRECTION,
+    Detail.PROBABILITY_OF_PRECIPITATION,
+    Detail.SKY_COVER,
+    Detail.WEATHER,
+    Detail.MAX_TEMPERATURE,
+    Detail.MIN_TEMPERATURE,
+)
+
+# upper bound of sky cover percent for each description
+_SKY_COVER: Final = (
+    (5, "Sunny", "Clear"),
+    (25, "Mostly Sunny", "Mostly Clear"),
+    (50, "Partly Sunny", "Partly Cloudy"),
+    (87, "Mostly Cloudy", "Mostly Cloudy"),
+    (100, "Cloudy", "Cloudy"),
+)
+
+
+def _hourly_values(
+    detailed: DetailedForecast, detail: Detail, start_time: datetime, hours: int
+) -> List[DetailValue]:
+    """Return value of detail for each hour, walking its time values once."""
+    time_values = detailed.details.get(detail, [])
+    values: List[DetailValue] = []
+    idx = 0
+    when = start_time
+    for _ in range(hours):
+        while idx < len(time_values) and time_values[idx][1] <= when:
+            idx += 1
+        if idx < len(time_values) and time_values[idx][0] <= when:
+            values.append(time_values[idx][2])
+        else:
+            values.append(None)
+        when += ONE_HOUR
+    return values
+
+
+def _si_values(
+    detailed: DetailedForecast, start_time: datetime, hours: int
+) -> Dict[Detail, List[DetailValue]]:
+    """Return hourly values of details in SI units, whatever the forecast units."""
+    values = {
+        d: _hourly_values(detailed, d, start_time, hours) for d in _HOURLY_DETAILS
+    }
+    system = detailed.unit_system
+    if system == SI:
+        return values
+    converter = unit_converter(SI)
+    units = dict.fromkeys(_TEMPERATURE_DETAILS, system.temperature)
+    units[Detail.WIND_SPEED] = system.speed
+    for detail, unit in units.items():
+        convert = converter.converter(unit)
+        values[detail] = [
+            convert(v) if isinstance(v, (int, float)) else v for v in values[detail]
+        ]
+    return values
+
+
+def _is_daytime(when: datetime, tz: tzinfo) -> bool:
+    return DAYTIME_START_HOUR <= when.astimezone(tz).hour < DAYTIME_END_HOUR
+
+
+def _wind_direction(degrees: Optional[float]) -> Optional[str]:
+    if degrees is None:
+        return None
+    return WIND_DIRECTIONS[round(degrees / 22.5) % 16]
+
+
+def _temperature(celsius: float, units: ForecastUnits) -> int:
+    if units == ForecastUnits.US:
+        return round(celsius_to_fahrenheit(celsius))
+    return round(celsius)
+
+
+def _wind_speed(speeds: Sequence[float], units: ForecastUnits) -> str:
+    """Format wind speeds given in km/h like NWS periods in units, e.g.
+    '5 to 10 mph' for US and '8 to 16 km/h' for SI.
+    """
+    if units == ForecastUnits.US:
+        speeds = [s / KM_PER_MILE for s in speeds]
+        unit = "mph"
+    else:
+        unit = "km/h"
+    low, high = round(min(speeds)), round(max(speeds))
+    if low == high:
+        return f"{high} {unit}"
+    return f"{low} to {high} {unit}"
+
+
+def _short_forecast(
+    weather: DetailValue, sky_cover: Optional[float], is_daytime: bool
+) -> str:
+    """Describe the first weather condition, or the sky cover if there is none."""
+    for condition in weather if isinstance(weather, list) else []:
+        if condition.get("weather"):
+            words = [condition.get("coverage"), condition["weather"]]
+            return " ".join(w.replace("_", " ").title() for w in words if w)
+    if sky_cover is None:
+        return ""
+    for upper, day, night in _SKY_COVER:
+        if sky_cover <= upper:
+            return day if is_daytime else night
+    return "Cloudy"
+
+
+def _quantity(unit: str, value: Optional[float]) -> Dict[str, Any]:
+    return {
+        "unitCode": f"wmoUnit:{unit}",
+        "value": round(value) if value is not None else None,
+    }
+
+
+def _period(
+    number: int,
+    name: str,
+    start_time: datetime,
+    end_time: datetime,
+    is_daytime: bool,
+    hours: Dict[Detail, List[Any]],
+    temperature: float,
+    units: ForecastUnits,
+) -> Dict[str, Any]:
+    """Return period in the shape of NWS forecast periods from hourly values."""
+    dewpoints = [v for v in hours[Detail.DEWPOINT] if v is not None]
+    humidities = [v for v in hours[Detail.RELATIVE_HUMIDITY] if v is not None]
+    pops = [v for v in hours[Detail.PROBABILITY_OF_PRECIPITATION] if v is not None]
+    speeds = [v for v in hours[Detail.WIND_SPEED] if v is not None]
+    directions = [
+        _wind_direction(v) for v in hours[Detail.WIND_DIRECTION] if v is not None
+    ]
+    sky_covers = [v for v in hours[Detail.SKY_COVER] if v is not None]
+    # weather of the wettest hour
+    weather = hours[Detail.WEATHER][0]
+    if pops:
+        wettest = max(
+            range(len(hours[Detail.WEATHER])),
+            key=lambda i: hours[Detail.PROBABILITY_OF_PRECIPITATION][i] or 0,
+        )
+        weather = hours[Detail.WEATHER][wettest]
+    return {
+        "number": number,
+        "name": name,
+        "startTime": start_time.isoformat(),
+        "endTime": end_time.isoformat(),
+        "isDaytime": is_daytime,
+        "temperature": _temperature(temperature, units),
+        "temperatureUnit": "F" if units == ForecastUnits.US else "C",
+        "temperatureTrend": None,
+        "probabilityOfPrecipitation": _quantity("percent", max(pops) if pops else None),
+        "dewpoint": _quantity("degC", mean(dewpoints) if dewpoints else None),
+        "relativeHumidity": _quantity(
+            "percent", mean(humidities) if humidities else None
+        ),
+        "windSpeed": _wind_speed(speeds, units) if speeds else None,
+        "windDirection": (
+            Counter(directions).most_common(1)[0][0] if directions else None
+        ),
+        "icon": None,
+        "shortForecast": _short_forecast(
+            weather, mean(sky_covers) if sky_covers else None, is_daytime
+        ),
+        "detailedForecast": "",
+    }
+
+
+def synthesize_hourly(
+    detailed: DetailedForecast,
+    start_time: datetime,
+    hours: int = DEFAULT_SYNTHESIZED_HOURS,
+    units: ForecastUnits = ForecastUnits.US,
+    tz: tzinfo = timezone.utc,
+) -> List[Dict[str, Any]]:
+    """Return hourly periods like `/forecast/hourly` from a detailed forecast.
+
+    Periods start at the hour of `start_time` and end at the first hour
+    without a temperature.  Times are in `tz`, which also decides
+    `isDaytime`.  The periods have no icon.
+    """
+    start_time = start_time.astimezone(timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    values = _si_values(detailed, start_time, hours)
+    periods: List[Dict[str, Any]] = []
+    for i in range(hours):
+        temperature = values[Detail.TEMPERATURE][i]
+        if not isinstance(temperature, (int, float)):
+            break
+        when = start_time + i * ONE_HOUR
+        is_daytime = _is_daytime(when, tz)
+        periods.append(
+            _period(
+                i + 1,
+                "",
+                when.astimezone(tz),
+                (when + ONE_HOUR).astimezone(tz),
+                is_daytime,
+                {d: v[i : i + 1] for d, v in values.items()},
+                temperature,
+                units,
+            )
+        )
+    return periods
+
+
+def synthesize_daily(
+    detailed: DetailedForecast,
+    start_time: datetime,
+    days: int = DEFAULT_SYNTHESIZED_DAYS,
+    units: ForecastUnits = ForecastUnits.US,
+    tz: tzinfo = timezone.utc,
+) -> List[Dict[str, Any]]:
+    """Return approximate day and night periods like `/forecast`.
+
+    Days run from 6:00 to 18:00 and nights from 18:00 to 6:00 in `tz`, the
+    first period starts at the hour of `start_time`.  Temperatures are the
+    maximum temperature by day and the minimum by night, other values are
+    aggregated over the hours of the period.  Unlike NWS periods, names are
+    only the weekday, e.g. "Monday" and "Monday Night", and there is no icon
+    or detailed forecast text.
+    """
+    start_time = start_time.astimezone(timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    hours = days * 24
+    values = _si_values(detailed, start_time, hours)
+
+    periods: List[Dict[str, Any]] = []
+    first = 0
+    while first < hours:
+        begin = start_time + first * ONE_HOUR
+        is_daytime = _is_daytime(begin, tz)
+        local = begin.astimezone(tz)
+        boundary = DAYTIME_END_HOUR if is_daytime else DAYTIME_START_HOUR
+        end_local = local.replace(hour=boundary, minute=0)
+        if end_local <= local:
+            end_local += timedelta(days=1)
+        # hours between UTC times, correct over DST changes
+        length = end_local.astimezone(timezone.utc) - begin
+        count = min(hours - first, max(1, round(length / ONE_HOUR)))
+        period_values = {d: v[first : first + count] for d, v in values.items()}
+        first += count
+
+        extreme = Detail.MAX_TEMPERATURE if is_daytime else Detail.MIN_TEMPERATURE
+        temperatures: List[float] = [
+            v for v in period_values[extreme] if isinstance(v, (int, float))
+        ] or [
+            v for v in period_values[Detail.TEMPERATURE] if isinstance(v, (int, float))
+        ]
+        if not temperatures:
+            break
+        temperature = max(temperatures) if is_daytime else min(temperatures)
+        # nights are named after the day they begin
+        day = local
+        if not is_daytime and local.hour < DAYTIME_START_HOUR:
+            day -= timedelta(days=1)
+        name = day.strftime("%A") if is_daytime else f"{day.strftime('%A')} Night"
+        periods.append(
+            _period(
+                len(periods) + 1,
+                name,
+                local,
+                (begin + count * ONE_HOUR).astimezone(tz),
+                is_daytime,
+                period_values,
+                temperature,
+                units,
+            )
+        )
+    return periods
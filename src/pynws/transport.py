@@ -0,0 +1,253 @@
+"""Record and replay of NWS responses."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import urlencode
+
+from aiohttp import ClientResponse, ClientResponseError, ClientSession, RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .const import Final
+from .instrumentation import RequestRecorder
+from .nws import NwsError
+from .raw_data import RedirectCache, fetch_json
+
+if sys.version_info >= (3, 11):
+    from enum import StrEnum
+else:
+    from .backports.enum import StrEnum
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION: Final = 1
+
+
+class NwsCassetteMissError(NwsError):
+    """Request is not recorded in the cassette."""
+
+
+class CassetteMode(StrEnum):
+    """How a `CassetteTransport` uses the network and the cassette."""
+
+    RECORD = "record"
+    REPLAY = "replay"
+    FALLBACK = "fallback"
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Return cassette key of a request."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class Cassette:
+    """Responses recorded to a gzipped JSON file, the last one per request.
+
+    Each response keeps status, headers, elapsed seconds and JSON body.  The
+    file is read on creation if it exists and written by `save`.
+    """
+
+    def __init__(self: Cassette, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if self.path.exists():
+            self.load()
+
+    def __len__(self: Cassette) -> int:
+        return len(self.responses)
+
+    def __contains__(self: Cassette, key: str) -> bool:
+        return key in self.responses
+
+    def load(self: Cassette) -> None:
+        """Read responses from file."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}")
+        self.responses = data["responses"]
+        self.dirty = False
+
+    def save(self: Cassette) -> None:
+        """Write responses to file, replacing it atomically."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        data = {"version": CASSETTE_VERSION, "responses": self.responses}
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def record(
+        self: Cassette,
+        key: str,
+        status: int,
+        headers: Dict[str, str],
+        elapsed: float,
+        body: Optional[Dict[str, Any]],
+    ) -> None:
+        """Record response to request key."""
+        self.responses[key] = {
+            "status": status,
+            "headers": headers,
+            "elapsed": round(elapsed, 4),
+            "body": body,
+        }
+        self.dirty = True
+
+    def get(self: Cassette, key: str) -> Optional[Dict[str, Any]]:
+        """Return recorded response to request key."""
+        return self.responses.get(key)
+
+
+class CassetteTransport:
+    """Transport serving requests from the network and a cassette.
+
+    RECORD: make requests and record responses.
+    REPLAY: serve recorded responses only, never using the network.
+    FALLBACK: record like RECORD, and serve the recorded response when the
+    request fails to connect, times out, or the server answers 5xx or 429.
+    Error responses do not replace a recorded successful response.
+
+    If `realtime`, replayed responses take their recorded time.  Recorded
+    responses are not saved until `cassette.save()` is called.
+    """
+
+    def __init__(
+        self: CassetteTransport,
+        cassette: Cassette,
+        mode: CassetteMode = CassetteMode.REPLAY,
+        *,
+        realtime: bool = False,
+    ):
+        self.cassette = cassette
+        self.mode = CassetteMode(mode)
+        self.realtime = realtime
+
+    @property
+    def replays(self: CassetteTransport) -> bool:
+        """Whether responses are served from the cassette only."""
+        return self.mode == CassetteMode.REPLAY
+
+    async def get(
+        self: CassetteTransport,
+        websession: ClientSession,
+        url: str,
+        header: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        recorder: Optional[RequestRecorder] = None,
+        redirects: Optional[RedirectCache] = None,
+    ) -> Dict[str, Any]:
+        """Get JSON dict response.
+
+        Recorded requests are measured by `recorder` and follow `redirects`
+        like requests made without a transport.
+        """
+        key = request_key(url, params)
+        if self.mode == CassetteMode.REPLAY:
+            return await self._replay(key, url, header, self.realtime, recorder)
+        return await self._record(
+            key, websession, url, header, params, recorder, redirects
+        )
+
+    def has_fallback(
+        self: CassetteTransport, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Whether a failed request can be served from the cassette."""
+        return self.mode == CassetteMode.FALLBACK and self._recorded_ok(
+            request_key(url, params)
+        )
+
+    def _recorded_ok(self: CassetteTransport, key: str) -> bool:
+        response = self.cassette.get(key)
+        return response is not None and response["status"] < 400
+
+    async def fallback(
+        self: CassetteTransport,
+        url: str,
+        header: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Serve recorded response to a failed request."""
+        _LOGGER.debug("Request for %s failed, replaying recorded response", url)
+        return await self._replay(request_key(url, params), url, header, False)
+
+    async def _record(
+        self: CassetteTransport,
+        key: str,
+        websession: ClientSession,
+        url: str,
+        header: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        recorder: Optional[RequestRecorder],
+        redirects: Optional[RedirectCache],
+    ) -> Dict[str, Any]:
+        body, _ = await fetch_json(
+            websession,
+            url,
+            header,
+            params,
+            recorder,
+            redirects,
+            self._recording(key, time.monotonic()),
+        )
+        # keep the recorded response unchanged by callers
+        return copy.deepcopy(body)
+
+    def _recording(
+        self: CassetteTransport, key: str, start: float
+    ) -> Callable[[ClientResponse, Optional[Dict[str, Any]]], None]:
+        def _record_response(
+            res: ClientResponse, body: Optional[Dict[str, Any]]
+        ) -> None:
+            # keep the last good response to fall back on
+            if not (
+                self.mode == CassetteMode.FALLBACK
+                and not res.ok
+                and self._recorded_ok(key)
+            ):
+                self.cassette.record(
+                    key, res.status, dict(res.headers), time.monotonic() - start, body
+                )
+
+        return _record_response
+
+    async def _replay(
+        self: CassetteTransport,
+        key: str,
+        url: str,
+        header: Dict[str, str],
+        realtime: bool,
+        recorder: Optional[RequestRecorder] = None,
+    ) -> Dict[str, Any]:
+        response = self.cassette.get(key)
+        if response is None:
+            raise NwsCassetteMissError(f"No recorded response for {key}")
+        if realtime:
+            await asyncio.sleep(response["elapsed"])
+        if recorder is not None:
+            recorder.status = response["status"]
+            headers = CIMultiDict(response["headers"])
+            recorder.request_id = headers.get("X-Request-ID")
+            recorder.correlation_id = headers.get("X-Correlation-ID")
+        if response["status"] >= 400:
+            raise ClientResponseError(
+                RequestInfo(URL(url), "GET", CIMultiDictProxy(CIMultiDict(header))),
+                (),
+                status=response["status"],
+                headers=CIMultiDictProxy(CIMultiDict(response["headers"])),
+            )
+        # callers may modify the response
+        return copy.deepcopy(response["body"])
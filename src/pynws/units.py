@@ -1,30 +1,237 @@
 """Unit conversion"""
 
-from typing import Callable
-
-UNIT_CONVERSION = {
-    "degC": lambda x: x,
-    "degF": lambda x: (x - 32.0) / 1.8,  # convert to celsius
-    "km_h-1": lambda x: x,
-    "m_s-1": lambda x: x * 3.6,  # convert to km/h
-    "m": lambda x: x,
-    "mm": lambda x: x,
-    "Pa": lambda x: x,
-    "percent": lambda x: x,
-    "degree_(angle)": lambda x: x,
-    "s": lambda x: x,
+from __future__ import annotations
+
+from functools import lru_cache
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .const import Final, ForecastUnits
+
+KM_PER_MILE: Final = 1.609344
+
+TEMPERATURE_UNITS: Final = {ForecastUnits.US: "F", ForecastUnits.SI: "C"}
+WIND_SPEED_UNITS: Final = {ForecastUnits.US: "mph", ForecastUnits.SI: "km/h"}
+
+_NUMBER: Final = re.compile(r"\d+(?:\.\d+)?")
+
+# unit code -> (quantity, scale, offset) with value * scale + offset in the
+# base unit of the quantity
+_UNITS: Final[Dict[str, Tuple[str, float, float]]] = {
+    "degC": ("temperature", 1.0, 0.0),
+    "degF": ("temperature", 5 / 9, -160 / 9),
+    "K": ("temperature", 1.0, -273.15),
+    "km_h-1": ("speed", 1.0, 0.0),
+    "m_s-1": ("speed", 3.6, 0.0),
+    "mi_h-1": ("speed", KM_PER_MILE, 0.0),
+    "kt": ("speed", 1.852, 0.0),
+    "m": ("length", 1.0, 0.0),
+    "km": ("length", 1000.0, 0.0),
+    "ft": ("length", 0.3048, 0.0),
+    "mi": ("length", KM_PER_MILE * 1000, 0.0),
+    "mm": ("precipitation", 1.0, 0.0),
+    "cm": ("precipitation", 10.0, 0.0),
+    "in": ("precipitation", 25.4, 0.0),
+    "Pa": ("pressure", 1.0, 0.0),
+    "hPa": ("pressure", 100.0, 0.0),
+    "inHg": ("pressure", 3386.389, 0.0),
+    "percent": ("percent", 1.0, 0.0),
+    "degree_(angle)": ("angle", 1.0, 0.0),
+    "s": ("time", 1.0, 0.0),
 }
 
+_Array = TypeVar("_Array")
+
+
+class UnitSystem(NamedTuple):
+    """Unit code to convert each quantity to.
+
+    Quantities not listed, such as percent, are not converted.  Create custom
+    systems like `SI._replace(speed="m_s-1")`.
+    """
+
+    temperature: str = "degC"
+    speed: str = "km_h-1"
+    length: str = "m"
+    precipitation: str = "mm"
+    pressure: str = "Pa"
+
+
+# the units of NWS "si" forecasts, used by pynws by default
+SI: Final = UnitSystem()
+US: Final = UnitSystem(
+    temperature="degF",
+    speed="mi_h-1",
+    length="ft",
+    precipitation="in",
+    pressure="inHg",
+)
+
+
+class UnitConverter:
+    """Convert values with unit codes to the units of a `UnitSystem`.
+
+    Each unit code is compiled once to a linear conversion, so converting a
+    value is one multiply-add.  `convert_many` converts a whole list and
+    `convert_array` a numpy array in one call.
+    """
+
+    def __init__(self: UnitConverter, system: UnitSystem = SI):
+        for quantity, unit in system._asdict().items():
+            if _UNITS.get(unit, ("",))[0] != quantity:
+                raise ValueError(f"{unit!r} is not a unit of {quantity}")
+        self.system = system
+        self._compiled: Dict[str, Tuple[float, float, str]] = {}
+
+    def _compile(self: UnitConverter, unit_code: str) -> Tuple[float, float, str]:
+        compiled = self._compiled.get(unit_code)
+        if compiled is not None:
+            return compiled
+        unit = unit_code.split(":")[-1]
+        if unit not in _UNITS:
+            raise ValueError(f"unit code: '{unit_code}' not recognized.")
+        quantity, scale, offset = _UNITS[unit]
+        target = getattr(self.system, quantity, unit)
+        _, target_scale, target_offset = _UNITS[target]
+        compiled = (
+            scale / target_scale,
+            (offset - target_offset) / target_scale,
+            target,
+        )
+        self._compiled[unit_code] = compiled
+        return compiled
+
+    def target_unit(self: UnitConverter, unit_code: str) -> str:
+        """Return unit code that values with unit code are converted to."""
+        return self._compile(unit_code)[2]
+
+    def converter(self: UnitConverter, unit_code: str) -> Callable[[float], float]:
+        """Return function converting a value with unit code."""
+        scale, offset, _ = self._compile(unit_code)
+        return lambda value: value * scale + offset
+
+    def convert(
+        self: UnitConverter, unit_code: str, value: Optional[float]
+    ) -> Optional[float]:
+        """Convert value with unit code, keeping None."""
+        if value is None:
+            return None
+        scale, offset, _ = self._compile(unit_code)
+        return value * scale + offset
+
+    def convert_many(
+        self: UnitConverter, unit_code: str, values: Iterable[Optional[float]]
+    ) -> List[Optional[float]]:
+        """Convert values with one unit code, keeping None."""
+        scale, offset, _ = self._compile(unit_code)
+        if scale == 1.0 and offset == 0.0:
+            return list(values)
+        return [None if v is None else v * scale + offset for v in values]
+
+    def convert_array(self: UnitConverter, unit_code: str, values: _Array) -> _Array:
+        """Convert an array supporting arithmetic, such as a numpy array, at once."""
+        scale, offset, _ = self._compile(unit_code)
+        return cast(_Array, cast(Any, values) * scale + offset)
+
+    def convert_quantities(
+        self: UnitConverter, quantities: Iterable[Optional[Dict[str, Any]]]
+    ) -> List[Optional[float]]:
+        """Convert NWS quantities like {"unitCode": ..., "value": ...}.
+
+        Missing quantities and values are returned as None.
+        """
+        converted: List[Optional[float]] = []
+        for quantity in quantities:
+            if not quantity or quantity.get("value") is None:
+                converted.append(None)
+                continue
+            scale, offset, _ = self._compile(quantity["unitCode"])
+            converted.append(float(quantity["value"]) * scale + offset)
+        return converted
+
+
+@lru_cache(maxsize=None)
+def _shared_converter(system: UnitSystem) -> UnitConverter:
+    return UnitConverter(system)
+
+
+def unit_converter(system: UnitSystem = SI) -> UnitConverter:
+    """Return shared converter to system."""
+    return _shared_converter(system)
+
 
 def get_converter(unit_code: str) -> Callable[[float], float]:
     """Get method to convert value with unit code to preferred unit."""
-    converter = UNIT_CONVERSION.get(unit_code.split(":")[-1])
-    if not converter:
-        raise ValueError(f"unit code: '{unit_code}' not recognized.")
-    return converter
+    return unit_converter(SI).converter(unit_code)
 
 
 def convert_unit(unit_code: str, value: float) -> float:
     """Convert value with unit code to preferred unit."""
     converter = get_converter(unit_code)
     return converter(value)
+
+
+def celsius_to_fahrenheit(celsius: float) -> float:
+    """Convert degrees Celsius to Fahrenheit."""
+    return celsius * 1.8 + 32
+
+
+def fahrenheit_to_celsius(fahrenheit: float) -> float:
+    """Convert degrees Fahrenheit to Celsius."""
+    return (fahrenheit - 32) / 1.8
+
+
+def _convert_wind_speed(speed: Optional[str], units: ForecastUnits) -> Optional[str]:
+    """Convert wind speed like '5 to 10 mph' to the wind speed unit of units."""
+    if not speed:
+        return speed
+    unit = WIND_SPEED_UNITS[units]
+    if speed.endswith(f" {unit}"):
+        return speed
+    if speed.endswith(" mph"):
+        factor = KM_PER_MILE
+    elif speed.endswith(" km/h"):
+        factor = 1 / KM_PER_MILE
+    else:
+        return speed
+    value = _NUMBER.sub(lambda m: str(round(float(m[0]) * factor)), speed)
+    return value.rsplit(" ", 1)[0] + f" {unit}"
+
+
+def convert_forecast_period(
+    period: Dict[str, Any], units: ForecastUnits
+) -> Dict[str, Any]:
+    """Return copy of an NWS forecast period with temperature and wind in units.
+
+    Quantities with a unit code, such as dewpoint, are kept as they are.  The
+    text of `detailedForecast` is not converted.
+    """
+    period = dict(period)
+    unit = TEMPERATURE_UNITS[units]
+    current = period.get("temperatureUnit")
+    temperature = period.get("temperature")
+    if (
+        current in TEMPERATURE_UNITS.values()
+        and current != unit
+        and isinstance(temperature, (int, float))
+    ):
+        if unit == "C":
+            period["temperature"] = round(fahrenheit_to_celsius(temperature))
+        else:
+            period["temperature"] = round(celsius_to_fahrenheit(temperature))
+        period["temperatureUnit"] = unit
+    for key in ("windSpeed", "windGust"):
+        if key in period:
+            period[key] = _convert_wind_speed(period[key], units)
+    return period
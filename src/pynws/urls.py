@@ -1,6 +1,8 @@
 """url formatter."""
 
 from .const import (
+    API_ALERTS_ACTIVE,
+    API_ALERTS_ACTIVE_POINT,
     API_ALERTS_ACTIVE_ZONE,
     API_DETAILED_FORECAST,
     API_GRIDPOINTS_FORECAST,
@@ -10,9 +12,21 @@ from .const import (
     API_STATIONS_OBSERVATIONS,
     API_STATIONS_OBSERVATIONS_LATEST,
     API_URL,
+    COORDINATE_PRECISION,
 )
 
 
+def canonical_coordinate(value: float) -> str:
+    """Formats lat or lon like the API, e.g. 39.745612 as '39.7456'.
+
+    Equal coordinates give equal urls, which the API serves without a
+    redirect.
+    """
+    # adding 0.0 turns -0.0 into 0.0
+    text = f"{round(value, COORDINATE_PRECISION) + 0.0:.{COORDINATE_PRECISION}f}"
+    return text.rstrip("0").rstrip(".")
+
+
 def stations_observations_url(station: str) -> str:
     """Formats observation url."""
     return API_URL + API_STATIONS_OBSERVATIONS.format(station)
@@ -45,9 +59,23 @@ def gridpoints_forecast_hourly_url(wfo: str, x: int, y: int) -> str:
 
 def points_url(lat: float, lon: float) -> str:
     """Formats point metadata url."""
-    return API_URL + API_POINTS.format(lat, lon)
+    return API_URL + API_POINTS.format(
+        canonical_coordinate(lat), canonical_coordinate(lon)
+    )
 
 
 def alerts_active_zone_url(zone: str) -> str:
     """Formats alerts url with zone."""
     return API_URL + API_ALERTS_ACTIVE_ZONE.format(zone)
+
+
+def alerts_active_url() -> str:
+    """Formats url of all active alerts."""
+    return API_URL + API_ALERTS_ACTIVE
+
+
+def alerts_active_point_url(lat: float, lon: float) -> str:
+    """Formats url of active alerts at a point."""
+    return API_URL + API_ALERTS_ACTIVE_POINT.format(
+        canonical_coordinate(lat), canonical_coordinate(lon)
+    )
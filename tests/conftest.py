@@ -21,7 +21,11 @@ def mock_urls():
         "pynws.urls.gridpoints_stations_url"
     ) as mock_gridpoints_stations_url, patch(
         "pynws.urls.alerts_active_zone_url"
-    ) as mock_alerts_active_zone_url:
+    ) as mock_alerts_active_zone_url, patch(
+        "pynws.urls.alerts_active_url"
+    ) as mock_alerts_active_url, patch(
+        "pynws.urls.alerts_active_point_url"
+    ) as mock_alerts_active_point_url:
         mock_stations_observations_url.return_value = "/stations_observations"
         mock_stations_observations_latest_url.return_value = (
             "/stations_observations_latest"
@@ -32,6 +36,8 @@ def mock_urls():
         mock_gridpoints_forecast_hourly_url.return_value = "/gridpoints_forecast_hourly"
         mock_gridpoints_stations_url.return_value = "/gridpoints_stations"
         mock_alerts_active_zone_url.return_value = "/alerts_active_zone"
+        mock_alerts_active_url.return_value = "/alerts_active"
+        mock_alerts_active_point_url.return_value = "/alerts_active_point"
 
         yield (
             mock_stations_observations_url,
@@ -42,4 +48,6 @@ def mock_urls():
             mock_gridpoints_forecast_hourly_url,
             mock_gridpoints_stations_url,
             mock_alerts_active_zone_url,
+            mock_alerts_active_url,
+            mock_alerts_active_point_url,
         )
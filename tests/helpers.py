@@ -40,6 +40,8 @@ def setup_app(
     gridpoints_forecast="gridpoints_forecast",
     gridpoints_forecast_hourly="gridpoints_forecast_hourly",
     alerts_active_zone="alerts_active_zone",
+    alerts_active="alerts_active",
+    alerts_active_point="alerts_active_zone",
 ):
     app = aiohttp.web.Application()
     app.router.add_get(
@@ -61,4 +63,8 @@ def setup_app(
         "/gridpoints_forecast_hourly", data_return_function(gridpoints_forecast_hourly)
     )
     app.router.add_get("/alerts_active_zone", data_return_function(alerts_active_zone))
+    app.router.add_get("/alerts_active", data_return_function(alerts_active))
+    app.router.add_get(
+        "/alerts_active_point", data_return_function(alerts_active_point)
+    )
     return app
@@ -0,0 +1,302 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from freezegun import freeze_time
+
+from pynws import Alert, AlertFeed, AlertStore, Nws, SimpleNWS
+from pynws.alerts import _references, zone_id
+from pynws.spatial import AlertGridIndex
+from tests.helpers import setup_app
+
+LATLON = (0, 0)
+USERID = "test_user"
+
+
+def test_zone_id():
+    assert zone_id("FLZ015") == "FLZ015"
+    assert zone_id("https://api.weather.gov/zones/forecast/FLZ015") == "FLZ015"
+
+
+async def test_alert_feed_index(aiohttp_client, mock_urls):
+    client = await aiohttp_client(setup_app())
+    feed = AlertFeed(client, USERID)
+    assert feed.updated is None
+    await feed.update()
+    assert feed.updated is not None
+    assert len(feed.alerts) == 3
+    assert set(feed.zones) == {"FLZ015", "FLC037", "ORZ001", "ORZ006"}
+    # forecast and fire weather zones share the id
+    events = [a["event"] for a in feed.alerts_zone("FLZ015")]
+    assert events == ["Wind Advisory", "Red Flag Warning"]
+    url = "https://api.weather.gov/zones/county/FLC037"
+    assert [a["event"] for a in feed.alerts_zone(url)] == ["Wind Advisory"]
+    assert feed.alerts_zone("ABC123") == []
+
+
+async def test_alert_feed_shared(aiohttp_client, mock_urls):
+    client = await aiohttp_client(setup_app())
+    feed = AlertFeed(client, USERID)
+    fleet = [SimpleNWS(*LATLON, USERID, client, alert_feed=feed) for _ in range(5)]
+    await asyncio.gather(*(nws.update_alerts_forecast_zone() for nws in fleet))
+    await asyncio.gather(*(nws.update_alerts_county_zone() for nws in fleet))
+    for nws in fleet:
+        assert len(nws.alerts_forecast_zone) == 2
+        assert len(nws.alerts_county_zone) == 1
+
+    mock_alerts_active_zone_url, mock_alerts_active_url = mock_urls[7:9]
+    assert mock_alerts_active_url.call_count == 1
+    assert mock_alerts_active_zone_url.call_count == 0
+
+
+async def test_alert_feed_max_age(aiohttp_client, mock_urls):
+    client = await aiohttp_client(setup_app())
+    mock_alerts_active_url = mock_urls[8]
+
+    feed = AlertFeed(client, USERID, max_age=None)
+    nws = Nws(client, USERID, alert_feed=feed)
+    await nws.get_alerts_active_zone("FLZ015")
+    await nws.get_alerts_active_zone("FLZ015")
+    assert mock_alerts_active_url.call_count == 1
+    await feed.update()
+    assert mock_alerts_active_url.call_count == 2
+
+    feed.max_age = timedelta(0)
+    await nws.get_alerts_active_zone("FLZ015")
+    assert mock_alerts_active_url.call_count == 3
+
+
+async def test_alert_feed_point(aiohttp_client, mock_urls):
+    client = await aiohttp_client(setup_app())
+    feed = AlertFeed(client, USERID)
+    # inside the polygon of the Oregon alert
+    alerts = await feed.get_alerts_point(45.5, -123.0)
+    assert [a["event"] for a in alerts] == ["Flood Watch"]
+    assert alerts[0]["id"] == "NWS-IDP-PROD-3965873-3369046.2"
+    assert feed.alerts_point(46.4, -124.1) == []
+    # alerts without a polygon match by zone, alerts with one do not
+    alerts = feed.alerts_point(30.0, -87.0, ["FLZ015", "ORZ001"])
+    assert [a["event"] for a in alerts] == ["Wind Advisory", "Red Flag Warning"]
+    assert alerts[0]["id"] == "NWS-IDP-PROD-3965873-3369046.1"
+
+
+async def test_alert_feed_index_incremental(aiohttp_client, mock_urls):
+    app = setup_app(
+        alerts_active=["alerts_active", "alerts_active", "alerts_active_zone"]
+    )
+    client = await aiohttp_client(app)
+    feed = AlertFeed(client, USERID)
+    alert_id = "NWS-IDP-PROD-3965873-3369046.2"
+    add = AlertGridIndex.add
+    with patch.object(AlertGridIndex, "add", autospec=True, side_effect=add) as mock:
+        await feed.update()
+        assert mock.call_count == 1
+        assert ids(feed.alerts_point(45.5, -123.0)) == [alert_id]
+
+        # unchanged polygons are not indexed again
+        await feed.update()
+        assert mock.call_count == 1
+
+    # polygons of alerts no longer active are removed
+    await feed.update()
+    assert feed.alerts_point(45.5, -123.0) == []
+
+
+async def test_alert_feed_nws_point(aiohttp_client, mock_urls):
+    client = await aiohttp_client(setup_app())
+    feed = AlertFeed(client, USERID)
+    # points fixture is in zones FLZ015, FLC037 and fire zone FLZ015
+    nws = Nws(client, USERID, (45.5, -123.0), alert_feed=feed)
+    alerts = await nws.get_alerts_point()
+    assert [a["event"] for a in alerts] == [
+        "Wind Advisory",
+        "Flood Watch",
+        "Red Flag Warning",
+    ]
+    assert mock_urls[9].call_count == 0
+
+
+NOW = datetime(2019, 12, 20, 22, 0, tzinfo=timezone.utc)
+
+
+def alert(
+    alert_id,
+    expires="2019-12-21T05:30:00-08:00",
+    refs=(),
+    message="Alert",
+    sent="2019-12-20T13:34:00-08:00",
+):
+    return {
+        "id": alert_id,
+        "sent": sent,
+        "expires": expires,
+        "messageType": message,
+        "references": [{"identifier": ref} for ref in refs],
+    }
+
+
+def ids(alerts):
+    return [a["id"] for a in alerts]
+
+
+def test_alert_store_diff():
+    store = AlertStore()
+    a, b = alert("a"), alert("b")
+    diff = store.apply([a, b], NOW)
+    assert ids(diff.new) == ["a", "b"]
+    assert not diff.updated
+    assert not diff.cancelled
+    assert len(store) == 2
+
+    # unchanged poll
+    assert not store.apply([a, b], NOW)
+
+    # c updates a, b is no longer active
+    c = alert("c", refs=["a"], message="Update")
+    diff = store.apply([a, c], NOW)
+    assert not diff.new
+    assert ids(diff.updated) == ["c"]
+    assert ids(diff.cancelled) == ["b"]
+    assert ids(store.alerts.values()) == ["c"]
+
+    # a superseded alert is not stored again
+    assert not store.apply([a, c], NOW)
+
+    # cancel messages remove the alerts they reference and are not stored
+    d = alert("d", refs=["c"], message="Cancel")
+    diff = store.apply([c, d], NOW)
+    assert ids(diff.cancelled) == ["c"]
+    assert len(store) == 0
+    assert not store.apply([d], NOW)
+
+
+def test_alert_store_sent_order():
+    a = alert("a", sent="2019-12-20T13:00:00-08:00")
+    b = alert("b", refs=["a"], message="Update", sent="2019-12-20T14:00:00-08:00")
+    for poll in ([a, b], [b, a]):
+        store = AlertStore()
+        diff = store.apply(poll, NOW)
+        assert ids(diff.new) == ["a"]
+        assert ids(diff.updated) == ["b"]
+        assert ids(store.alerts.values()) == ["b"]
+
+
+def test_alert_store_cancel_applied_once():
+    store = AlertStore()
+    a = alert("a")
+    cancel = alert("cancel", refs=["a"], message="Cancel")
+    store.apply([a], NOW)
+    with patch("pynws.alerts._references", wraps=_references) as references:
+        assert ids(store.apply([cancel], NOW).cancelled) == ["a"]
+        calls = references.call_count
+        # active cancel messages are skipped in later polls
+        assert not store.apply([cancel], NOW)
+        assert references.call_count == calls
+
+
+def test_alert_store_expire():
+    store = AlertStore()
+    store.apply(
+        [
+            alert("a", expires="2019-12-20T23:00:00+00:00"),
+            alert("b", expires="2019-12-21T01:00:00+00:00"),
+            alert("c", expires=None),
+            alert("old", expires="2019-12-20T21:00:00+00:00"),
+        ],
+        NOW,
+    )
+    assert "old" not in store
+    assert store.expire(NOW) == []
+    assert ids(store.expire(NOW + timedelta(hours=2))) == ["a"]
+    # b is updated with a later expiry, its heap entry is stale
+    b2 = alert("b2", expires="2019-12-21T03:00:00+00:00", refs=["b"])
+    c = alert("c", expires=None)
+    diff = store.apply([b2, c], NOW + timedelta(hours=2))
+    assert ids(diff.updated) == ["b2"]
+    assert store.expire(NOW + timedelta(hours=4)) == []
+    assert ids(store.expire(NOW + timedelta(hours=6))) == ["b2"]
+    assert ids(store.alerts.values()) == ["c"]
+
+    assert not store.apply([c], NOW + timedelta(days=1))
+
+
+def test_alert_store_expired_in_poll():
+    store = AlertStore()
+    store.apply([alert("a", expires="2019-12-20T23:00:00+00:00")], NOW)
+    diff = store.apply(
+        [alert("a", expires="2019-12-20T23:00:00+00:00")], NOW + timedelta(hours=2)
+    )
+    assert ids(diff.expired) == ["a"]
+    assert not diff.new
+    assert not diff.cancelled
+
+
+async def test_simple_nws_alert_changes(aiohttp_client, mock_urls):
+    app = setup_app(
+        alerts_active_point=["alerts_active_zone", "alerts_active_zone_second"]
+    )
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    with freeze_time("2019-12-20T22:00:00Z"):
+        diff = await nws.update_alert_changes()
+        assert ids(diff.new) == ["NWS-IDP-PROD-3965873-3369046"]
+        diff = await nws.update_alert_changes()
+    assert ids(diff.new) == ["NWS-IDP-PROD-3965873-001"]
+    assert not diff.updated
+    assert len(nws.alert_store) == 2
+
+
+def test_alert_model():
+    # build events at runtime so they are not shared constants
+    word = "Watch"
+    properties = {
+        **alert("model"),
+        "event": f"Flood {word}",
+        "description": "Flooding is possible.\n\nRésumé",
+        "parameters": {"VTEC": ["/O.CON.KPQR.FA.A.0004/"]},
+    }
+    model = Alert.from_properties(properties)
+    assert isinstance(model._text["description"], bytes)
+    assert model["description"] == properties["description"]
+    assert isinstance(model._text["description"], str)
+    assert model["parameters"] == properties["parameters"]
+    assert "instruction" not in model
+    assert model.get("instruction") is None
+    assert model == properties
+    assert model.as_dict() == properties
+    assert len(model) == len(properties)
+    # event strings are interned across alerts
+    other = Alert.from_properties({**alert("other"), "event": f"Flood {word}"})
+    assert model["event"] == other["event"]
+    assert model["event"] is other["event"]
+    assert not hasattr(model, "__dict__")
+
+    # shared by id while in use
+    assert Alert.from_properties(dict(properties)) is model
+    assert Alert.from_properties(model) is model
+
+
+async def test_simple_nws_compact_alerts(aiohttp_client, mock_urls):
+    client = await aiohttp_client(setup_app())
+    fleet = [SimpleNWS(*LATLON, USERID, client, compact_alerts=True) for _ in range(2)]
+    for nws in fleet:
+        await nws.update_alerts_forecast_zone()
+        await nws.update_alerts_all_zones()
+        await nws.update_alerts_point()
+    alerts = [
+        alert
+        for nws in fleet
+        for alert in (
+            *nws.alerts_forecast_zone,
+            *nws.alerts_all_zones,
+            *nws.alerts_point,
+        )
+    ]
+    assert len(alerts) == 6
+    assert all(isinstance(a, Alert) for a in alerts)
+    assert all(a is alerts[0] for a in alerts)
+    assert alerts[0]["description"].startswith("The Flood Watch")
+
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.update_alerts_point()
+    assert type(nws.alerts_point[0]) is dict
@@ -0,0 +1,81 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from pynws.batch import get_stations_observations_latest
+from tests.helpers import setup_app
+
+USERID = "test_user"
+
+
+async def test_batch_latest(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    results = await get_stations_observations_latest(
+        ["ABC", "DEF", "ABC"], client, USERID
+    )
+    assert list(results) == ["ABC", "DEF"]
+    for station, result in results.items():
+        assert result.station == station
+        assert result.error is None
+        assert result.observation["station"] == "https://api.weather.gov/stations/KFLL"
+
+
+async def test_batch_latest_error(aiohttp_client, mock_urls):
+    app = setup_app(
+        stations_observations_latest=[
+            aiohttp.web.HTTPBadGateway,
+            "stations_observations_latest",
+        ]
+    )
+    client = await aiohttp_client(app)
+    results = await get_stations_observations_latest(
+        ["ABC", "DEF"], client, USERID, max_concurrency=1
+    )
+    assert isinstance(results["ABC"].error, aiohttp.ClientResponseError)
+    assert results["ABC"].observation is None
+    assert results["DEF"].error is None
+    assert results["DEF"].observation
+
+
+async def test_batch_latest_timeout(aiohttp_client, mock_urls):
+    async def slow(request):
+        await asyncio.sleep(1)
+        return aiohttp.web.json_response({"properties": {}})
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", slow)
+    client = await aiohttp_client(app)
+    results = await get_stations_observations_latest(
+        ["ABC"], client, USERID, timeout=0.01
+    )
+    assert isinstance(results["ABC"].error, asyncio.TimeoutError)
+
+
+async def test_batch_latest_concurrency(aiohttp_client, mock_urls):
+    in_flight = 0
+    peak = 0
+
+    async def counting(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return aiohttp.web.json_response({"properties": {}})
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", counting)
+    client = await aiohttp_client(app)
+    stations = [str(i) for i in range(10)]
+    results = await get_stations_observations_latest(
+        stations, client, USERID, max_concurrency=3
+    )
+    assert len(results) == 10
+    assert peak <= 3
+
+    with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+        await get_stations_observations_latest(
+            stations, client, USERID, max_concurrency=0
+        )
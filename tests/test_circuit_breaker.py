@@ -0,0 +1,195 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from pynws import (
+    CircuitBreakers,
+    DeadlineExceeded,
+    Nws,
+    NwsCircuitOpenError,
+    RequestOptions,
+    deadline,
+)
+from pynws.circuit_breaker import CircuitBreaker, CircuitState
+from pynws.const import API_STATIONS_OBSERVATIONS_LATEST
+from tests.helpers import data_return_function, setup_app
+
+LATLON = (0, 0)
+STATION = "ABC"
+USERID = "test_user"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_circuit_breaker_states():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_ratio=0.5, min_calls=4, window=4, reset_timeout=10, clock=clock
+    )
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+    # a single probe is allowed after the reset timeout
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_circuit_breakers_call():
+    clock = FakeClock()
+    breakers = CircuitBreakers(
+        failure_ratio=0.3, min_calls=1, reset_timeout=10, clock=clock
+    )
+
+    async def ok():
+        return {"value": 1}
+
+    async def fail():
+        raise asyncio.TimeoutError
+
+    async def invalid():
+        raise ValueError("invalid")
+
+    assert await breakers.call("a", "key", ok) == {"value": 1}
+    with pytest.raises(ValueError, match="invalid"):
+        await breakers.call("a", "key", invalid)
+    assert breakers.get("a").state == CircuitState.CLOSED
+    with pytest.raises(asyncio.TimeoutError):
+        await breakers.call("a", "key", fail)
+    assert breakers.get("a").state == CircuitState.OPEN
+    # other endpoints are not affected
+    assert breakers.get("b").state == CircuitState.CLOSED
+
+    # cached response is served while open
+    assert await breakers.call("a", "key", fail) == {"value": 1}
+    with pytest.raises(NwsCircuitOpenError, match="Circuit for a is open"):
+        await breakers.call("a", "other", ok)
+
+    clock.now = 10
+    assert await breakers.call("a", "other", ok) == {"value": 1}
+    assert breakers.get("a").state == CircuitState.CLOSED
+
+
+async def test_circuit_breakers_cache_size():
+    breakers = CircuitBreakers(cache_size=1, failure_ratio=0.3, min_calls=1)
+
+    async def ok():
+        return {"value": 1}
+
+    async def fail():
+        raise asyncio.TimeoutError
+
+    await breakers.call("a", "first", ok)
+    await breakers.call("a", "second", ok)
+    with pytest.raises(asyncio.TimeoutError):
+        await breakers.call("a", "second", fail)
+    assert await breakers.call("a", "second", fail) == {"value": 1}
+    with pytest.raises(NwsCircuitOpenError):
+        await breakers.call("a", "first", ok)
+
+
+async def test_circuit_breakers_cache_copy():
+    breakers = CircuitBreakers(min_calls=1)
+
+    async def ok():
+        return {"periods": [{"temperature": 50}]}
+
+    async def fail():
+        raise asyncio.TimeoutError
+
+    data = await breakers.call("a", "key", ok)
+    # callers changing the response do not change the cached data
+    data["periods"][0]["temperature"] = 10
+    with pytest.raises(asyncio.TimeoutError):
+        await breakers.call("a", "key", fail)
+    assert await breakers.call("a", "key", fail) == await ok()
+
+
+async def test_circuit_breakers_cache_body():
+    breakers = CircuitBreakers(min_calls=1)
+
+    async def ok():
+        return {"value": 1}
+
+    async def fail():
+        raise asyncio.TimeoutError
+
+    # the response body is cached as received
+    await breakers.call("a", "key", ok, lambda: b'{"value": 1, "raw": true}')
+    with pytest.raises(asyncio.TimeoutError):
+        await breakers.call("a", "key", fail)
+    assert await breakers.call("a", "key", fail) == {"value": 1, "raw": True}
+
+
+async def test_nws_circuit_breaker(aiohttp_client, mock_urls):
+    app = setup_app(
+        stations_observations_latest=[
+            "stations_observations_latest",
+            aiohttp.web.HTTPBadGateway,
+        ]
+    )
+    client = await aiohttp_client(app)
+    breakers = CircuitBreakers(min_calls=1)
+    options = RequestOptions(circuit_breakers=breakers)
+    nws = Nws(client, USERID, LATLON, STATION, request_options=options)
+
+    observation = await nws.get_stations_observations_latest()
+    with pytest.raises(aiohttp.ClientResponseError):
+        await nws.get_stations_observations_latest()
+    assert breakers.get(API_STATIONS_OBSERVATIONS_LATEST).state == CircuitState.OPEN
+
+    # no request is made while open
+    assert await nws.get_stations_observations_latest() == observation
+
+
+async def test_nws_circuit_breaker_deadline(aiohttp_client, mock_urls):
+    async def slow(request):
+        await asyncio.sleep(1)
+        return await data_return_function("stations_observations_latest")(request)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", slow)
+    client = await aiohttp_client(app)
+    breakers = CircuitBreakers(min_calls=1)
+    options = RequestOptions(
+        circuit_breakers=breakers, timeouts={API_STATIONS_OBSERVATIONS_LATEST: 0.05}
+    )
+    nws = Nws(client, USERID, LATLON, STATION, request_options=options)
+    breaker = breakers.get(API_STATIONS_OBSERVATIONS_LATEST)
+
+    # the caller's deadline is not a failure of the endpoint
+    for _ in range(3):
+        with deadline(0.01), pytest.raises(DeadlineExceeded):
+            await nws.get_stations_observations_latest()
+    assert breaker.state == CircuitState.CLOSED
+
+    # the endpoint timeout is
+    with pytest.raises(asyncio.TimeoutError) as exc_info:
+        await nws.get_stations_observations_latest()
+    assert not isinstance(exc_info.value, DeadlineExceeded)
+    assert breaker.state == CircuitState.OPEN
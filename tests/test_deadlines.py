@@ -0,0 +1,72 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from pynws import DeadlineExceeded, Nws, RequestOptions, deadline
+from pynws.const import API_STATIONS_OBSERVATIONS_LATEST
+from pynws.deadlines import remaining
+from tests.helpers import data_return_function
+
+LATLON = (0, 0)
+STATION = "ABC"
+USERID = "test_user"
+
+
+def _slow_app(path, fixture, delay):
+    async def slow(request):
+        await asyncio.sleep(delay)
+        return await data_return_function(fixture)(request)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/points", data_return_function("points"))
+    app.router.add_get(path, slow)
+    return app
+
+
+def test_deadline_nesting():
+    assert remaining() is None
+    with deadline(10):
+        assert 9 < remaining() <= 10
+        with deadline(20):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        with deadline(None):
+            assert 9 < remaining() <= 10
+    assert remaining() is None
+
+
+async def test_deadline_expired(aiohttp_client, mock_urls):
+    app = _slow_app("/stations_observations_latest", "stations_observations_latest", 0)
+    client = await aiohttp_client(app)
+    nws = Nws(client, USERID, LATLON, STATION)
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        await nws.get_stations_observations_latest()
+
+
+async def test_client_timeout(aiohttp_client, mock_urls):
+    app = _slow_app("/gridpoints", "detailed_forecast", 1)
+    client = await aiohttp_client(app)
+    nws = Nws(client, USERID, LATLON, timeout=0.1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(asyncio.TimeoutError):
+        await nws.get_detailed_forecast()
+    assert loop.time() - start < 0.5
+    # points were received before the deadline
+    assert nws.wfo
+
+
+async def test_endpoint_timeout(aiohttp_client, mock_urls):
+    app = _slow_app("/stations_observations_latest", "stations_observations_latest", 1)
+    client = await aiohttp_client(app)
+    options = RequestOptions(timeouts={API_STATIONS_OBSERVATIONS_LATEST: 0.05})
+    nws = Nws(client, USERID, LATLON, STATION, request_options=options)
+    with pytest.raises(asyncio.TimeoutError):
+        await nws.get_stations_observations_latest()
+
+    options = RequestOptions(timeouts=None)
+    nws = Nws(client, USERID, LATLON, STATION, request_options=options)
+    with deadline(0.05), pytest.raises(DeadlineExceeded):
+        await nws.get_stations_observations_latest()
@@ -0,0 +1,133 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from pynws import HedgePolicy, Nws, RequestOptions
+from pynws.const import API_DETAILED_FORECAST
+from tests.helpers import data_return_function
+
+LATLON = (0, 0)
+USERID = "test_user"
+
+
+def _request(delays, calls, failing=()):
+    async def request():
+        delay = delays.pop(0)
+        calls.append(delay)
+        await asyncio.sleep(delay)
+        if delay in failing:
+            raise RuntimeError(f"failed after {delay}")
+        return delay
+
+    return request
+
+
+def test_hedge_delay():
+    with pytest.raises(ValueError, match="percentile must be in"):
+        HedgePolicy(percentile=0)
+    policy = HedgePolicy(initial_delay=3, min_samples=4, window=10, percentile=0.5)
+    assert policy.delay("a") == 3
+    for latency in (4, 1, 3, 2):
+        policy.record("a", latency)
+    assert policy.delay("a") == 3
+    assert policy.delay("b") == 3
+
+
+async def test_hedge_call():
+    policy = HedgePolicy(endpoints=["a"], initial_delay=0.01, max_hedge_ratio=0)
+    calls = []
+
+    # fast response is not hedged
+    assert await policy.call("a", _request([0.0], calls)) == 0.0
+    assert calls == [0.0]
+
+    # slow response is hedged, and the hedge wins
+    calls.clear()
+    assert await policy.call("a", _request([1.0, 0.0], calls)) == 0.0
+    assert calls == [1.0, 0.0]
+    assert policy.hedges == 1
+
+    # hedge ratio is exhausted
+    calls.clear()
+    assert await policy.call("a", _request([0.05, 0.0], calls)) == 0.05
+    assert calls == [0.05]
+    assert policy.requests == 3
+
+    # endpoints that are not hedged
+    calls.clear()
+    assert await policy.call("b", _request([0.05, 0.0], calls)) == 0.05
+    assert calls == [0.05]
+
+
+async def test_hedge_records_original_latency():
+    policy = HedgePolicy(
+        endpoints=["a"], initial_delay=0.02, min_samples=1, percentile=1
+    )
+    calls = []
+    assert await policy.call("a", _request([1.0, 0.0], calls)) == 0.0
+    # the slow original is recorded, not the fast hedge
+    assert policy.delay("a") >= 0.02
+
+
+async def test_hedge_call_errors():
+    policy = HedgePolicy(endpoints=["a"], initial_delay=0.01, max_hedge_ratio=1)
+    calls = []
+
+    # failed hedge does not win
+    assert await policy.call("a", _request([0.05, 0.0], calls, [0.0])) == 0.05
+
+    # error of the original request is raised if both fail
+    with pytest.raises(RuntimeError, match="failed after 1.0"):
+        await policy.call("a", _request([1.0, 0.0], calls, [1.0, 0.0]))
+
+
+async def test_nws_hedge(aiohttp_client, mock_urls):
+    delays = [1.0, 0.0]
+
+    async def gridpoints(request):
+        await asyncio.sleep(delays.pop(0))
+        return await data_return_function("detailed_forecast")(request)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/points", data_return_function("points"))
+    app.router.add_get("/gridpoints", gridpoints)
+    client = await aiohttp_client(app)
+    policy = HedgePolicy(initial_delay=0.05)
+    nws = Nws(client, USERID, LATLON, request_options=RequestOptions(hedging=policy))
+    forecast = await nws.get_detailed_forecast()
+    assert forecast
+    assert delays == []
+    assert policy.hedges == 1
+    assert policy.delay(API_DETAILED_FORECAST) == 0.05
+
+
+async def test_nws_hedge_metrics(aiohttp_client, mock_urls):
+    # the original sends headers at once and wins while the hedge streams
+    attempts = [("original", 0.2), ("hedge", 1.0)]
+
+    async def gridpoints(request):
+        request_id, delay = attempts.pop(0)
+        body = (await data_return_function("detailed_forecast")(request)).body
+        res = aiohttp.web.StreamResponse(headers={"X-Request-ID": request_id})
+        res.content_type = "application/json"
+        await res.prepare(request)
+        await asyncio.sleep(delay)
+        await res.write(body)
+        await res.write_eof()
+        return res
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/points", data_return_function("points"))
+    app.router.add_get("/gridpoints", gridpoints)
+    client = await aiohttp_client(app)
+    metrics = []
+    options = RequestOptions(
+        hedging=HedgePolicy(initial_delay=0.05), on_request=metrics.append
+    )
+    nws = Nws(client, USERID, LATLON, request_options=options)
+    assert await nws.get_detailed_forecast()
+    assert attempts == []
+    # measurements of the winning attempt only
+    assert metrics[-1].request_id == "original"
+    assert metrics[-1].bytes > 0
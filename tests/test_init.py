@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import pytest
+
+import pynws
+
+
+def test_lazy_imports():
+    code = (
+        "import sys, pynws, pynws.urls; pynws.DetailedForecast; "
+        "assert 'aiohttp' not in sys.modules, 'aiohttp'; "
+        "assert 'metar' not in sys.modules, 'metar'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_public_names():
+    for name in pynws.__all__:
+        assert getattr(pynws, name)
+    assert set(pynws.__all__) <= set(dir(pynws))
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        pynws.missing  # noqa: B018
@@ -0,0 +1,232 @@
+import logging
+import sys
+from types import ModuleType, SimpleNamespace
+from unittest.mock import Mock, patch
+
+import aiohttp
+import pytest
+
+from pynws import CircuitBreakers, Nws, RequestOptions, RetryPolicy
+from pynws.const import API_STATIONS_OBSERVATIONS_LATEST
+from pynws.instrumentation import (
+    OpenTelemetryHook,
+    PrometheusHook,
+    RequestMetrics,
+    RequestSource,
+    UpdateTimer,
+)
+from tests.helpers import data_return_function, setup_app
+
+LATLON = (0, 0)
+STATION = "ABC"
+USERID = "test_user"
+
+
+def _latest_app(responses):
+    async def latest(request):
+        status = responses.pop(0)
+        if status != 200:
+            return aiohttp.web.json_response({}, status=status)
+        res = await data_return_function("stations_observations_latest")(request)
+        res.headers["X-Request-ID"] = "request-id"
+        res.headers["X-Correlation-ID"] = "correlation-id"
+        return res
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", latest)
+    return app
+
+
+async def test_request_metrics(aiohttp_client, mock_urls):
+    client = await aiohttp_client(_latest_app([200, 500]))
+    metrics = []
+    options = RequestOptions(on_request=metrics.append)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+
+    await nws.get_stations_observations_latest()
+    with pytest.raises(aiohttp.ClientResponseError):
+        await nws.get_stations_observations_latest()
+
+    ok, error = metrics
+    assert ok.endpoint == API_STATIONS_OBSERVATIONS_LATEST
+    assert ok.url == "/stations_observations_latest"
+    assert ok.status == 200
+    assert ok.bytes > 0
+    assert 0 <= ok.decode_time <= ok.latency
+    assert ok.source == RequestSource.NETWORK
+    assert not ok.cache_hit
+    assert ok.attempt == 1
+    assert ok.retries == 0
+    assert ok.request_id == "request-id"
+    assert ok.correlation_id == "correlation-id"
+    assert ok.error is None
+
+    assert error.status == 500
+    assert error.bytes is None
+    assert error.error == "ClientResponseError"
+
+
+async def test_request_metrics_retries(aiohttp_client, mock_urls):
+    client = await aiohttp_client(_latest_app([503, 503, 200]))
+    metrics = []
+    options = RequestOptions(on_request=metrics.append)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    policy = RetryPolicy(base_delay=0, max_delay=0)
+
+    await policy.call(nws.get_stations_observations_latest)
+    assert [m.attempt for m in metrics] == [1, 2, 3]
+    assert [m.status for m in metrics] == [503, 503, 200]
+
+
+async def test_request_metrics_cache_hit(aiohttp_client, mock_urls):
+    client = await aiohttp_client(_latest_app([200, 503]))
+    metrics = []
+    options = RequestOptions(
+        circuit_breakers=CircuitBreakers(failure_ratio=0.3, min_calls=1),
+        on_request=metrics.append,
+    )
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+
+    await nws.get_stations_observations_latest()
+    with pytest.raises(aiohttp.ClientResponseError):
+        await nws.get_stations_observations_latest()
+    await nws.get_stations_observations_latest()
+
+    assert [m.source for m in metrics] == [
+        RequestSource.NETWORK,
+        RequestSource.NETWORK,
+        RequestSource.CIRCUIT_BREAKER,
+    ]
+    assert metrics[-1].cache_hit
+
+
+def test_update_timer_network():
+    def metrics(latency, decode_time):
+        return RequestMetrics(
+            endpoint=None,
+            url="/",
+            status=200,
+            latency=latency,
+            bytes=None,
+            decode_time=decode_time,
+            source=RequestSource.NETWORK,
+            attempt=1,
+            request_id=None,
+            correlation_id=None,
+            error=None,
+        )
+
+    timer = UpdateTimer("observation")
+    # two concurrent requests and a later one
+    timer.add_request(0.0, metrics(2.0, 0.1))
+    timer.add_request(1.0, metrics(2.0, 0.1))
+    timer.add_request(5.0, metrics(1.0, None))
+    report = timer.report()
+    assert report.requests == 3
+    assert report.decode == pytest.approx(0.2)
+    # concurrent requests are counted once
+    assert report.network == pytest.approx(3.8)
+
+
+async def test_request_hook_error(aiohttp_client, mock_urls, caplog):
+    def hook(metrics):
+        raise RuntimeError("hook failed")
+
+    client = await aiohttp_client(setup_app())
+    options = RequestOptions(on_request=hook)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    with caplog.at_level(logging.ERROR):
+        assert await nws.get_stations_observations_latest()
+    assert "Error in request hook" in caplog.text
+
+
+class _FakeMetric:
+    """Record values of a fake Prometheus or OpenTelemetry instrument."""
+
+    def __init__(self, name, *args, **kwargs):
+        self.name = name
+        self.kwargs = kwargs
+        self.values = []
+        self._labels = {}
+
+    def labels(self, **labels):
+        child = _FakeMetric(self.name)
+        child.values = self.values
+        child._labels = labels
+        return child
+
+    def inc(self, value=1):
+        self.values.append((self._labels, value))
+
+    observe = inc
+
+    def add(self, value, attributes):
+        self.values.append((attributes, value))
+
+    record = add
+
+
+async def test_prometheus_hook(aiohttp_client, mock_urls):
+    prometheus_client = ModuleType("prometheus_client")
+    prometheus_client.REGISTRY = object()
+    prometheus_client.Counter = prometheus_client.Histogram = _FakeMetric
+    with patch.dict(sys.modules, {"prometheus_client": prometheus_client}):
+        hook = PrometheusHook(namespace="test")
+    assert hook.requests.kwargs == {
+        "namespace": "test",
+        "registry": prometheus_client.REGISTRY,
+    }
+
+    client = await aiohttp_client(_latest_app([503, 200]))
+    options = RequestOptions(on_request=hook)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    policy = RetryPolicy(base_delay=0, max_delay=0)
+    await policy.call(nws.get_stations_observations_latest)
+
+    labels = {"endpoint": API_STATIONS_OBSERVATIONS_LATEST, "source": "network"}
+    assert hook.requests.values == [
+        ({**labels, "status": "503"}, 1),
+        ({**labels, "status": "200"}, 1),
+    ]
+    assert [labels for labels, _ in hook.latency.values] == [
+        {**labels, "status": "503"},
+        {**labels, "status": "200"},
+    ]
+    ((bytes_labels, size),) = hook.bytes.values
+    assert bytes_labels == {"endpoint": API_STATIONS_OBSERVATIONS_LATEST}
+    assert size > 0
+    assert hook.retries.values == [({"endpoint": API_STATIONS_OBSERVATIONS_LATEST}, 1)]
+
+
+async def test_opentelemetry_hook(aiohttp_client, mock_urls):
+    meter = SimpleNamespace(create_counter=_FakeMetric, create_histogram=_FakeMetric)
+    metrics = ModuleType("opentelemetry.metrics")
+    metrics.get_meter = Mock(return_value=meter)
+    opentelemetry = ModuleType("opentelemetry")
+    opentelemetry.metrics = metrics
+    provider = object()
+    with patch.dict(
+        sys.modules,
+        {"opentelemetry": opentelemetry, "opentelemetry.metrics": metrics},
+    ):
+        hook = OpenTelemetryHook(provider)
+    metrics.get_meter.assert_called_once_with("pynws", meter_provider=provider)
+
+    client = await aiohttp_client(_latest_app([503, 200]))
+    options = RequestOptions(on_request=hook)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    policy = RetryPolicy(base_delay=0, max_delay=0)
+    await policy.call(nws.get_stations_observations_latest)
+
+    attributes = {"endpoint": API_STATIONS_OBSERVATIONS_LATEST, "source": "network"}
+    assert hook.requests.values == [
+        ({**attributes, "status": "503", "attempt": 1}, 1),
+        ({**attributes, "status": "200", "attempt": 2}, 1),
+    ]
+    assert [attributes for attributes, _ in hook.latency.values] == [
+        {**attributes, "status": "503", "attempt": 1},
+        {**attributes, "status": "200", "attempt": 2},
+    ]
+    ((bytes_attributes, size),) = hook.bytes.values
+    assert bytes_attributes == {"endpoint": API_STATIONS_OBSERVATIONS_LATEST}
+    assert size > 0
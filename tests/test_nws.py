@@ -6,6 +6,7 @@ import pytest
 from pynws import DetailedForecast, Nws, NwsError
 from pynws.const import Detail
 from pynws.forecast import ONE_HOUR
+from pynws.units import US
 from tests.helpers import setup_app
 
 LATLON = (0, 0)
@@ -106,6 +107,20 @@ async def test_nws_detailed_forecast(aiohttp_client, mock_urls):
         assert Detail.TEMPERATURE in details
 
 
+async def test_nws_detailed_forecast_unit_system(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = Nws(client, USERID, LATLON, unit_system=US)
+    forecast = await nws.get_detailed_forecast()
+    assert forecast.unit_system == US
+
+    when = datetime.fromisoformat("2022-02-04T03:15:00+00:00")
+    details = forecast.get_details_for_time(when)
+    assert details[Detail.TEMPERATURE] == pytest.approx(66)  # fahrenheit
+    assert details[Detail.RELATIVE_HUMIDITY] == 97.0
+    assert details[Detail.WIND_SPEED] == pytest.approx(8.0557, abs=1e-3)  # mph
+
+
 async def test_nws_gridpoints_forecast_si(aiohttp_client, mock_urls):
     app = setup_app()
     client = await aiohttp_client(app)
@@ -201,6 +216,25 @@ async def test_nws_alerts_active_zone(aiohttp_client, mock_urls):
     assert isinstance(alerts, list)
 
 
+async def test_nws_alerts_point(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = Nws(client, USERID, LATLON)
+    alerts = await nws.get_alerts_point()
+    assert [alert["id"] for alert in alerts] == ["NWS-IDP-PROD-3965873-3369046"]
+    mock_points_url, mock_alerts_active_point_url = mock_urls[2], mock_urls[9]
+    assert mock_points_url.call_count == 0
+    mock_alerts_active_point_url.assert_called_once_with(*LATLON)
+
+
+async def test_nws_alerts_point_no_latlon(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = Nws(client, USERID)
+    with pytest.raises(NwsError):
+        await nws.get_alerts_point()
+
+
 async def test_nws_alerts_forecast_zone(aiohttp_client, mock_urls):
     app = setup_app()
     client = await aiohttp_client(app)
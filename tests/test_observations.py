@@ -0,0 +1,43 @@
+import pytest
+
+from pynws.observations import ObservationBuffer
+
+
+def _obs(hour, value=None):
+    return {"timestamp": f"2019-06-27T{hour:02d}:00:00+00:00", "value": value}
+
+
+def test_buffer_merge_ordered():
+    buffer = ObservationBuffer(3)
+    assert buffer.newest_timestamp is None
+    assert buffer.merge([_obs(2), _obs(1)]) == 2
+    assert [o["timestamp"][11:13] for o in buffer] == ["02", "01"]
+    assert buffer.newest_timestamp.hour == 2
+
+    # newer observations evict the oldest
+    assert buffer.merge([_obs(4), _obs(3)]) == 2
+    assert len(buffer) == 3
+    assert [o["timestamp"][11:13] for o in buffer.newest_first()] == ["04", "03", "02"]
+
+
+def test_buffer_merge_duplicates_and_old():
+    buffer = ObservationBuffer(3)
+    buffer.merge([_obs(1), _obs(3), _obs(5)])
+
+    # same timestamp replaces the buffered observation
+    assert buffer.merge([_obs(5, "new")]) == 0
+    assert buffer.newest_first()[0]["value"] == "new"
+
+    # older than a full buffer is dropped
+    assert buffer.merge([_obs(0)]) == 0
+    # out of order observation is inserted in place
+    assert buffer.merge([_obs(4)]) == 1
+    assert [o["timestamp"][11:13] for o in buffer] == ["05", "04", "03"]
+
+    # observations without timestamp are ignored
+    assert buffer.merge([{"timestamp": None}]) == 0
+
+
+def test_buffer_maxlen():
+    with pytest.raises(ValueError, match="maxlen must be at least 1"):
+        ObservationBuffer(0)
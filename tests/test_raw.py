@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 
+import aiohttp
 import pytest
 
-from pynws import raw_data
-from tests.helpers import setup_app
+from pynws import CircuitBreakers, RedirectCache, RequestOptions, raw_data, urls
+from pynws.const import API_POINTS
+from tests.helpers import data_return_function, setup_app
 
 LATLON = (0, 0)
 STATION = "ABC"
@@ -27,6 +29,103 @@ async def test_points(aiohttp_client, mock_urls):
     await raw_data.raw_points(*LATLON, client, USERID)
 
 
+async def test_base_url(aiohttp_client):
+    app = aiohttp.web.Application()
+    app.router.add_get("/points/0,0", data_return_function("points"))
+    client = await aiohttp_client(app)
+    options = RequestOptions(base_url=str(client.make_url("/")))
+    assert await raw_data.raw_points(*LATLON, client.session, USERID, options=options)
+
+
+def test_canonical_coordinates():
+    assert urls.canonical_coordinate(39.7456) == "39.7456"
+    assert urls.canonical_coordinate(39.74560) == "39.7456"
+    assert urls.canonical_coordinate(39.745612) == "39.7456"
+    assert urls.canonical_coordinate(-105.12345) == "-105.1235"
+    assert urls.canonical_coordinate(40.0) == "40"
+    assert urls.canonical_coordinate(-0.00001) == "0"
+    assert urls.points_url(39.745612, -104.99) == urls.points_url(39.7456, -104.990)
+    assert urls.points_url(39.745612, -104.99).endswith("/points/39.7456,-104.99")
+    assert urls.alerts_active_point_url(39.745612, -104.99).endswith(
+        "?point=39.7456,-104.99"
+    )
+
+
+def test_redirect_cache():
+    redirects = RedirectCache(maxsize=2)
+    assert redirects.get("/a") == "/a"
+    redirects.add("/a", "/a")
+    assert len(redirects) == 0
+    redirects.add("/a", "/a2")
+    redirects.add("/b", "/b2")
+    assert redirects.get("/a") == "/a2"
+    # /b is least recently used
+    redirects.add("/c", "/c2")
+    assert redirects.get("/b") == "/b"
+    assert redirects.get("/a") == "/a2"
+    assert len(redirects) == 2
+
+
+async def test_points_redirect(aiohttp_client, mock_urls):
+    app = aiohttp.web.Application()
+    hits = []
+
+    async def redirect(request):
+        hits.append(request.path)
+        raise aiohttp.web.HTTPMovedPermanently("/points_final")
+
+    app.router.add_get("/points", redirect)
+    app.router.add_get("/points_final", data_return_function("points"))
+    client = await aiohttp_client(app)
+    # absolute urls, as from the API
+    mock_urls[2].return_value = str(client.make_url("/points"))
+    session = client.session
+    redirects = RedirectCache()
+    breakers = CircuitBreakers(min_calls=1)
+    options = RequestOptions(redirects=redirects, circuit_breakers=breakers)
+
+    data = await raw_data.raw_points(*LATLON, session, USERID, options=options)
+    assert hits == ["/points"]
+    assert redirects.get(str(client.make_url("/points"))) == str(
+        client.make_url("/points_final")
+    )
+
+    # responses are cached under the requested url, not the redirect target
+    breaker = breakers.get(API_POINTS)
+    breaker.record_failure()
+    assert await raw_data.raw_points(*LATLON, session, USERID, options=options) == data
+    breaker.record_success()
+
+    # later requests skip the redirect
+    assert await raw_data.raw_points(*LATLON, session, USERID, options=options) == data
+    assert hits == ["/points"]
+
+    # without a cache every request is redirected
+    await raw_data.raw_points(*LATLON, session, USERID)
+    assert hits == ["/points", "/points"]
+
+
+async def test_points_temporary_redirect(aiohttp_client, mock_urls):
+    app = aiohttp.web.Application()
+    hits = []
+
+    async def redirect(request):
+        hits.append(request.path)
+        raise aiohttp.web.HTTPTemporaryRedirect("/points_final")
+
+    app.router.add_get("/points", redirect)
+    app.router.add_get("/points_final", data_return_function("points"))
+    client = await aiohttp_client(app)
+    mock_urls[2].return_value = str(client.make_url("/points"))
+    redirects = RedirectCache()
+    options = RequestOptions(redirects=redirects)
+
+    await raw_data.raw_points(*LATLON, client.session, USERID, options=options)
+    await raw_data.raw_points(*LATLON, client.session, USERID, options=options)
+    assert hits == ["/points", "/points"]
+    assert len(redirects) == 0
+
+
 async def test_stations_observations(aiohttp_client, mock_urls):
     app = setup_app()
     client = await aiohttp_client(app)
@@ -35,6 +134,9 @@ async def test_stations_observations(aiohttp_client, mock_urls):
     await raw_data.raw_stations_observations(
         STATION, client, USERID, start=datetime.now(timezone.utc)
     )
+    await raw_data.raw_stations_observations(
+        STATION, client, USERID, end=datetime.now(timezone.utc)
+    )
 
 
 async def test_stations_observations_start_datetime(aiohttp_client, mock_urls):
@@ -51,6 +153,12 @@ async def test_stations_observations_start_datetime(aiohttp_client, mock_urls):
             USERID,
             start=datetime.now(),
         )
+    with pytest.raises(ValueError, match="end parameter needs to be datetime, but got"):
+        await raw_data.raw_stations_observations(STATION, client, USERID, end="1PM")
+    with pytest.raises(ValueError, match="end parameter must be timezone aware"):
+        await raw_data.raw_stations_observations(
+            STATION, client, USERID, end=datetime.now()
+        )
 
 
 async def test_detailed_forecast(aiohttp_client, mock_urls):
@@ -75,3 +183,17 @@ async def test_alerts_active_zone(aiohttp_client, mock_urls):
     app = setup_app()
     client = await aiohttp_client(app)
     await raw_data.raw_alerts_active_zone(ZONE, client, USERID)
+
+
+async def test_alerts_active(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    alerts = await raw_data.raw_alerts_active(client, USERID)
+    assert len(alerts["features"]) == 3
+
+
+async def test_alerts_active_point(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    alerts = await raw_data.raw_alerts_active_point(*LATLON, client, USERID)
+    assert len(alerts["features"]) == 1
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import ClientResponseError, RequestInfo
+from freezegun import freeze_time
+from multidict import CIMultiDict, CIMultiDictProxy
+import pytest
+from yarl import URL
+
+from pynws import NwsNoDataError, RetryBudget, RetryPolicy
+from pynws.retry import nws_retry_if, retry_after
+
+
+def _error(status, headers=None):
+    request_info = RequestInfo(URL("/"), "GET", CIMultiDictProxy(CIMultiDict()))
+    return ClientResponseError(
+        request_info, (), status=status, headers=CIMultiDict(headers or {})
+    )
+
+
+def test_nws_retry_if():
+    retry = nws_retry_if()
+    assert retry(_error(500))
+    assert retry(_error(503))
+    assert not retry(_error(429))
+    assert not retry(_error(404))
+    assert not retry(NwsNoDataError("no data"))
+    assert not retry(ValueError())
+    assert nws_retry_if(retry_no_data=True)(NwsNoDataError("no data"))
+    assert nws_retry_if(retry_throttled=True)(_error(429))
+    # policies retry throttled requests by default
+    assert RetryPolicy().retry_if(_error(429))
+
+
+@freeze_time("2019-10-13T14:30:00+00:00")
+def test_retry_after():
+    assert retry_after(ValueError()) is None
+    assert retry_after(_error(503)) is None
+    assert retry_after(_error(503, {"Retry-After": "120"})) == 120
+    assert retry_after(_error(503, {"Retry-After": "invalid"})) is None
+
+    when = datetime(2019, 10, 13, 14, 31, tzinfo=timezone.utc)
+    headers = {"Retry-After": format_datetime(when, usegmt=True)}
+    assert retry_after(_error(503, headers)) == 60
+
+
+def test_backoff():
+    policy = RetryPolicy(base_delay=1, max_delay=timedelta(seconds=5), jitter=False)
+    assert [policy.backoff(i, _error(500)) for i in range(5)] == [1, 2, 4, 5, 5]
+
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    for i in range(5):
+        assert 0 <= policy.backoff(i, _error(500)) <= min(5, 2**i)
+
+    # Retry-After is a lower bound
+    assert policy.backoff(0, _error(429, {"Retry-After": "30"})) == 30
+
+
+def test_budget():
+    with pytest.raises(ValueError, match="ratio must be"):
+        RetryBudget(max_tokens=0)
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+async def test_policy_call():
+    func = AsyncMock(side_effect=[_error(500), _error(502), "done"])
+    policy = RetryPolicy(base_delay=0)
+    assert await policy.call(func, 1, key=2) == "done"
+    assert func.call_count == 3
+    func.assert_called_with(1, key=2)
+
+    # not retried errors
+    func = AsyncMock(side_effect=[_error(400), "done"])
+    with pytest.raises(ClientResponseError):
+        await policy.call(func)
+    assert func.call_count == 1
+
+
+async def test_policy_call_limits():
+    policy = RetryPolicy(base_delay=0, max_attempts=2)
+    func = AsyncMock(side_effect=[_error(500), _error(500), "done"])
+    with pytest.raises(ClientResponseError):
+        await policy.call(func)
+    assert func.call_count == 2
+
+    # next retry would start after stop
+    policy = RetryPolicy(base_delay=10, stop=5, jitter=False)
+    func = AsyncMock(side_effect=[_error(500), "done"])
+    with pytest.raises(ClientResponseError):
+        await policy.call(func)
+    assert func.call_count == 1
+
+    # stop compared to the elapsed time only
+    policy = RetryPolicy(base_delay=10, stop=5, stop_after_elapsed=True, jitter=False)
+    func = AsyncMock(side_effect=[_error(500), "done"])
+    with patch("pynws.retry.asyncio.sleep"):
+        assert await policy.call(func) == "done"
+    assert func.call_count == 2
+
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    policy = RetryPolicy(base_delay=0, budget=budget)
+    func = AsyncMock(side_effect=[_error(500), "done", _error(500), "done"])
+    assert await policy.call(func) == "done"
+    # one token used and half a token earned back
+    assert budget.tokens == 0.5
+    with pytest.raises(ClientResponseError):
+        await policy.call(func)
+
+
+async def test_policy_call_sleep():
+    policy = RetryPolicy(base_delay=1, jitter=False)
+    func = AsyncMock(side_effect=[_error(500), _error(500), "done"])
+    with patch("pynws.retry.asyncio.sleep") as mock_sleep:
+        await policy.call(func)
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
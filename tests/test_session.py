@@ -0,0 +1,57 @@
+import aiohttp
+import pytest
+
+from pynws import ManagedSession
+
+USERID = "test_user"
+
+
+@pytest.fixture
+async def server(aiohttp_server):
+    async def ok(request):
+        return aiohttp.web.Response(text="ok")
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/", ok)
+    return await aiohttp_server(app)
+
+
+async def test_managed_session_warm_up(server):
+    managed = ManagedSession(USERID, limit_per_host=2)
+    url = str(server.make_url("/"))
+    async with managed as session:
+        assert await managed.warm_up(5, url=url) == 2
+        async with session.get(url) as res:
+            await res.read()
+    assert managed.session is None
+    assert session.closed
+
+    stats = managed.stats
+    assert stats.requests == 3
+    assert stats.in_flight == 0
+    assert stats.max_in_flight == 2
+    assert stats.connections_created == 2
+    assert stats.connections_reused == 1
+    assert stats.reuse_ratio == pytest.approx(1 / 3)
+
+
+async def test_managed_session_saturation(server):
+    managed = ManagedSession(USERID, limit_per_host=1)
+    url = str(server.make_url("/"))
+    async with managed as session:
+        for _ in range(2):
+            async with session.get(url) as res:
+                await res.read()
+        assert managed.stats.saturation == 0.0
+        managed.limit_per_host = 0
+        assert await managed.warm_up(3, url=url) == 3
+    assert managed.stats.requests == 5
+    assert managed.stats.saturation > 0
+
+
+async def test_managed_session_warm_up_failure():
+    managed = ManagedSession(USERID)
+    with pytest.raises(RuntimeError, match="not created"):
+        await managed.warm_up(1)
+    async with managed:
+        assert await managed.warm_up(2, url="http://127.0.0.1:1/") == 0
@@ -1,12 +1,19 @@
+import copy
+from datetime import datetime, timedelta
+import json
 import sys
 from unittest.mock import AsyncMock, patch
 
 import aiohttp
 from freezegun import freeze_time
+from multidict import CIMultiDict, CIMultiDictProxy
 import pytest
+from yarl import URL
 
-from pynws import NwsError, NwsNoDataError, SimpleNWS, call_with_retry
-from tests.helpers import setup_app
+from pynws import NwsError, NwsNoDataError, RetryPolicy, SimpleNWS, call_with_retry
+from pynws.const import ForecastUnits
+from pynws.units import US
+from tests.helpers import data_return_function, setup_app
 
 LATLON = (0, 0)
 STATION = "ABC"
@@ -41,6 +48,90 @@ async def test_nws_set_station_none(aiohttp_client, mock_urls):
     assert isinstance(nws.stations, list)
 
 
+async def test_nws_set_station_failover_stale(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station()
+    assert nws.station == "KCMH"
+
+    # fixture observation is from 2019, so the station is stale
+    await nws.update_observation()
+    assert nws.station == "KOSU"
+    assert nws.observation["temperature"] == 10
+    assert nws.station_health.stations["KCMH"].completeness == 1.0
+    assert not nws.station_health.is_healthy("KCMH")
+
+
+@freeze_time("2019-06-27T11:00:00+00:00")
+async def test_nws_set_station_no_failover(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station()
+    await nws.update_observation()
+    assert nws.station == "KCMH"
+    assert nws.station_health.is_healthy("KCMH")
+
+    # explicitly set stations never fail over
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station(STATION)
+    assert nws.station_health is None
+    await nws.update_observation()
+    assert nws.station == STATION
+
+
+@freeze_time("2019-06-27T11:00:00+00:00")
+async def test_nws_set_station_failover_error(aiohttp_client, mock_urls):
+    app = setup_app(
+        stations_observations=[aiohttp.web.HTTPBadGateway, "stations_observations"]
+    )
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station()
+    with pytest.raises(aiohttp.ClientResponseError):
+        await nws.update_observation()
+    assert nws.station == "KOSU"
+    assert nws.station_health.stations["KCMH"].failures == 1
+
+    await nws.update_observation()
+    assert nws.station == "KOSU"
+    assert nws.observation
+
+
+@freeze_time("2022-03-03T00:00:00+00:00")
+async def test_nws_observation_multi_station(aiohttp_client, mock_urls):
+    app = setup_app()
+    for station, fixture in (
+        ("KCMH", "stations_observations_latest"),
+        ("KOSU", "stations_observations_latest_second"),
+        ("KTZR", aiohttp.web.HTTPBadGateway),
+    ):
+        app.router.add_get(
+            f"/stations_observations_latest/{station}",
+            data_return_function([fixture]),
+        )
+    mock_urls[1].side_effect = lambda station: (
+        f"/stations_observations_latest/{station}"
+    )
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    with pytest.raises(NwsError, match="Need to set station"):
+        await nws.update_observation_multi_station()
+    await nws.set_station()
+    with pytest.raises(ValueError, match="num_stations must be at least 1"):
+        await nws.update_observation_multi_station(0)
+    await nws.update_observation_multi_station(3)
+
+    observation = nws.observation
+    # current station values are kept, missing values are filled
+    assert observation["station"] == "https://api.weather.gov/stations/KFLL"
+    assert observation["temperature"] == 22.8
+    assert observation["windGust"] == 37.0
+    assert nws.station_health.stations["KOSU"].completeness == 1.0
+    assert nws.station_health.stations["KTZR"].failures == 1
+
+
 @pytest.mark.parametrize(
     "observation_json",
     [
@@ -75,6 +166,111 @@ async def test_nws_observation(aiohttp_client, mock_urls, observation_json):
     assert observation["iconWeather"][0][1] is None
 
 
+async def test_nws_observation_incremental(aiohttp_client, mock_urls):
+    queries = []
+    fixtures = ["stations_observations_multiple", "stations_observations_empty"]
+
+    async def handler(request):
+        queries.append(dict(request.query))
+        return await data_return_function([fixtures.pop(0)])(request)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations", handler)
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station(STATION)
+
+    await nws.update_observation(incremental=True)
+    assert "start" not in queries[0]
+    assert nws.observation["temperature"] == 10
+
+    # only newer observations are requested and buffered values are kept
+    with patch.object(
+        SimpleNWS, "extract_metar", wraps=SimpleNWS.extract_metar
+    ) as mock_extract:
+        await nws.update_observation(incremental=True)
+    assert queries[1]["start"] == "2019-06-27T10:53:00+00:00"
+    assert nws.observation["temperature"] == 10
+    # buffered observations keep their parsed METAR
+    mock_extract.assert_not_called()
+
+
+async def test_nws_observation_latest(aiohttp_client, mock_urls):
+    queries = []
+
+    async def handler(request):
+        queries.append(dict(request.query))
+        return await data_return_function("stations_observations")(request)
+
+    app = setup_app()
+    app.router.add_get("/stations_observations_backfill", handler)
+    mock_urls[0].return_value = "/stations_observations_backfill"
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    with pytest.raises(NwsError, match="Need to set station"):
+        await nws.update_observation_latest()
+    await nws.set_station(STATION)
+
+    # all core fields are in the latest observation
+    await nws.update_observation_latest()
+    assert queries == []
+    assert nws.observation["temperature"] == 22.8
+    assert nws.observation["windGust"] is None
+
+    # missing fields are backfilled from older observations
+    await nws.update_observation_latest(["temperature", "windGust"])
+    assert queries == [{"limit": "3", "end": "2022-03-02T23:52:59+00:00"}]
+    assert nws.observation["temperature"] == 22.8
+    assert nws.observation["windGust"] == 36
+
+    # backfill stops at the limit
+    queries.clear()
+    await nws.update_observation_latest(["heatIndex", "windChill"], 2, 1)
+    assert [q["limit"] for q in queries] == ["1", "1"]
+
+
+async def test_nws_observation_latest_backfill_step(aiohttp_client, mock_urls):
+    with open("tests/fixtures/stations_observations_latest.json") as f:
+        latest = json.load(f)
+    newest = datetime.fromisoformat(latest["properties"]["timestamp"])
+    features = []
+    for hour in range(6):
+        properties = copy.deepcopy(latest["properties"])
+        properties["timestamp"] = (newest - timedelta(hours=hour)).isoformat()
+        if hour == 3:
+            properties["windGust"]["value"] = 36
+        features.append({"properties": properties})
+    queries = []
+
+    async def handler(request):
+        # newest first, up to limit, with end inclusive like the API
+        queries.append(dict(request.query))
+        end = datetime.fromisoformat(request.query["end"])
+        page = [
+            f
+            for f in features
+            if datetime.fromisoformat(f["properties"]["timestamp"]) <= end
+        ]
+        limit = int(request.query["limit"])
+        return aiohttp.web.json_response({"features": page[:limit]})
+
+    app = setup_app()
+    app.router.add_get("/stations_observations_backfill", handler)
+    mock_urls[0].return_value = "/stations_observations_backfill"
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station(STATION)
+
+    await nws.update_observation_latest(["windGust"], backfill_step=1)
+    assert len(queries) == 3
+    assert nws.observation["windGust"] == 36
+
+    # only observations not buffered before count against the limit
+    queries.clear()
+    await nws.update_observation_latest(["windChill"], 2, 1)
+    assert len(queries) == 2
+
+
 async def test_nws_observation_with_retry(aiohttp_client, mock_urls):
     # update fails without retry
     app = setup_app(
@@ -111,6 +307,20 @@ async def test_nws_observation_with_retry(aiohttp_client, mock_urls):
     with pytest.raises(aiohttp.ClientResponseError):
         await call_with_retry(nws.update_observation, 0, 5)
 
+    # no retry for too many requests, like 4xx errors
+    app = setup_app(
+        stations_observations=[
+            aiohttp.web.HTTPTooManyRequests,
+            "stations_observations",
+        ]
+    )
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+
+    await nws.set_station(STATION)
+    with pytest.raises(aiohttp.ClientResponseError):
+        await call_with_retry(nws.update_observation, 0, 5)
+
 
 async def test_nws_observation_units(aiohttp_client, mock_urls):
     app = setup_app(stations_observations="stations_observations_alternate_units")
@@ -143,6 +353,79 @@ async def test_nws_observation_metar(aiohttp_client, mock_urls):
     assert observation["windGust"] is None
 
 
+async def test_nws_observation_unit_system(aiohttp_client, mock_urls):
+    app = setup_app(
+        stations_observations=[
+            "stations_observations",
+            "stations_observations_metar",
+        ]
+    )
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client, unit_system=US)
+    await nws.set_station(STATION)
+    await nws.update_observation()
+    observation = nws.observation
+    assert observation["temperature"] == pytest.approx(50)
+    assert observation["windSpeed"] == pytest.approx(22.37, abs=0.01)
+    assert observation["visibility"] == pytest.approx(32808.4, abs=0.1)
+    assert observation["relativeHumidity"] == 10
+
+    # metar values are converted too
+    await nws.update_observation()
+    observation = nws.observation
+    assert observation["temperature"] == pytest.approx(78.08)
+    assert observation["visibility"] == pytest.approx(52800)
+    assert observation["seaLevelPressure"] == pytest.approx(30.05, abs=0.01)
+
+
+async def test_nws_observation_history(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client, unit_system=US)
+    assert nws.observation_history == []
+    await nws.set_station(STATION)
+    await nws.update_observation()
+
+    history = nws.observation_history
+    assert len(history) == 1
+    assert history[0]["temperature"] == pytest.approx(50)
+    assert history[0]["windSpeed"] == pytest.approx(22.37, abs=0.01)
+    assert history[0]["textDescription"] == nws.observation["textDescription"]
+    assert "iconTime" not in history[0]
+
+
+async def test_nws_observation_unknown_unit(aiohttp_client, mock_urls):
+    with open("tests/fixtures/stations_observations.json") as f:
+        data = json.load(f)
+    newest = data["features"][0]
+    older = copy.deepcopy(newest)
+    older["properties"]["timestamp"] = "2019-06-27T09:53:00+00:00"
+    older["properties"]["temperature"]["unitCode"] = "wmoUnit:unknown"
+    data["features"].append(older)
+
+    async def handler(request):
+        return aiohttp.web.json_response(data)
+
+    app = setup_app()
+    app.router.add_get("/observations", handler)
+    client = await aiohttp_client(app)
+    mock_urls[0].return_value = "/observations"
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station(STATION)
+    await nws.update_observation()
+
+    # an unknown unit in an older observation does not fail the update
+    assert nws.observation["temperature"] == 10
+    history = nws.observation_history
+    assert [h["temperature"] for h in history] == [10, None]
+
+    # the unit of a value that is used is still checked
+    newest["properties"]["temperature"]["value"] = None
+    await nws.update_observation()
+    with pytest.raises(ValueError, match="not recognized"):
+        assert nws.observation
+
+
 async def test_nws_observation_metar_noparse(aiohttp_client, mock_urls):
     app = setup_app(stations_observations="stations_observations_metar_noparse")
     client = await aiohttp_client(app)
@@ -532,32 +815,143 @@ async def test_nws_alerts_all_zones_second_alert(aiohttp_client, mock_urls):
     assert len(alerts) == 2
 
 
+@freeze_time("2019-10-13T14:30:00-04:00")
+async def test_nws_forecast_for_units(aiohttp_client, mock_urls):
+    app = setup_app(gridpoints_forecast="gridpoints_forecast")
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.update_forecast()
+
+    forecast_si = nws.forecast_for_units(ForecastUnits.SI)
+    assert forecast_si[0]["temperature"] == 5
+    assert forecast_si[0]["temperatureUnit"] == "C"
+    assert forecast_si[0]["dewpoint"] == 5
+    assert forecast_si[0]["windSpeed"] == "16 km/h"
+    assert forecast_si[0]["windSpeedAvg"] == 16
+    assert forecast_si[1]["windSpeed"] == "0 to 8 km/h"
+
+    # the fetched forecast is unchanged by either view
+    assert nws.forecast[0]["temperature"] == 41
+    assert nws.forecast[0]["dewpoint"] == 41
+    assert nws.forecast_for_units("us") == nws.forecast
+    assert nws.forecast_for_units(ForecastUnits.SI) == forecast_si
+    assert mock_urls[4].call_count == 1
+
+    with pytest.raises(ValueError, match="xyz"):
+        nws.forecast_for_units("xyz")
+
+
+@freeze_time("2019-10-14T20:30:00-04:00")
+async def test_nws_forecast_hourly_for_units(aiohttp_client, mock_urls):
+    app = setup_app(gridpoints_forecast_hourly="gridpoints_forecast_hourly")
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client, forecast_units=ForecastUnits.SI)
+    await nws.update_forecast_hourly()
+
+    forecast_us = nws.forecast_hourly_for_units(ForecastUnits.US)
+    assert forecast_us[0]["temperatureUnit"] == "F"
+    assert forecast_us[0]["windSpeed"].endswith(" mph")
+    assert nws.forecast_hourly[0]["temperatureUnit"] == "C"
+
+
+@freeze_time("2022-02-03T21:30:00Z")
+async def test_nws_synthesize_forecasts(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client, synthesize_forecasts=True)
+    await nws.update_detailed_forecast()
+    assert nws.time_zone == "America/New_York"
+
+    forecast_hourly = nws.forecast_hourly
+    assert len(forecast_hourly) == 156
+    assert forecast_hourly[0]["startTime"] == "2022-02-03T16:00:00-05:00"
+    assert forecast_hourly[0]["temperature"] == 73
+    assert forecast_hourly[0]["dewpoint"] == 64
+    assert forecast_hourly[0]["relativeHumidity"] == 73
+    assert forecast_hourly[0]["probabilityOfPrecipitation"] == 8
+    assert forecast_hourly[0]["windBearing"] == 157.5
+    assert forecast_hourly[0]["windSpeedAvg"] == 13
+    assert forecast_hourly[0]["iconWeather"] is None
+
+    forecast = nws.forecast
+    assert forecast[1]["name"] == "Thursday Night"
+    assert forecast[1]["windSpeedAvg"] == 9
+    assert nws.forecast_metadata["updateTime"] == "2022-02-04T03:15:41+00:00"
+
+    mock_forecast_url, mock_forecast_hourly_url = mock_urls[4:6]
+    assert mock_forecast_url.call_count == 0
+    assert mock_forecast_hourly_url.call_count == 0
+
+
+async def test_nws_alerts_point(aiohttp_client, mock_urls):
+    app = setup_app(
+        alerts_active_point=["alerts_active_zone", "alerts_active_zone_second"]
+    )
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    new_alerts = await nws.update_alerts_point()
+    assert len(new_alerts) == 1
+    assert nws.alerts_point == new_alerts
+
+    new_alerts = await nws.update_alerts_point()
+    assert len(new_alerts) == 1
+    assert new_alerts[0]["id"] == "NWS-IDP-PROD-3965873-001"
+    assert len(nws.alerts_point) == 2
+    # no points or zone requests
+    mock_points_url, mock_alerts_active_zone_url = mock_urls[2], mock_urls[7]
+    assert mock_points_url.call_count == 0
+    assert mock_alerts_active_zone_url.call_count == 0
+    assert mock_urls[9].call_count == 2
+
+
 async def test_retry(aiohttp_client, mock_urls):
-    with patch("pynws.simple_nws._nws_retry_func") as err_mock:
-        # retry all exceptions
-        def _return_true(error):
-            return True
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station(STATION)
 
-        err_mock.return_value = _return_true
+    mock_update = AsyncMock()
+    request_info = aiohttp.RequestInfo(URL("/"), "GET", CIMultiDictProxy(CIMultiDict()))
+    mock_update.side_effect = [
+        aiohttp.ClientResponseError(request_info, (), status=503),
+        None,
+    ]
 
-        app = setup_app()
-        client = await aiohttp_client(app)
-        nws = SimpleNWS(*LATLON, USERID, client)
-        await nws.set_station(STATION)
+    if sys.version_info >= (3, 10):
+        mock_wrap = mock_update
+    else:
 
-        mock_update = AsyncMock()
-        mock_update.side_effect = [ValueError, None]
+        async def mock_wrap(*args, **kwargs):
+            return await mock_update(*args, **kwargs)
 
-        if sys.version_info >= (3, 10):
-            mock_wrap = mock_update
-        else:
+    await call_with_retry(mock_wrap, 0, 5)
 
-            async def mock_wrap(*args, **kwargs):
-                return await mock_update(*args, **kwargs)
+    assert mock_update.call_count == 2
 
-        await call_with_retry(mock_wrap, 0, 5)
 
-        assert mock_update.call_count == 2
+async def test_retry_stop_after_elapsed():
+    mock_update = AsyncMock(side_effect=[NwsNoDataError("no data"), None])
+
+    # stop only applies to the elapsed time, not the next interval
+    with patch("pynws.retry.asyncio.sleep") as mock_sleep:
+        await call_with_retry(mock_update, 10, 5, retry_no_data=True)
+    assert mock_update.call_count == 2
+    mock_sleep.assert_called_once_with(10.0)
+
+    mock_update = AsyncMock(side_effect=[NwsNoDataError("no data"), None])
+    with pytest.raises(NwsNoDataError):
+        await call_with_retry(mock_update, 0, 0, retry_no_data=True)
+    assert mock_update.call_count == 1
+
+
+async def test_retry_shares_policy():
+    mock_update = AsyncMock()
+    with patch("pynws.simple_nws.RetryPolicy", wraps=RetryPolicy) as mock_policy:
+        await call_with_retry(mock_update, 0, 3600)
+        await call_with_retry(mock_update, 0, timedelta(hours=1))
+        await call_with_retry(mock_update, 0, 3600, retry_no_data=True)
+    assert mock_policy.call_count == 2
+    assert mock_update.call_count == 3
 
 
 async def test_retry_with_args():
@@ -614,3 +1008,53 @@ async def test_retries_runtime_error():
         await call_with_retry(mock_wrap, 0, 5)
 
     assert mock_update.call_count == 1
+
+
+async def test_nws_update_reports(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client, filter_forecast=False, timing=True)
+    await nws.set_station(STATION)
+    await nws.update_observation()
+    await nws.update_forecast()
+    await nws.update_detailed_forecast()
+    await nws.update_alerts_forecast_zone()
+    assert set(nws.update_reports) == {
+        "observation",
+        "forecast",
+        "detailed_forecast",
+        "alerts_forecast_zone",
+    }
+
+    report = nws.update_reports["observation"]
+    assert report.update == "update_observation"
+    assert report.requests == 1
+    assert report.objects == 1
+    assert report.bytes > 0
+    assert report.network >= 0
+    assert report.decode >= 0
+    assert report.model > 0
+    assert report.total >= report.model
+    assert report.conversion is None
+    assert nws.observation
+    assert nws.update_reports["observation"].conversion > 0
+
+    report = nws.update_reports["forecast"]
+    assert report.requests == 2
+    assert report.objects == 2
+    assert nws.forecast
+    assert nws.update_reports["forecast"].conversion > 0
+
+    # all values of all layers
+    assert nws.update_reports["detailed_forecast"].objects > 100
+    assert nws.update_reports["alerts_forecast_zone"].objects == 1
+
+
+async def test_nws_update_reports_disabled(aiohttp_client, mock_urls):
+    app = setup_app()
+    client = await aiohttp_client(app)
+    nws = SimpleNWS(*LATLON, USERID, client)
+    await nws.set_station(STATION)
+    await nws.update_observation()
+    assert nws.observation
+    assert nws.update_reports == {}
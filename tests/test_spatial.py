@@ -0,0 +1,149 @@
+import pytest
+
+from pynws.spatial import AlertGridIndex, point_in_geometry, point_in_polygon
+
+# square with a square hole, positions are (lon, lat)
+SQUARE = [[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 4.0], [0.0, 0.0]]
+HOLE = [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 2.0], [1.0, 1.0]]
+POLYGON = {"type": "Polygon", "coordinates": [SQUARE, HOLE]}
+MULTIPOLYGON = {
+    "type": "MultiPolygon",
+    "coordinates": [
+        [SQUARE],
+        [[[10.0, 10.0], [11.0, 10.0], [11.0, 11.0], [10.0, 10.0]]],
+    ],
+}
+
+
+def test_point_in_polygon():
+    assert point_in_polygon(3, 3, [SQUARE, HOLE])
+    assert not point_in_polygon(1.5, 1.5, [SQUARE, HOLE])
+    assert point_in_polygon(1.5, 1.5, [SQUARE])
+    assert not point_in_polygon(5, 3, [SQUARE])
+    assert not point_in_polygon(-0.5, 3, [SQUARE])
+    assert not point_in_polygon(1, 1, [])
+
+
+def test_point_in_geometry():
+    assert point_in_geometry(3, 3, POLYGON)
+    assert point_in_geometry(10.2, 10.8, MULTIPOLYGON)
+    assert not point_in_geometry(10.8, 10.2, MULTIPOLYGON)
+    assert not point_in_geometry(3, 3, {"type": "Point", "coordinates": [3, 3]})
+
+
+def test_grid_index():
+    index = AlertGridIndex(cell_size=1.0)
+    assert index.add("a", POLYGON)
+    assert index.add("b", MULTIPOLYGON)
+    assert not index.add("c", {"type": "Point", "coordinates": [3, 3]})
+    assert len(index) == 2
+    assert "c" not in index
+
+    assert index.query(3, 3) == ["a", "b"]
+    assert index.query(1.5, 1.5) == ["b"]
+    assert index.query(10.2, 10.8) == ["b"]
+    assert index.query(20, 20) == []
+
+    index.remove("b")
+    index.remove("b")
+    assert "b" not in index
+    assert index.query(3, 3) == ["a"]
+    assert index.query(10.2, 10.8) == []
+
+    # replacing moves the alert to the cells of the new geometry
+    index.add("a", MULTIPOLYGON)
+    assert index.query(1.5, 1.5) == ["a"]
+    assert index.query(10.2, 10.8) == ["a"]
+
+    index.remove("a")
+    assert len(index) == 0
+    assert index.cell_count == 0
+
+
+def test_grid_index_negative_coordinates():
+    index = AlertGridIndex()
+    geometry = {
+        "type": "Polygon",
+        "coordinates": [
+            [[-124.2, 45.0], [-122.5, 45.0], [-122.5, 46.5], [-124.2, 45.0]]
+        ],
+    }
+    index.add("a", geometry)
+    assert index.query(45.1, -122.6) == ["a"]
+    assert index.query(46.4, -124.1) == []
+
+
+def test_grid_index_cell_size():
+    with pytest.raises(ValueError, match="cell_size"):
+        AlertGridIndex(cell_size=0)
+
+
+def test_grid_index_polygon_boxes():
+    index = AlertGridIndex(cell_size=1.0)
+    # only the cells of each polygon, not of the box around both
+    index.add("b", MULTIPOLYGON)
+    assert index.cell_count == 5 * 5 + 2 * 2
+    assert index.query(7, 7) == []
+
+
+def test_grid_index_antimeridian():
+    index = AlertGridIndex()
+    # marine zones split at the antimeridian
+    split = {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [
+                [
+                    [179.0, 52.0],
+                    [180.0, 52.0],
+                    [180.0, 53.0],
+                    [179.0, 53.0],
+                    [179.0, 52.0],
+                ]
+            ],
+            [
+                [
+                    [-180.0, 52.0],
+                    [-179.0, 52.0],
+                    [-179.0, 53.0],
+                    [-180.0, 53.0],
+                    [-180.0, 52.0],
+                ]
+            ],
+        ],
+    }
+    # one polygon jumping from 180 to -180, and one beyond 180
+    jumping = {
+        "type": "Polygon",
+        "coordinates": [
+            [
+                [179.0, 60.0],
+                [-179.0, 60.0],
+                [-179.0, 61.0],
+                [179.0, 61.0],
+                [179.0, 60.0],
+            ]
+        ],
+    }
+    beyond = {
+        "type": "Polygon",
+        "coordinates": [
+            [[179.0, 70.0], [181.0, 70.0], [181.0, 71.0], [179.0, 71.0], [179.0, 70.0]]
+        ],
+    }
+    index.add("split", split)
+    index.add("jumping", jumping)
+    index.add("beyond", beyond)
+    # 3 x 3 cells on each side, instead of cells around the globe
+    assert index.cell_count == 6 * 9
+
+    for lat in (52.5, 60.5, 70.5):
+        assert len(index.query(lat, 179.5)) == 1
+        assert len(index.query(lat, -179.5)) == 1
+        assert index.query(lat, 0.0) == []
+    assert index.query(60.5, -179.5) == ["jumping"]
+    assert index.query(70.5, -179.5) == ["beyond"]
+
+    for alert_id in ("split", "jumping", "beyond"):
+        index.remove(alert_id)
+    assert index.cell_count == 0
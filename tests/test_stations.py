@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from pynws.stations import StationHealth, StationStatus, observation_completeness
+
+NOW = datetime(2019, 6, 27, 11, tzinfo=timezone.utc)
+FIELDS = ["temperature", "dewpoint"]
+
+
+def _obs(timestamp, temperature=1.0, dewpoint=1.0):
+    return {
+        "timestamp": timestamp.isoformat(),
+        "temperature": {"value": temperature, "unitCode": "wmoUnit:degC"},
+        "dewpoint": {"value": dewpoint, "unitCode": "wmoUnit:degC"},
+    }
+
+
+def test_observation_completeness():
+    assert observation_completeness(_obs(NOW), FIELDS) == 1.0
+    assert observation_completeness(_obs(NOW, dewpoint=None), FIELDS) == 0.5
+    assert observation_completeness({}, FIELDS) == 0.0
+    assert observation_completeness({}, []) == 1.0
+
+
+def test_station_status_from_feature():
+    feature = {
+        "geometry": {"type": "Point", "coordinates": [-82.9, 40.0]},
+        "properties": {"stationIdentifier": "KCMH"},
+    }
+    status = StationStatus.from_feature(feature)
+    assert status.identifier == "KCMH"
+    assert status.coordinates == (40.0, -82.9)
+
+
+def test_station_health_ranking():
+    health = StationHealth(StationStatus(s) for s in ("A", "B", "C"))
+    # unknown stations keep distance order
+    assert health.ranked(NOW) == ["A", "B", "C"]
+
+    health.record_observation("A", _obs(NOW, dewpoint=None), FIELDS)
+    health.record_observation("B", _obs(NOW), FIELDS)
+    assert health.best(NOW) == "B"
+    assert health.is_healthy("A", NOW)
+
+    health.record_observation("B", _obs(NOW - timedelta(hours=3)), FIELDS)
+    assert not health.is_healthy("B", NOW)
+    assert health.ranked(NOW) == ["A", "C", "B"]
+
+    health.record_failure("A")
+    health.record_failure("A")
+    assert not health.is_healthy("A", NOW)
+    assert health.best(NOW) == "C"
+
+    # unknown station is added on first record
+    health.record_failure("D")
+    assert health.ranked(NOW) == ["C", "D", "A", "B"]
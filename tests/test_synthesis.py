@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+import json
+
+import pytest
+from zoneinfo import ZoneInfo
+
+from pynws import DetailedForecast
+from pynws.const import ForecastUnits
+from pynws.synthesis import synthesize_daily, synthesize_hourly
+from pynws.units import SI, US
+
+START = datetime(2022, 2, 3, 21, 30, tzinfo=timezone.utc)
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def _detailed(unit_system=SI):
+    with open("tests/fixtures/detailed_forecast.json") as f:
+        return DetailedForecast(json.load(f)["properties"], unit_system)
+
+
+@pytest.fixture
+def detailed():
+    return _detailed()
+
+
+def test_synthesize_hourly(detailed):
+    periods = synthesize_hourly(detailed, START, tz=NEW_YORK)
+    assert len(periods) == 156
+
+    period = periods[0]
+    assert period["number"] == 1
+    assert period["startTime"] == "2022-02-03T16:00:00-05:00"
+    assert period["endTime"] == "2022-02-03T17:00:00-05:00"
+    assert period["isDaytime"]
+    assert period["temperature"] == 73
+    assert period["temperatureUnit"] == "F"
+    assert period["dewpoint"] == {"unitCode": "wmoUnit:degC", "value": 18}
+    assert period["relativeHumidity"] == {"unitCode": "wmoUnit:percent", "value": 73}
+    assert period["probabilityOfPrecipitation"]["value"] == 8
+    assert period["windSpeed"] == "13 mph"
+    assert period["windDirection"] == "SSE"
+    assert period["shortForecast"] == "Mostly Cloudy"
+    assert periods[9]["shortForecast"] == "Slight Chance Rain Showers"
+    assert not periods[9]["isDaytime"]
+
+
+def test_synthesize_hourly_si(detailed):
+    periods = synthesize_hourly(detailed, START, hours=2, units=ForecastUnits.SI)
+    assert len(periods) == 2
+    assert periods[0]["startTime"] == "2022-02-03T21:00:00+00:00"
+    assert periods[0]["temperature"] == 23
+    assert periods[0]["temperatureUnit"] == "C"
+    assert periods[0]["windSpeed"] == "20 km/h"
+
+
+def test_synthesize_hourly_end_of_data(detailed):
+    start = datetime(2022, 2, 10, 20, tzinfo=timezone.utc)
+    periods = synthesize_hourly(detailed, start)
+    assert len(periods) == 15
+    assert synthesize_hourly(detailed, datetime(2023, 1, 1, tzinfo=timezone.utc)) == []
+
+
+def test_synthesize_daily(detailed):
+    periods = synthesize_daily(detailed, START, tz=NEW_YORK)
+    assert [p["name"] for p in periods[:4]] == [
+        "Thursday",
+        "Thursday Night",
+        "Friday",
+        "Friday Night",
+    ]
+    assert len(periods) == 15
+
+    # partial first period until 18:00 local time
+    assert periods[0]["startTime"] == "2022-02-03T16:00:00-05:00"
+    assert periods[0]["endTime"] == "2022-02-03T18:00:00-05:00"
+    assert periods[0]["temperature"] == 76
+
+    night = periods[1]
+    assert not night["isDaytime"]
+    assert night["startTime"] == "2022-02-03T18:00:00-05:00"
+    assert night["endTime"] == "2022-02-04T06:00:00-05:00"
+    assert night["temperature"] == 64
+    assert night["windSpeed"] == "8 to 10 mph"
+    assert night["probabilityOfPrecipitation"]["value"] == 31
+    assert night["shortForecast"] == "Chance Rain Showers"
+    assert periods[2]["isDaytime"]
+
+
+def test_synthesize_unit_system(detailed):
+    # periods are the same whatever the units of the detailed forecast
+    us_detailed = _detailed(US)
+    for units in ForecastUnits:
+        assert synthesize_hourly(us_detailed, START, units=units) == (
+            synthesize_hourly(detailed, START, units=units)
+        )
+        assert synthesize_daily(us_detailed, START, units=units) == (
+            synthesize_daily(detailed, START, units=units)
+        )
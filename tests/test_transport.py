@@ -0,0 +1,217 @@
+import asyncio
+import gzip
+
+import aiohttp
+import pytest
+
+from pynws import (
+    Cassette,
+    CassetteMode,
+    CassetteTransport,
+    Nws,
+    NwsCassetteMissError,
+    RedirectCache,
+    RequestOptions,
+)
+from pynws.const import API_STATIONS_OBSERVATIONS_LATEST
+from pynws.instrumentation import RequestSource
+from pynws.transport import request_key
+from tests.helpers import data_return_function, setup_app
+
+LATLON = (0, 0)
+STATION = "ABC"
+USERID = "test_user"
+
+
+def _options(cassette, mode, **kwargs):
+    return RequestOptions(transport=CassetteTransport(cassette, mode), **kwargs)
+
+
+def test_request_key():
+    assert request_key("/url") == "/url"
+    assert request_key("/url", {"units": "us", "limit": 1}) == "/url?limit=1&units=us"
+
+
+async def test_record_replay(aiohttp_client, mock_urls, tmp_path):
+    path = tmp_path / "nws.json.gz"
+    client = await aiohttp_client(setup_app())
+    cassette = Cassette(path)
+    nws = Nws(
+        client,
+        USERID,
+        latlon=LATLON,
+        request_options=_options(cassette, CassetteMode.RECORD),
+    )
+    forecast = await nws.get_gridpoints_forecast()
+    assert len(cassette) == 2
+    assert cassette.dirty
+    cassette.save()
+    assert not cassette.dirty
+
+    # no routes, so any network request fails
+    client = await aiohttp_client(aiohttp.web.Application())
+    nws = Nws(
+        client,
+        USERID,
+        latlon=LATLON,
+        request_options=_options(Cassette(path), CassetteMode.REPLAY),
+    )
+    assert await nws.get_gridpoints_forecast() == forecast
+
+    nws.station = STATION
+    with pytest.raises(NwsCassetteMissError):
+        await nws.get_stations_observations_latest()
+
+
+async def test_record_instrumentation(aiohttp_client, mock_urls, tmp_path):
+    app = aiohttp.web.Application()
+    hits = []
+
+    async def redirect(request):
+        hits.append(request.path)
+        raise aiohttp.web.HTTPMovedPermanently("/latest")
+
+    app.router.add_get("/stations_observations_latest", redirect)
+    app.router.add_get("/latest", data_return_function("stations_observations_latest"))
+    client = await aiohttp_client(app)
+    url = str(client.make_url("/stations_observations_latest"))
+    mock_urls[1].return_value = url
+    cassette = Cassette(tmp_path / "nws.json.gz")
+    metrics = []
+    redirects = RedirectCache()
+    options = _options(
+        cassette,
+        CassetteMode.RECORD,
+        on_request=metrics.append,
+        redirects=redirects,
+    )
+    nws = Nws(client.session, USERID, station=STATION, request_options=options)
+
+    # recorded requests are measured and redirected like live ones
+    await nws.get_stations_observations_latest()
+    await nws.get_stations_observations_latest()
+    assert hits == ["/stations_observations_latest"]
+    assert redirects.get(url) == str(client.make_url("/latest"))
+    assert request_key(url) in cassette
+    for recorded in metrics:
+        assert recorded.status == 200
+        assert recorded.bytes > 0
+        assert recorded.decode_time is not None
+
+    options = _options(cassette, CassetteMode.REPLAY, on_request=metrics.append)
+    nws = Nws(client.session, USERID, station=STATION, request_options=options)
+    await nws.get_stations_observations_latest()
+    assert metrics[-1].status == 200
+    assert metrics[-1].source == RequestSource.CASSETTE
+
+
+async def test_replay_error(aiohttp_client, mock_urls, tmp_path):
+    async def throttled(request):
+        return aiohttp.web.json_response({}, status=429, headers={"Retry-After": "5"})
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", throttled)
+    client = await aiohttp_client(app)
+    cassette = Cassette(tmp_path / "nws.json.gz")
+    nws = Nws(
+        client,
+        USERID,
+        station=STATION,
+        request_options=_options(cassette, CassetteMode.RECORD),
+    )
+    with pytest.raises(aiohttp.ClientResponseError):
+        await nws.get_stations_observations_latest()
+
+    nws.request_options = _options(cassette, CassetteMode.REPLAY)
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        await nws.get_stations_observations_latest()
+    assert exc_info.value.status == 429
+    assert exc_info.value.headers["Retry-After"] == "5"
+
+
+async def test_fallback(aiohttp_client, mock_urls, tmp_path):
+    slow = asyncio.Event()
+
+    async def latest(request):
+        if slow.is_set():
+            await asyncio.sleep(1)
+        return await data_return_function("stations_observations_latest")(request)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", latest)
+    client = await aiohttp_client(app)
+    options = _options(
+        Cassette(tmp_path / "nws.json.gz"),
+        CassetteMode.FALLBACK,
+        timeouts={API_STATIONS_OBSERVATIONS_LATEST: 0.05},
+    )
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    observation = await nws.get_stations_observations_latest()
+
+    slow.set()
+    assert await nws.get_stations_observations_latest() == observation
+
+    options.transport.mode = CassetteMode.RECORD
+    with pytest.raises(asyncio.TimeoutError):
+        await nws.get_stations_observations_latest()
+
+
+async def test_fallback_server_error(aiohttp_client, mock_urls, tmp_path):
+    state = {"status": 200}
+
+    async def latest(request):
+        if state["status"] == 503:
+            return aiohttp.web.json_response({}, status=503)
+        if state["status"] is None:
+            # drop the connection
+            request.transport.close()
+            await asyncio.sleep(1)
+        return await data_return_function("stations_observations_latest")(request)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", latest)
+    client = await aiohttp_client(app)
+    cassette = Cassette(tmp_path / "nws.json.gz")
+    options = _options(cassette, CassetteMode.FALLBACK)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    observation = await nws.get_stations_observations_latest()
+
+    # a 5xx is served from the cassette and does not replace the recording
+    state["status"] = 503
+    assert await nws.get_stations_observations_latest() == observation
+    key = request_key("/stations_observations_latest")
+    assert cassette.get(key)["status"] == 200
+
+    # so is a connection error afterwards
+    state["status"] = None
+    assert await nws.get_stations_observations_latest() == observation
+
+
+async def test_fallback_client_error(aiohttp_client, mock_urls, tmp_path):
+    async def missing(request):
+        return aiohttp.web.json_response({}, status=404)
+
+    app = aiohttp.web.Application()
+    app.router.add_get("/stations_observations_latest", missing)
+    client = await aiohttp_client(app)
+    cassette = Cassette(tmp_path / "nws.json.gz")
+    cassette.record("/stations_observations_latest", 200, {}, 0.1, {"id": "old"})
+    options = _options(cassette, CassetteMode.FALLBACK)
+    nws = Nws(client, USERID, station=STATION, request_options=options)
+    # client errors are not a reason to serve old data
+    with pytest.raises(aiohttp.ClientResponseError):
+        await nws.get_stations_observations_latest()
+
+
+def test_cassette_version(tmp_path):
+    path = tmp_path / "nws.json.gz"
+    cassette = Cassette(path)
+    cassette.save()
+    assert len(Cassette(path)) == 0
+    cassette.record("/url", 200, {}, 0.1, {})
+    cassette.save()
+    assert "/url" in Cassette(path)
+
+    path.write_bytes(gzip.compress(b'{"version": 0}'))
+    with pytest.raises(ValueError, match="Unsupported cassette version"):
+        Cassette(path)
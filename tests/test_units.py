@@ -0,0 +1,78 @@
+import pytest
+
+from pynws import UnitConverter, UnitSystem
+from pynws.units import SI, US, convert_unit, get_converter, unit_converter
+
+
+def test_unit_system_validation():
+    with pytest.raises(ValueError, match="'degC' is not a unit of speed"):
+        UnitConverter(SI._replace(speed="degC"))
+    with pytest.raises(ValueError, match="'bar' is not a unit of pressure"):
+        UnitConverter(UnitSystem(pressure="bar"))
+
+
+def test_convert_si():
+    converter = UnitConverter()
+    assert converter.convert("wmoUnit:degF", 212) == pytest.approx(100)
+    assert converter.convert("wmoUnit:m_s-1", 10) == pytest.approx(36)
+    assert converter.convert("wmoUnit:percent", 50) == 50
+    assert converter.convert("wmoUnit:degC", None) is None
+    assert converter.target_unit("wmoUnit:degF") == "degC"
+    # the legacy functions convert to SI
+    assert convert_unit("wmoUnit:degF", 212) == pytest.approx(100)
+    assert get_converter("m_s-1")(10) == pytest.approx(36)
+    with pytest.raises(ValueError, match="not recognized"):
+        get_converter("wmoUnit:furlong")
+    with pytest.raises(ValueError, match="not recognized"):
+        converter.convert("wmoUnit:furlong", 1)
+
+
+def test_convert_us():
+    converter = UnitConverter(US)
+    assert converter.convert("wmoUnit:degC", 100) == pytest.approx(212)
+    assert converter.convert("wmoUnit:K", 273.15) == pytest.approx(32)
+    assert converter.convert("wmoUnit:km_h-1", 1.609344) == pytest.approx(1)
+    assert converter.convert("wmoUnit:m", 0.3048) == pytest.approx(1)
+    assert converter.convert("wmoUnit:mm", 25.4) == pytest.approx(1)
+    assert converter.convert("wmoUnit:Pa", 101325) == pytest.approx(29.92, abs=0.01)
+    assert converter.convert("wmoUnit:degree_(angle)", 270) == 270
+    assert converter.target_unit("wmoUnit:kt") == "mi_h-1"
+
+
+def test_convert_custom_system():
+    converter = UnitConverter(SI._replace(speed="m_s-1", pressure="hPa"))
+    assert converter.convert("wmoUnit:km_h-1", 36) == pytest.approx(10)
+    assert converter.convert("wmoUnit:Pa", 101325) == pytest.approx(1013.25)
+
+
+def test_convert_many():
+    converter = UnitConverter(US)
+    values = converter.convert_many("wmoUnit:degC", [0, None, -40])
+    assert values == [pytest.approx(32), None, pytest.approx(-40)]
+    # identity conversions return values as they are
+    assert UnitConverter().convert_many("wmoUnit:degC", [1, None]) == [1, None]
+    assert converter.convert_quantities(
+        [
+            {"unitCode": "wmoUnit:degC", "value": 100},
+            {"unitCode": "wmoUnit:degC", "value": None},
+            None,
+        ]
+    ) == [pytest.approx(212), None, None]
+
+
+def test_convert_array():
+    class Array(list):
+        def __mul__(self, other):
+            return Array(v * other for v in self)
+
+        def __add__(self, other):
+            return Array(v + other for v in self)
+
+    values = UnitConverter(US).convert_array("wmoUnit:degC", Array([0, 100]))
+    assert values == [pytest.approx(32), pytest.approx(212)]
+
+
+def test_unit_converter_shared():
+    assert unit_converter() is unit_converter(SI)
+    assert unit_converter(US) is unit_converter(US)
+    assert unit_converter(US).system == US